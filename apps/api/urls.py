@@ -4,4 +4,5 @@ from django.urls import include, path
 urlpatterns = [
     path("users/", include("apps.users.urls")),
     path("blog/", include("apps.blog.urls")),
+    path("async/blog/", include("apps.blog.async_urls")),
 ]
@@ -0,0 +1,12 @@
+# apps/blog/async_urls.py
+from django.urls import path
+
+from . import async_views
+
+urlpatterns = [
+    path("", async_views.post_list, name="async-post-list"),
+    path("<int:pk>/", async_views.post_detail, name="async-post-detail"),
+    path("<int:pk>/comments/", async_views.post_comments, name="async-post-comments"),
+    path("<int:pk>/reactions/", async_views.post_reactions, name="async-post-reactions"),
+    path("<int:pk>/events/", async_views.post_events, name="async-post-events"),
+]
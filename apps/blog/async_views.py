@@ -0,0 +1,303 @@
+"""
+Async read path for ASGI deployments, mounted under /api/async/blog/:
+
+  - GET /api/async/blog/                       -> post feed (same params as /api/blog/)
+  - GET /api/async/blog/{id}/                  -> post detail
+  - GET /api/async/blog/{id}/comments/         -> top-level comments of a post
+  - GET /api/async/blog/{id}/reactions/        -> reactions on a post
+  - GET /api/async/blog/{id}/events/           -> live events of a post (Server-Sent Events)
+
+Same querysets, serializers, pagination, caching and ETags as the DRF views in
+`apps.blog.views` (the sync path, unchanged), but rows are read through the
+async ORM (`aget`, `aiterator` with its prefetches, async cache calls), so a
+request waiting on the database or the cache does not hold a worker thread.
+
+Serialization runs in the event loop over fully loaded rows: the querysets load
+every relation the serializers render, and anything they missed would fail loudly
+with `SynchronousOnlyOperation` instead of silently querying per row.
+"""
+
+import functools
+import json
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db.models import Q
+from django.http import Http404, HttpResponseNotAllowed, StreamingHttpResponse
+from rest_framework import exceptions, status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+from apps.core.query_budget import query_budget
+from apps.core.serializers import FieldSelection
+from apps.users.serializers import UserSerializer
+
+from .cache import acached_post_response, apost_list_response
+from .content_types import target_content_types
+from .live import EVENT_ID_RE, get_event_bus
+from .models import Post, Reaction
+from .pagination import (
+    CommentCursorPagination,
+    PostPagination,
+    ReactionCursorPagination,
+    apaginate_queryset,
+)
+from .serializers import CommentSerializer, ReactionSerializer
+from .services import aload_reply_tree, build_comment_tree, comment_queryset
+from .views import (
+    COMMENT_MAX_DEPTH,
+    PostViewSet,
+    _collect_author_ids,
+    include_reactions,
+    sideload_users,
+)
+
+User = get_user_model()
+
+_jwt_authentication = JWTAuthentication()
+
+
+async def _authenticate(request):
+    """
+    `JWTAuthentication.authenticate` with the user read by `aget`.
+    Returns None without credentials; raises `AuthenticationFailed` for bad ones.
+    """
+    header = _jwt_authentication.get_header(request)
+    raw_token = _jwt_authentication.get_raw_token(header) if header is not None else None
+    if raw_token is None:
+        return None
+
+    token = _jwt_authentication.get_validated_token(raw_token)
+    try:
+        user_id = token[jwt_settings.USER_ID_CLAIM]
+    except KeyError:
+        raise exceptions.AuthenticationFailed("Token contained no recognizable user identification")
+    try:
+        user = await User.objects.aget(**{jwt_settings.USER_ID_FIELD: user_id})
+    except User.DoesNotExist:
+        raise exceptions.AuthenticationFailed("User not found", code="user_not_found")
+    if not user.is_active:
+        raise exceptions.AuthenticationFailed("User is inactive", code="user_inactive")
+    return user
+
+
+def _finalize(response, request):
+    # What DRF's `APIView.finalize_response` does for a Response: render as JSON
+    if isinstance(response, Response):
+        response.accepted_renderer = JSONRenderer()
+        response.accepted_media_type = JSONRenderer.media_type
+        response.renderer_context = {"request": request, "response": response}
+    return response
+
+
+def async_read_view(view):
+    """
+    Wrap `async def view(request, **kwargs)` as a read-only API endpoint: GET/HEAD only,
+    JWT authentication required (like `IsAuthenticated`), DRF errors as JSON.
+    `view` receives a DRF `Request`, so the helpers of the sync views apply.
+    """
+
+    @functools.wraps(view)
+    async def wrapper(django_request, **kwargs):
+        if django_request.method not in ("GET", "HEAD"):
+            return HttpResponseNotAllowed(["GET", "HEAD"])
+
+        request = Request(django_request)
+        try:
+            user = await _authenticate(request)
+            if user is None:
+                raise exceptions.NotAuthenticated()
+            request.user = user
+            response = await view(request, **kwargs)
+        except Http404 as exc:
+            response = Response({"detail": str(exc)}, status=status.HTTP_404_NOT_FOUND)
+        except exceptions.APIException as exc:
+            response = Response({"detail": exc.detail}, status=exc.status_code)
+            if isinstance(exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)):
+                response["WWW-Authenticate"] = _jwt_authentication.authenticate_header(request)
+        return _finalize(response, request)
+
+    return wrapper
+
+
+def _post_viewset(request, action, **kwargs):
+    # The sync viewset, only to reuse its querysets, serializer choice and context
+    return PostViewSet(request=request, action=action, args=(), kwargs=kwargs, format_kwarg=None)
+
+
+async def _aget_post(queryset, pk):
+    try:
+        return await queryset.aget(pk=pk)
+    except Post.DoesNotExist:
+        raise Http404("No Post matches the given query.")
+
+
+async def aadd_sideloaded_users(request, response):
+    """`views.add_sideloaded_users` through the async ORM."""
+    if response.status_code != 200 or not sideload_users(request):
+        return response
+
+    ids = _collect_author_ids(response.data, set())
+    users = [user async for user in User.objects.filter(pk__in=ids).order_by("pk")] if ids else []
+    serializer = UserSerializer(
+        users,
+        many=True,
+        context={"request": request, "field_selection": FieldSelection.from_request(request).child("users")},
+    )
+    response.data["users"] = {user.pk: data for user, data in zip(users, serializer.data)}
+    return response
+
+
+@query_budget(4)
+@async_read_view
+async def post_list(request):
+    view = _post_viewset(request, "list")
+
+    async def build_response():
+        queryset = view.get_queryset()
+        paginator = view.paginator
+        if isinstance(paginator, PostPagination):
+            # `?page=N`: Django's Paginator (COUNT + slice) has no async API
+            page = await sync_to_async(paginator.paginate_queryset)(queryset, request, view=view)
+        else:
+            page = await apaginate_queryset(paginator, queryset, request, view=view)
+        serializer = view.get_serializer(page, many=True)
+        return await aadd_sideloaded_users(request, paginator.get_paginated_response(serializer.data))
+
+    return await apost_list_response(request, build_response)
+
+
+@query_budget(8)
+@async_read_view
+async def post_detail(request, pk):
+    view = _post_viewset(request, "retrieve", pk=pk)
+
+    async def build_response():
+        post = await _aget_post(view.get_queryset(), pk)
+        return await aadd_sideloaded_users(request, Response(view.get_serializer(post).data))
+
+    return await acached_post_response("retrieve", pk, request, build_response)
+
+
+@query_budget(9)
+@async_read_view
+async def post_comments(request, pk):
+    view = _post_viewset(request, "comments", pk=pk)
+
+    async def build_response():
+        post = await _aget_post(view.get_queryset(), pk)
+        return await acomment_level_response(view, request, Q(post=post, depth=0), depth=0)
+
+    return await acached_post_response("comments", pk, request, build_response)
+
+
+@query_budget(4)
+@async_read_view
+async def post_reactions(request, pk):
+    view = _post_viewset(request, "reactions", pk=pk)
+    post = await _aget_post(view.get_queryset(), pk)
+    content_type = (await sync_to_async(target_content_types)())["post"]  # resolved once per process
+    return await areaction_page_response(view, request, content_type, post.id)
+
+
+async def acomment_level_response(view, request, filters, depth):
+    """`views.comment_level_response` through the async ORM."""
+    paginator = CommentCursorPagination()
+    with_reactions = include_reactions(request)
+    selection = FieldSelection.from_request(request)
+    with_authors = not sideload_users(request)
+
+    comments = comment_queryset(with_reactions, selection, with_authors).filter(filters)
+    page = await apaginate_queryset(paginator, comments, request, view=view)
+
+    reply_selection = selection.descendants("replies", COMMENT_MAX_DEPTH - depth)
+    tree = build_comment_tree([])
+    if reply_selection is not None:
+        tree = await aload_reply_tree(
+            page,
+            max_depth=COMMENT_MAX_DEPTH,
+            per_parent=paginator.replies_page_size,
+            include_reactions=with_reactions,
+            selection=reply_selection,
+            with_authors=with_authors,
+        )
+
+    serializer = CommentSerializer(
+        page,
+        many=True,
+        context={
+            "request": request,
+            "include_reactions": with_reactions,
+            "depth": depth,
+            "max_depth": COMMENT_MAX_DEPTH,
+            "comment_tree": tree,
+            "replies_paginator": paginator,
+            "field_selection": selection,
+            "sideload_users": not with_authors,
+        },
+    )
+    return await aadd_sideloaded_users(request, paginator.get_paginated_response(serializer.data))
+
+
+async def areaction_page_response(view, request, content_type, object_id):
+    """`views.reaction_page_response` through the async ORM."""
+    paginator = ReactionCursorPagination()
+    selection = FieldSelection.from_request(request)
+
+    reactions = Reaction.objects.filter(content_type=content_type, object_id=object_id)
+    reactions = reactions.defer(*selection.deferred("created_at"))
+    with_authors = not sideload_users(request)
+    if with_authors and selection.includes("author"):
+        reactions = reactions.select_related("author")
+
+    page = await apaginate_queryset(paginator, reactions, request, view=view)
+    serializer = ReactionSerializer(
+        page,
+        many=True,
+        context={"request": request, "field_selection": selection, "sideload_users": not with_authors},
+    )
+    return await aadd_sideloaded_users(request, paginator.get_paginated_response(serializer.data))
+
+
+@async_read_view
+async def post_events(request, pk):
+    """
+    The post's `comment.created` and `reaction.changed` events as they are published
+    (see `apps.blog.live`), as a `text/event-stream`. A reconnecting client sends the
+    `Last-Event-ID` header (or `?last_event_id=`) to receive what it missed first.
+    """
+    bus = get_event_bus()
+    if bus is None:
+        return Response({"detail": "Live events are disabled."}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+
+    last_id = request.headers.get("Last-Event-ID") or request.query_params.get("last_event_id")
+    if last_id is not None and not EVENT_ID_RE.match(last_id):
+        return Response({"detail": "Invalid Last-Event-ID."}, status=status.HTTP_400_BAD_REQUEST)
+    post = await _aget_post(Post.objects.only("id"), pk)
+
+    response = StreamingHttpResponse(_event_stream(bus, post.id, last_id), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"  # no proxy buffering (nginx)
+    return response
+
+
+async def _event_stream(bus, post_id, last_id):
+    # Reconnect after 3s; the stream ends after BLOG_LIVE_MAX_DURATION so connections get recycled
+    yield "retry: 3000\n\n"
+    deadline = time.monotonic() + settings.BLOG_LIVE_MAX_DURATION
+    subscription = bus.subscribe(post_id, last_id, timeout=settings.BLOG_LIVE_KEEPALIVE)
+    try:
+        async for events in subscription:
+            if not events:
+                yield ": keep-alive\n\n"
+            for event_id, event_type, data in events:
+                yield f"id: {event_id}\nevent: {event_type}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+            if time.monotonic() >= deadline:
+                break
+    finally:
+        await subscription.aclose()
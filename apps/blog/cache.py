@@ -0,0 +1,231 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.cache import get_conditional_response
+from rest_framework.response import Response
+
+STATS_HITS_KEY = "blog:cache:stats:hits"
+STATS_MISSES_KEY = "blog:cache:stats:misses"
+POST_LIST_VERSION_KEY = "blog:posts:version"
+# Covers data shared by every post (e.g. nested author profiles)
+BLOG_VERSION_KEY = "blog:version"
+
+
+def _version_key(post_id):
+    return f"blog:post:{post_id}:version"
+
+
+def _get_versions(*keys):
+    # Versions start from a millisecond timestamp, so a key lost to eviction or a
+    # restart never comes back with a number that older entries were stored under.
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, int(time.time() * 1000), timeout=None)
+            versions[key] = cache.get(key)
+    return ".".join(str(versions[key]) for key in keys)
+
+
+async def _aget_versions(*keys):
+    # `_get_versions` through the async cache API
+    versions = await cache.aget_many(keys)
+    for key in keys:
+        if key not in versions:
+            await cache.aadd(key, int(time.time() * 1000), timeout=None)
+            versions[key] = await cache.aget(key)
+    return ".".join(str(versions[key]) for key in keys)
+
+
+def _incr(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        # no version yet: nothing can be cached under it
+        _get_versions(key)
+
+
+def post_cache_version(post_id):
+    """Current version of everything cached for a post."""
+    return _get_versions(BLOG_VERSION_KEY, _version_key(post_id))
+
+
+def post_list_cache_version():
+    """Current version of the post feed (any post, comment or reaction write changes it)."""
+    return _get_versions(BLOG_VERSION_KEY, POST_LIST_VERSION_KEY)
+
+
+async def apost_cache_version(post_id):
+    return await _aget_versions(BLOG_VERSION_KEY, _version_key(post_id))
+
+
+async def apost_list_cache_version():
+    return await _aget_versions(BLOG_VERSION_KEY, POST_LIST_VERSION_KEY)
+
+
+def _incr_versions(post_ids):
+    for post_id in post_ids:
+        _incr(_version_key(post_id))
+    _incr(POST_LIST_VERSION_KEY)
+
+
+def bump_post_cache_version(post_id):
+    """
+    Invalidate every cached response of a post.
+
+    Bumped right away and again once the transaction commits, so a read that
+    re-cached the old rows in between does not survive the commit.
+    """
+    bump_post_cache_versions([post_id])
+
+
+def bump_post_cache_versions(post_ids):
+    """`bump_post_cache_version` for many posts, bumping the feed version only once."""
+    post_ids = sorted(set(post_ids))
+    if not post_ids:
+        return
+    _incr_versions(post_ids)
+    transaction.on_commit(lambda: _incr_versions(post_ids))
+
+
+def bump_blog_cache_version():
+    """Invalidate every cached blog response, e.g. after a user profile change."""
+    _incr(BLOG_VERSION_KEY)
+    transaction.on_commit(lambda: _incr(BLOG_VERSION_KEY))
+
+
+def _record(stat_key):
+    try:
+        cache.incr(stat_key)
+    except ValueError:
+        cache.add(stat_key, 0, timeout=None)
+        cache.incr(stat_key)
+
+
+async def _arecord(stat_key):
+    try:
+        await cache.aincr(stat_key)
+    except ValueError:
+        await cache.aadd(stat_key, 0, timeout=None)
+        await cache.aincr(stat_key)
+
+
+def cache_stats():
+    hits = cache.get(STATS_HITS_KEY, 0)
+    misses = cache.get(STATS_MISSES_KEY, 0)
+    total = hits + misses
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_ratio": hits / total if total else 0.0,
+    }
+
+
+def reset_cache_stats():
+    cache.delete_many([STATS_HITS_KEY, STATS_MISSES_KEY])
+
+
+def _url_hash(request):
+    # The full URL: query params and cursors select a different representation
+    return hashlib.sha1(request.build_absolute_uri().encode()).hexdigest()
+
+
+def _etag(scope, version, url_hash):
+    return f'"{scope}-{version}-{url_hash[:16]}"'
+
+
+def conditional_response(request, etag, build_response):
+    """
+    `304 Not Modified` if the client already holds `etag` (If-None-Match),
+    otherwise `build_response()` tagged with it.
+    """
+    not_modified = get_conditional_response(request, etag=etag)
+    if not_modified is not None:
+        return not_modified
+
+    response = build_response()
+    if response.status_code == 200:
+        response["ETag"] = etag
+    return response
+
+
+def post_list_response(request, build_response):
+    """The post feed, answered with a 304 when nothing in the blog changed since the client's copy."""
+    etag = _etag("posts", post_list_cache_version(), _url_hash(request))
+    return conditional_response(request, etag, build_response)
+
+
+def cached_post_response(name, post_id, request, build_response):
+    """
+    Serve a read of `post_id` from the cache, or build it with `build_response()`
+    and cache its data under the post's current version.
+
+    The key covers the full URL (query params, cursor links), not the user:
+    cached representations must not depend on who is asking.
+    The version doubles as the ETag, so a matching If-None-Match is answered
+    with a 304 before the cache or the database is read.
+    Sets `X-Cache: HIT|MISS` on the response.
+    """
+    version = post_cache_version(post_id)
+    url_hash = _url_hash(request)
+    key = f"blog:post:{post_id}:v{version}:{name}:{url_hash}"
+
+    def build_cached_response():
+        data = cache.get(key)
+        if data is not None:
+            _record(STATS_HITS_KEY)
+            return Response(data, headers={"X-Cache": "HIT"})
+
+        _record(STATS_MISSES_KEY)
+        response = build_response()
+        if response.status_code == 200:
+            cache.set(key, response.data, timeout=settings.BLOG_CACHE_TIMEOUT)
+        response["X-Cache"] = "MISS"
+        return response
+
+    return conditional_response(request, _etag(f"post{post_id}-{name}", version, url_hash), build_cached_response)
+
+
+# Async counterparts for the async read views (`apps.blog.async_views`): same keys,
+# versions and ETags, `build_response` is a coroutine function.
+
+
+async def aconditional_response(request, etag, build_response):
+    not_modified = get_conditional_response(request, etag=etag)
+    if not_modified is not None:
+        return not_modified
+
+    response = await build_response()
+    if response.status_code == 200:
+        response["ETag"] = etag
+    return response
+
+
+async def apost_list_response(request, build_response):
+    etag = _etag("posts", await apost_list_cache_version(), _url_hash(request))
+    return await aconditional_response(request, etag, build_response)
+
+
+async def acached_post_response(name, post_id, request, build_response):
+    version = await apost_cache_version(post_id)
+    url_hash = _url_hash(request)
+    key = f"blog:post:{post_id}:v{version}:{name}:{url_hash}"
+
+    async def build_cached_response():
+        data = await cache.aget(key)
+        if data is not None:
+            await _arecord(STATS_HITS_KEY)
+            return Response(data, headers={"X-Cache": "HIT"})
+
+        await _arecord(STATS_MISSES_KEY)
+        response = await build_response()
+        if response.status_code == 200:
+            await cache.aset(key, response.data, timeout=settings.BLOG_CACHE_TIMEOUT)
+        response["X-Cache"] = "MISS"
+        return response
+
+    return await aconditional_response(
+        request, _etag(f"post{post_id}-{name}", version, url_hash), build_cached_response
+    )
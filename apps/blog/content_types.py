@@ -0,0 +1,32 @@
+from django.contrib.contenttypes.models import ContentType
+
+from .models import Comment, Post
+
+# Models that can be reacted to, by the name the API uses for them
+REACTION_TARGET_MODELS = {"post": Post, "comment": Comment}
+
+_content_types = {}
+
+
+def target_content_types():
+    """
+    {"post": ContentType, "comment": ContentType}, resolved once per process
+    (reset after migrations, which may recreate the rows).
+    """
+    if not _content_types:
+        by_model = ContentType.objects.get_for_models(*REACTION_TARGET_MODELS.values())
+        _content_types.update({kind: by_model[model] for kind, model in REACTION_TARGET_MODELS.items()})
+    return _content_types
+
+
+def content_type_for(target):
+    """ContentType of a post/comment instance or model, without a lookup in the hot path."""
+    model = target if isinstance(target, type) else type(target)
+    for kind, target_model in REACTION_TARGET_MODELS.items():
+        if target_model is model:
+            return target_content_types()[kind]
+    return ContentType.objects.get_for_model(target)
+
+
+def clear_target_content_types(**kwargs):
+    _content_types.clear()
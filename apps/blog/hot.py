@@ -0,0 +1,85 @@
+"""
+"Hot" ranking of posts, kept in `PostHotScore` as activity happens.
+
+Every piece of activity (the post being published, a comment, a reaction on
+the post) adds its weight to the post's score, and weights decay exponentially
+with a half-life of `BLOG_HOT_HALF_LIFE` seconds. With tau = half-life / ln 2:
+
+    score(t) = sum(weight_i * exp(-(t - t_i) / tau))
+    rank     = ln(score(t)) + t / tau = ln(sum(weight_i * exp(t_i / tau)))
+
+`rank` orders posts exactly like `score(t)` at any instant but does not depend
+on t, so the feed and its cursors never move just because time passed. Both are
+maintained with one upsert per write (`record_post_activity`); `score` is kept
+current for readers by the `decay_hot_scores` beat task.
+"""
+
+import math
+
+from django.conf import settings
+from django.db import connection
+
+from .models import PostHotScore
+
+# Decayed below this, a score is stored as 0 and no longer rewritten by the decay task
+NEGLIGIBLE_SCORE = 1e-3
+
+# exp() raises on underflow in Postgres: decay exponents are capped (exp(-700) is 0 for our purposes)
+_RECORD_ACTIVITY_SQL = """
+WITH activity (post_id, weight) AS (VALUES {values})
+INSERT INTO {table} AS hot (post_id, score, decayed_at, rank)
+SELECT post_id, weight, NOW(), LN(weight) + EXTRACT(EPOCH FROM NOW()) / %s FROM activity
+ORDER BY post_id
+ON CONFLICT (post_id) DO UPDATE SET
+    score = EXCLUDED.score
+        + hot.score * EXP(-LEAST(EXTRACT(EPOCH FROM EXCLUDED.decayed_at - hot.decayed_at) / %s, 700)),
+    decayed_at = EXCLUDED.decayed_at,
+    rank = GREATEST(hot.rank, EXCLUDED.rank) + LN(1 + EXP(-LEAST(ABS(hot.rank - EXCLUDED.rank), 700)))
+"""
+
+_DECAY_SQL = """
+WITH decayed AS (
+    SELECT post_id, score * EXP(-LEAST(EXTRACT(EPOCH FROM NOW() - decayed_at) / %(tau)s, 700)) AS score
+    FROM {table}
+    WHERE score > 0
+)
+UPDATE {table} AS hot
+SET score = CASE WHEN decayed.score < %(negligible)s THEN 0 ELSE decayed.score END, decayed_at = NOW()
+FROM decayed
+WHERE hot.post_id = decayed.post_id
+"""
+
+
+def decay_time_constant():
+    """tau, in seconds: weights fall by a factor e every tau."""
+    return settings.BLOG_HOT_HALF_LIFE / math.log(2)
+
+
+def record_post_activity(weights):
+    """
+    Add activity to posts' hot scores: `weights` is {post_id: weight} (weights > 0).
+    One statement whatever the number of posts; rows are locked in post order.
+    Call inside the transaction of the write that caused the activity.
+    """
+    weights = sorted((post_id, weight) for post_id, weight in weights.items() if weight > 0)
+    if not weights:
+        return
+    tau = decay_time_constant()
+    sql = _RECORD_ACTIVITY_SQL.format(
+        values=", ".join(["(%s::bigint, %s::double precision)"] * len(weights)),
+        table=connection.ops.quote_name(PostHotScore._meta.db_table),
+    )
+    params = [value for pair in weights for value in pair]
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [*params, tau, tau])
+
+
+def decay_hot_scores():
+    """
+    Bring every non-zero `score` up to date with the time elapsed since it was last
+    decayed. Ranks are left alone: time does not change them. Returns the rows updated.
+    """
+    sql = _DECAY_SQL.format(table=connection.ops.quote_name(PostHotScore._meta.db_table))
+    with connection.cursor() as cursor:
+        cursor.execute(sql, {"tau": decay_time_constant(), "negligible": NEGLIGIBLE_SCORE})
+        return cursor.rowcount
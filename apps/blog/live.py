@@ -0,0 +1,337 @@
+"""
+Live events of a post (`comment.created`, `reaction.changed`), published from the
+write paths and streamed to clients by `async_views.post_events` (Server-Sent Events).
+
+Each post has a bounded, replayable event stream: a Redis stream at
+`BLOG_LIVE_EVENTS_URL` (shared by every web and Celery process), or an in-process
+one for `local://` (tests, single-process development). Event ids increase within
+a post's stream, so a client reconnecting with `Last-Event-ID` gets what it missed
+(as long as it is still among the last `BLOG_LIVE_HISTORY` events).
+Without `BLOG_LIVE_EVENTS_URL`, nothing is published.
+"""
+
+import asyncio
+import json
+import logging
+import re
+import threading
+import uuid
+import weakref
+from collections import defaultdict, deque
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+
+from .content_types import target_content_types
+from .models import Comment
+
+logger = logging.getLogger(__name__)
+
+# `BLOG_LIVE_EVENTS_URL` selecting `LocalEventBus`
+LOCAL_EVENTS_URL = "local://"
+
+STREAM_KEY = "blog:live:post:{post_id}"
+# Per-process stream that interrupts the shared blocking read (see `_StreamReader`)
+WAKE_KEY = "blog:live:wake:{token}"
+WAKE_KEY_TTL = 3600
+
+# "<milliseconds>-<sequence>", the Redis stream id format (the local bus uses "<sequence>-0")
+EVENT_ID_RE = re.compile(r"^\d+-\d+$")
+
+COMMENT_CREATED = "comment.created"
+REACTION_CHANGED = "reaction.changed"
+
+
+def _id_key(event_id):
+    return tuple(int(part) for part in event_id.split("-"))
+
+
+class RedisEventBus:
+    def __init__(self, url):
+        import redis
+
+        self.url = url
+        self.client = redis.Redis.from_url(url, decode_responses=True)
+        # event loop -> its `_StreamReader` (a redis.asyncio client belongs to one loop)
+        self._readers = weakref.WeakKeyDictionary()
+
+    def publish(self, post_id, event_type, data):
+        key = STREAM_KEY.format(post_id=post_id)
+        fields = {"type": event_type, "data": json.dumps(data, cls=DjangoJSONEncoder)}
+        pipeline = self.client.pipeline()
+        pipeline.xadd(key, fields, maxlen=settings.BLOG_LIVE_HISTORY, approximate=True)
+        pipeline.expire(key, settings.BLOG_LIVE_HISTORY_TTL)
+        pipeline.execute()
+
+    async def subscribe(self, post_id, last_id, timeout):
+        """
+        Yield the events of `post_id` after `last_id` (None: only new ones) as lists of
+        `(id, type, data)`; an empty list after `timeout` seconds without any.
+        """
+        loop = asyncio.get_running_loop()
+        key = STREAM_KEY.format(post_id=post_id)
+        subscriber = None
+        while subscriber is None:
+            reader = self._readers.get(loop)
+            if reader is None or reader.closed:
+                reader = self._readers[loop] = _StreamReader(self.url)
+            # None if the reader stopped meanwhile (its last subscriber left): start another
+            subscriber = await reader.add(key, last_id)
+        try:
+            while True:
+                yield await subscriber.get(timeout)
+        finally:
+            reader.remove(subscriber)
+
+
+class _Subscriber:
+    def __init__(self, key, last_id):
+        self.key = key
+        self.last_id = last_id
+        self.events = []
+        self.error = None
+        self.ready = asyncio.Event()
+
+    def push(self, events):
+        events = [event for event in events if _id_key(event[0]) > _id_key(self.last_id)]
+        if events:
+            self.last_id = events[-1][0]
+            self.events.extend(events)
+            self.ready.set()
+
+    def fail(self, error):
+        self.error = error
+        self.ready.set()
+
+    async def get(self, timeout):
+        if not self.events and self.error is None:
+            self.ready.clear()
+            try:
+                await asyncio.wait_for(self.ready.wait(), timeout)
+            except TimeoutError:
+                pass
+        if self.error is not None:
+            raise self.error
+        events, self.events = self.events, []
+        return events
+
+
+class _StreamReader:
+    """
+    The subscriptions of one event loop: a single blocking XREAD over the streams of
+    every subscribed post, on one client, fanned out to the subscribers in memory.
+    An idle SSE connection costs a `_Subscriber`, not a Redis connection.
+    Stops (closing its client) when its last subscriber leaves.
+    """
+
+    def __init__(self, url):
+        import redis.asyncio
+
+        self.client = redis.asyncio.Redis.from_url(url, decode_responses=True)
+        # Written to when a post is first subscribed to, to interrupt the pending XREAD
+        self.wake_key = WAKE_KEY.format(token=uuid.uuid4().hex)
+        self.cursors = {self.wake_key: "0-0"}  # stream key -> id of the last event read
+        self.subscribers = defaultdict(set)  # stream key -> its subscribers
+        self.task = None
+        self.closed = False
+
+    async def add(self, key, last_id):
+        if last_id is None and key not in self.cursors:
+            latest = await self.client.xrevrange(key, count=1)
+            last_id = latest[0][0] if latest else "0-0"
+        if self.closed:
+            return None
+
+        # No await from here to the registration: the reader cannot move the cursor in between
+        new_key = key not in self.cursors
+        if new_key:
+            self.cursors[key] = last_id or "0-0"
+        cursor = self.cursors[key]
+        last_id = last_id or cursor
+        behind = _id_key(last_id) < _id_key(cursor)
+        subscriber = _Subscriber(key, cursor if behind else last_id)
+        self.subscribers[key].add(subscriber)
+        if self.task is None:
+            self.task = asyncio.create_task(self._run())
+
+        if behind:
+            # What the reader read before this subscriber joined: (last_id, cursor]
+            entries = await self.client.xrange(key, min=f"({last_id}", max=cursor)
+            subscriber.events[:0] = [_event(entry) for entry in entries]
+            if subscriber.events:
+                subscriber.ready.set()
+        if new_key:
+            pipeline = self.client.pipeline(transaction=False)
+            pipeline.xadd(self.wake_key, {"key": key}, maxlen=1)
+            pipeline.expire(self.wake_key, WAKE_KEY_TTL)
+            await pipeline.execute()
+        return subscriber
+
+    def remove(self, subscriber):
+        subscribers = self.subscribers.get(subscriber.key)
+        if subscribers is None:
+            return
+        subscribers.discard(subscriber)
+        if not subscribers:
+            del self.subscribers[subscriber.key]
+            del self.cursors[subscriber.key]
+
+    async def _run(self):
+        try:
+            while self.subscribers:
+                sent = dict(self.cursors)
+                response = await self.client.xread(sent, count=100, block=int(settings.BLOG_LIVE_KEEPALIVE * 1000))
+                for key, entries in response:
+                    # Skip a stream unsubscribed (or subscribed anew) during the read
+                    if not entries or self.cursors.get(key) != sent[key]:
+                        continue
+                    self.cursors[key] = entries[-1][0]
+                    if key == self.wake_key:
+                        continue
+                    events = [_event(entry) for entry in entries]
+                    for subscriber in self.subscribers[key]:
+                        subscriber.push(events)
+        except Exception as exc:
+            logger.warning("Live events reader failed", exc_info=True)
+            for subscribers in self.subscribers.values():
+                for subscriber in subscribers:
+                    subscriber.fail(exc)
+        finally:
+            self.closed = True
+            await self.client.aclose()
+
+
+def _event(entry):
+    event_id, fields = entry
+    return event_id, fields["type"], json.loads(fields["data"])
+
+
+class LocalEventBus:
+    """
+    In-process stand-in for `RedisEventBus` (tests, single-process development).
+    Publishers may run in any thread; subscribers are woken in their event loop.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.streams = defaultdict(lambda: deque(maxlen=settings.BLOG_LIVE_HISTORY))
+        self.sequence = 0
+        self.waiters = set()
+
+    def publish(self, post_id, event_type, data):
+        data = json.loads(json.dumps(data, cls=DjangoJSONEncoder))  # what a Redis round trip returns
+        with self.lock:
+            self.sequence += 1
+            self.streams[post_id].append((f"{self.sequence}-0", event_type, data))
+            waiters = list(self.waiters)
+        for loop, event in waiters:
+            loop.call_soon_threadsafe(event.set)
+
+    def _after(self, post_id, last_id):
+        with self.lock:
+            stream = list(self.streams.get(post_id, ()))
+        return [event for event in stream if _id_key(event[0]) > _id_key(last_id)]
+
+    async def subscribe(self, post_id, last_id, timeout):
+        loop = asyncio.get_running_loop()
+        woken = asyncio.Event()
+        waiter = (loop, woken)
+        with self.lock:
+            if last_id is None:
+                stream = self.streams.get(post_id)
+                last_id = stream[-1][0] if stream else "0-0"
+            self.waiters.add(waiter)
+        try:
+            while True:
+                deadline = loop.time() + timeout
+                events = self._after(post_id, last_id)
+                # woken by any post's event: wait again until one of ours or the timeout
+                while not events and loop.time() < deadline:
+                    try:
+                        await asyncio.wait_for(woken.wait(), deadline - loop.time())
+                    except TimeoutError:
+                        pass
+                    woken.clear()
+                    events = self._after(post_id, last_id)
+                if events:
+                    last_id = events[-1][0]
+                yield events
+        finally:
+            with self.lock:
+                self.waiters.discard(waiter)
+
+
+_bus = None
+
+
+def get_event_bus():
+    """The process-wide bus for `BLOG_LIVE_EVENTS_URL`, or None when live events are off."""
+    global _bus
+    url = settings.BLOG_LIVE_EVENTS_URL
+    if not url:
+        return None
+    if _bus is None:
+        _bus = LocalEventBus() if url == LOCAL_EVENTS_URL else RedisEventBus(url)
+    return _bus
+
+
+def publish(post_id, event_type, data):
+    """
+    Publish an event of `post_id` once the current transaction commits (never for a
+    rolled-back write). `data` is a dict, or a callable returning it at commit time.
+    Best effort: a bus outage is logged and does not fail the write.
+    """
+    bus = get_event_bus()
+    if bus is None:
+        return
+
+    def send():
+        try:
+            bus.publish(post_id, event_type, data() if callable(data) else data)
+        except Exception:
+            logger.warning("Could not publish %s for post %s", event_type, post_id, exc_info=True)
+
+    transaction.on_commit(send)
+
+
+def publish_comment_created(comment):
+    # Built at commit: `Comment.save()` fills the tree columns after its post_save
+    publish(
+        comment.post_id,
+        COMMENT_CREATED,
+        lambda: {
+            "id": comment.id,
+            "post": comment.post_id,
+            "parent": comment.parent_id,
+            "depth": comment.depth,
+            "author_id": comment.author_id,
+            "content": comment.content,
+            "created_at": comment.created_at,
+        },
+    )
+
+
+def publish_reaction_changes(changes):
+    """
+    One `reaction.changed` event per `(content_type_id, object_id, old_type, new_type)`,
+    on the stream of the post the object belongs to (one query for reactions on comments).
+    """
+    changes = [change for change in changes if change[2] != change[3]]
+    if not changes or get_event_bus() is None:
+        return
+
+    kinds = {content_type.pk: kind for kind, content_type in target_content_types().items()}
+    comment_ids = {object_id for content_type_id, object_id, _, _ in changes if kinds[content_type_id] == "comment"}
+    comment_posts = dict(Comment.objects.filter(pk__in=comment_ids).values_list("pk", "post_id")) if comment_ids else {}
+
+    for content_type_id, object_id, old_type, new_type in changes:
+        kind = kinds[content_type_id]
+        post_id = object_id if kind == "post" else comment_posts.get(object_id)
+        if post_id is None:
+            continue  # the comment is being deleted
+        publish(
+            post_id,
+            REACTION_CHANGED,
+            {"target": kind, "object_id": object_id, "old_type": old_type, "new_type": new_type},
+        )
@@ -0,0 +1,114 @@
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, close_old_connections, connections
+from django.db.backends.signals import connection_created
+from django.db.utils import load_backend
+from django.test import Client, override_settings
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.blog.models import Post
+
+BENCHMARK_USERNAME = "db-pool-benchmark"
+
+PLAIN_ENGINE = "django.db.backends.postgresql"
+POOLED_ENGINE = "apps.core.postgresql_pool"
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare per-request latency of an API endpoint with a new Postgres connection per request "
+        "and with connections from the pool (apps/core/postgresql_pool), against the same database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--url-name", default="post-detail", help="post-detail, post-comments or post-list.")
+        parser.add_argument("--requests", type=int, default=300, help="Requests per mode.")
+        parser.add_argument("--threads", type=int, default=1, help="Concurrent clients (one thread each).")
+        parser.add_argument("--warmup", type=int, default=50, help="Unmeasured requests first (imports, caches).")
+        parser.add_argument("--pool-size", type=int, help="Pool size (default: one connection per thread).")
+
+    def handle(self, *args, **options):
+        User = get_user_model()
+        user, _ = User.objects.get_or_create(username=BENCHMARK_USERNAME)
+        post, _ = Post.objects.get_or_create(author=user, title="Pool benchmark", defaults={"content": "Lorem ipsum"})
+        kwargs = {} if options["url_name"] == "post-list" else {"pk": post.id}
+        url = reverse(options["url_name"], kwargs=kwargs)
+        token = str(AccessToken.for_user(user))
+
+        base = {key: value for key, value in connections[DEFAULT_DB_ALIAS].settings_dict.items() if key != "POOL"}
+        pool_options = {
+            "max_size": options["pool_size"] or options["threads"],
+            "timeout": 30,
+            "max_lifetime": None,
+            "check_after": 30,
+        }
+        modes = [
+            ("no pool", {**base, "ENGINE": PLAIN_ENGINE}),
+            ("pool", {**base, "ENGINE": POOLED_ENGINE, "POOL": pool_options}),
+        ]
+
+        self.stdout.write(f"GET {url}, {options['requests']} requests per mode, {options['threads']} thread(s)")
+        self.stdout.write(f"{'mode':<8} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'connections':>12}")
+        try:
+            # "testserver" is the host of Django's test client
+            with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"]):
+                self._run(modes[0][1], url, token, {**options, "requests": options["warmup"], "threads": 1})
+                for label, settings_dict in modes:
+                    rate, p50, p95, opened = self._run(settings_dict, url, token, options)
+                    self.stdout.write(f"{label:<8} {rate:>8.1f} {p50:>8.2f} {p95:>8.2f} {opened:>12}")
+        finally:
+            User.objects.filter(username=BENCHMARK_USERNAME).delete()
+
+    def _run(self, settings_dict, url, token, options):
+        """(requests/s, p50 ms, p95 ms, connections opened) for `options["requests"]` GETs of `url`."""
+        backend = load_backend(settings_dict["ENGINE"])
+        counts = [options["requests"] // options["threads"]] * options["threads"]
+        counts[0] += options["requests"] % options["threads"]
+        connects = []
+
+        def count_connection(sender, connection, **kwargs):
+            connects.append(connection.alias)
+
+        def client_thread(count):
+            # Connections are per thread: this thread's requests use a wrapper with `settings_dict`
+            connections[DEFAULT_DB_ALIAS] = backend.DatabaseWrapper(settings_dict, DEFAULT_DB_ALIAS)
+            client = Client(HTTP_AUTHORIZATION=f"Bearer {token}")
+            latencies = []
+            try:
+                for i in range(count):
+                    started = time.perf_counter()
+                    # A unique query parameter per request: every request misses the response cache
+                    response = client.get(url, {"bench": i})
+                    # What the request_finished signal does outside the test client (it disconnects it):
+                    # give the connection back, i.e. close it, or return it to the pool
+                    close_old_connections()
+                    latencies.append((time.perf_counter() - started) * 1000)
+                    if response.status_code != 200:
+                        raise RuntimeError(f"GET {url} returned {response.status_code}")
+            finally:
+                connections[DEFAULT_DB_ALIAS].close()
+            return latencies
+
+        connection_created.connect(count_connection)
+        started = time.perf_counter()
+        try:
+            with ThreadPoolExecutor(options["threads"]) as executor:
+                latencies = sorted(latency for result in executor.map(client_thread, counts) for latency in result)
+        finally:
+            elapsed = time.perf_counter() - started
+            connection_created.disconnect(count_connection)
+
+        # Django "connects" on every checkout from the pool: the pool knows what it really opened
+        wrapper = backend.DatabaseWrapper(settings_dict, DEFAULT_DB_ALIAS)
+        opened = len(connects)
+        if wrapper.pool is not None:
+            opened = wrapper.pool.stats()["connections_created"]
+            wrapper.close_pool()
+        p95 = latencies[max(int(len(latencies) * 0.95) - 1, 0)]
+        return len(latencies) / elapsed, statistics.median(latencies), p95, opened
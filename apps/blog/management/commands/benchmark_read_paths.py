@@ -0,0 +1,107 @@
+import asyncio
+import statistics
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.test import AsyncClient, override_settings
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.blog.models import Comment, Post
+from apps.blog.services import upsert_reaction
+from apps.core.enums import ReactionType
+
+BENCHMARK_USERNAME = "read-path-benchmark"
+
+# (label, URL name, needs a post id)
+ENDPOINTS = [
+    ("list", "post-list", False),
+    ("detail", "post-detail", True),
+    ("comments", "post-comments", True),
+    ("reactions", "post-reactions", True),
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the sync (DRF) and async read endpoints under concurrent load, against the same seeded "
+        "dataset. Requests go through Django's ASGI handler in-process, as under an ASGI server."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--posts", type=int, default=30)
+        parser.add_argument("--comments", type=int, default=20, help="Comments per post (half of them replies).")
+        parser.add_argument("--reactors", type=int, default=20, help="Users reacting to every post.")
+        parser.add_argument("--requests", type=int, default=200, help="Requests per endpoint and path.")
+        parser.add_argument("--concurrency", default="1,10,50", help="Comma-separated in-flight request counts.")
+        parser.add_argument("--keep", action="store_true", help="Keep the seeded data for the next run.")
+
+    def handle(self, *args, **options):
+        users, post_ids = self._seed(options["posts"], options["comments"], options["reactors"])
+        token = str(AccessToken.for_user(users[0]))
+        try:
+            # "testserver" is the host of Django's test client
+            with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"]):
+                self._run(token, post_ids, options["requests"], options["concurrency"])
+        finally:
+            if not options["keep"]:
+                get_user_model().objects.filter(username__startswith=BENCHMARK_USERNAME).delete()
+
+    def _run(self, token, post_ids, requests, concurrency_levels):
+        self.stdout.write(f"{'endpoint':<10} {'conc':>4}  {'path':<5} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8}")
+        for label, name, detail in ENDPOINTS:
+            for concurrency in (int(value) for value in concurrency_levels.split(",")):
+                for path, url_name in (("sync", name), ("async", f"async-{name}")):
+                    urls = [
+                        reverse(url_name, kwargs={"pk": post_ids[i % len(post_ids)]} if detail else {})
+                        for i in range(requests)
+                    ]
+                    rate, p50, p95 = asyncio.run(self._load(urls, token, concurrency))
+                    self.stdout.write(f"{label:<10} {concurrency:>4}  {path:<5} {rate:>8.1f} {p50:>8.1f} {p95:>8.1f}")
+
+    def _seed(self, posts, comments, reactors):
+        User = get_user_model()
+        users = [User.objects.get_or_create(username=f"{BENCHMARK_USERNAME}-{i}")[0] for i in range(max(reactors, 1))]
+        post_ids = list(Post.objects.filter(author=users[0]).values_list("id", flat=True))
+        if post_ids:
+            self.stdout.write(f"Reusing {len(post_ids)} seeded posts.")
+            return users, post_ids
+
+        self.stdout.write(f"Seeding {posts} posts, {comments} comments and {reactors} reactions each...")
+        for i in range(posts):
+            post = Post.objects.create(author=users[0], title=f"Benchmark post {i}", content="Lorem ipsum " * 100)
+            thread = None
+            for j in range(comments):
+                # every other comment is a reply to the one before
+                parent = thread if j % 2 else None
+                comment = Comment.objects.create(
+                    post=post, author=users[j % len(users)], parent=parent, content=f"Comment {j}"
+                )
+                thread = thread if parent else comment
+            for user in users[:reactors]:
+                upsert_reaction(user, post, ReactionType.LIKE)
+            post_ids.append(post.id)
+        return users, post_ids
+
+    async def _load(self, urls, token, concurrency):
+        """Send `urls` with at most `concurrency` in flight; (requests/s, p50 ms, p95 ms)."""
+        # A unique query parameter per request: every request misses the response cache
+        client = AsyncClient(AUTHORIZATION=f"Bearer {token}")
+        pending = iter(enumerate(urls))
+        latencies = []
+
+        async def worker():
+            for i, url in pending:
+                started = time.perf_counter()
+                response = await client.get(url, {"bench": i})
+                latencies.append((time.perf_counter() - started) * 1000)
+                if response.status_code != 200:
+                    raise RuntimeError(f"GET {url} returned {response.status_code}")
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+        latencies.sort()
+        return len(urls) / elapsed, statistics.median(latencies), latencies[int(len(latencies) * 0.95) - 1]
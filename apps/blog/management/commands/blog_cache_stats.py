@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from apps.blog.cache import cache_stats, reset_cache_stats
+
+
+class Command(BaseCommand):
+    help = "Hits, misses and hit ratio of the post response cache (apps/blog/cache.py), shared by all processes."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--reset", action="store_true", help="Start counting again from zero afterwards.")
+
+    def handle(self, *args, reset=False, **options):
+        stats = cache_stats()
+        self.stdout.write(f"hits: {stats['hits']}  misses: {stats['misses']}  hit ratio: {stats['hit_ratio']:.1%}")
+        if reset:
+            reset_cache_stats()
+            self.stdout.write("counters reset")
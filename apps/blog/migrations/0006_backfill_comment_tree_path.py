@@ -0,0 +1,47 @@
+# Generated by Django 5.2.8 on 2026-10-17 03:40
+
+from collections import defaultdict
+
+from django.db import migrations
+
+PATH_SEGMENT_WIDTH = 10
+BATCH_SIZE = 1000
+
+
+def backfill_comment_tree(apps, schema_editor):
+    """
+    Fill root/depth/path for existing comments, one post at a time,
+    walking each thread top-down so parents are always resolved first.
+    """
+    Comment = apps.get_model("blog", "Comment")
+
+    # order_by() replaces Meta.ordering ("created_at"), which DISTINCT would otherwise
+    # include: one row per comment instead of one per post
+    post_ids = Comment.objects.order_by("post_id").values_list("post_id", flat=True).distinct()
+    for post_id in post_ids.iterator():
+        children = defaultdict(list)
+        for comment in Comment.objects.filter(post_id=post_id).only("id", "parent_id").order_by("id"):
+            children[comment.parent_id].append(comment)
+
+        updated = []
+        stack = [(comment, comment.id, 0, "") for comment in children[None]]
+        while stack:
+            comment, root_id, depth, parent_path = stack.pop()
+            comment.root_id = root_id
+            comment.depth = depth
+            comment.path = parent_path + str(comment.id).zfill(PATH_SEGMENT_WIDTH)
+            updated.append(comment)
+            stack.extend((child, root_id, depth + 1, comment.path) for child in children[comment.id])
+
+        Comment.objects.bulk_update(updated, ["root", "depth", "path"], batch_size=BATCH_SIZE)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0005_comment_tree_path"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_comment_tree, migrations.RunPython.noop),
+    ]
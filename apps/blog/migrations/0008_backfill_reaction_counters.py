@@ -0,0 +1,40 @@
+# Generated by Django 5.2.8 on 2026-10-17 03:30
+
+from django.db import migrations
+from django.db.models import Count
+
+BATCH_SIZE = 1000
+
+
+def backfill_reaction_counters(apps, schema_editor):
+    Reaction = apps.get_model("blog", "Reaction")
+    ReactionCounter = apps.get_model("blog", "ReactionCounter")
+
+    rows = (
+        Reaction.objects.values("content_type_id", "object_id", "type")
+        .annotate(total=Count("id"))
+        .order_by()
+    )
+    ReactionCounter.objects.bulk_create(
+        (
+            ReactionCounter(
+                content_type_id=row["content_type_id"],
+                object_id=row["object_id"],
+                type=row["type"],
+                count=row["total"],
+            )
+            for row in rows.iterator()
+        ),
+        batch_size=BATCH_SIZE,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0007_reaction_counter"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_reaction_counters, migrations.RunPython.noop),
+    ]
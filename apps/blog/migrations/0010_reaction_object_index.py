@@ -0,0 +1,27 @@
+# Generated by Django 5.2.8 on 2026-10-17 03:38
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0009_post_feed_index"),
+        ("contenttypes", "0002_remove_content_type_name"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="reaction",
+            name="blog_reacti_content_3b2361_idx",
+        ),
+        migrations.AddIndex(
+            model_name="reaction",
+            index=models.Index(
+                fields=["content_type", "object_id", "-id"],
+                name="blog_reaction_object_idx",
+            ),
+        ),
+    ]
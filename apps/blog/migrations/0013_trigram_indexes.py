@@ -0,0 +1,63 @@
+# Generated by Django 5.2.8 on 2026-10-17 04:44
+
+import warnings
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.conf import settings
+from django.db import migrations
+
+INDEXES = [
+    ("comment", "blog_comment_content_trgm_idx", "content"),
+    ("post", "blog_post_title_trgm_idx", "title"),
+    ("post", "blog_post_content_trgm_idx", "content"),
+]
+
+
+def trigram_index(field, name):
+    return django.contrib.postgres.indexes.GinIndex(
+        django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper(field), name="gin_trgm_ops"),
+        name=name,
+    )
+
+
+def _pg_trgm_available(schema_editor):
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+        return cursor.fetchone() is not None
+
+
+def create_trigram_indexes(apps, schema_editor):
+    """
+    Speed-up only: a server without the `pg_trgm` extension (some managed
+    Postgres plans) keeps working with sequential-scan admin search.
+    """
+    if not _pg_trgm_available(schema_editor):
+        warnings.warn("pg_trgm is not available: skipping the trigram indexes of admin search.", RuntimeWarning)
+        return
+
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for model_name, name, field in INDEXES:
+        schema_editor.add_index(apps.get_model("blog", model_name), trigram_index(field, name))
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    for _, name, _ in INDEXES:
+        schema_editor.execute(f"DROP INDEX IF EXISTS {schema_editor.quote_name(name)}")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("blog", "0012_search"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            database_operations=[migrations.RunPython(create_trigram_indexes, drop_trigram_indexes)],
+            state_operations=[
+                migrations.AddIndex(model_name=model_name, index=trigram_index(field, name))
+                for model_name, name, field in INDEXES
+            ],
+        ),
+    ]
@@ -0,0 +1,77 @@
+# Generated by Django 5.2.8 on 2026-10-17 04:52
+
+import django.db.models.deletion
+import math
+
+from django.conf import settings
+from django.db import migrations, models
+
+# Existing posts are ranked as if their publication, comments and reactions had
+# been recorded as they happened: rank = ln(sum(weight * exp(t / tau))), computed
+# as a log-sum-exp around each post's largest term.
+BACKFILL_SQL = """
+WITH activity (post_id, rank) AS (
+    SELECT id, LN(%(post_weight)s) + EXTRACT(EPOCH FROM created_at) / %(tau)s FROM blog_post
+    UNION ALL
+    SELECT post_id, LN(%(comment_weight)s) + EXTRACT(EPOCH FROM created_at) / %(tau)s FROM blog_comment
+    UNION ALL
+    SELECT object_id, LN(%(reaction_weight)s) + EXTRACT(EPOCH FROM created_at) / %(tau)s
+    FROM blog_reaction
+    WHERE content_type_id = (SELECT id FROM django_content_type WHERE app_label = 'blog' AND model = 'post')
+),
+bounded AS (
+    SELECT post_id, rank, MAX(rank) OVER (PARTITION BY post_id) AS top FROM activity
+),
+ranked AS (
+    SELECT post_id, top + LN(SUM(EXP(GREATEST(rank - top, -700)))) AS rank
+    FROM bounded
+    GROUP BY post_id, top
+)
+INSERT INTO blog_posthotscore (post_id, score, decayed_at, rank)
+SELECT post_id, EXP(GREATEST(rank - EXTRACT(EPOCH FROM NOW()) / %(tau)s, -700)), NOW(), rank
+FROM ranked
+"""
+
+
+def backfill_hot_scores(apps, schema_editor):
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(
+            BACKFILL_SQL,
+            {
+                "post_weight": settings.BLOG_HOT_POST_WEIGHT,
+                "comment_weight": settings.BLOG_HOT_COMMENT_WEIGHT,
+                "reaction_weight": settings.BLOG_HOT_REACTION_WEIGHT,
+                "tau": settings.BLOG_HOT_HALF_LIFE / math.log(2),
+            },
+        )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("blog", "0013_trigram_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PostHotScore",
+            fields=[
+                (
+                    "post",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="hot_score",
+                        serialize=False,
+                        to="blog.post",
+                    ),
+                ),
+                ("score", models.FloatField()),
+                ("decayed_at", models.DateTimeField()),
+                ("rank", models.FloatField()),
+            ],
+            options={
+                "indexes": [models.Index(fields=["-rank", "-post"], name="blog_posthotscore_rank_idx")],
+            },
+        ),
+        migrations.RunPython(backfill_hot_scores, migrations.RunPython.noop),
+    ]
@@ -1,10 +1,33 @@
 from django.conf import settings
 from django.contrib.contenttypes.fields import GenericForeignKey, GenericRelation
 from django.contrib.contenttypes.models import ContentType
+from django.contrib.contenttypes.prefetch import GenericPrefetch
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import SearchVector, SearchVectorField
 from django.db import models
+from django.db.models import Q
+from django.db.models.functions import Upper
 
 from apps.core.enums import ReactionType
 
+# Text search configuration of the `search_vector` columns (and of the queries against them)
+SEARCH_CONFIG = "english"
+
+
+def trigram_index(field, name):
+    """
+    GIN trigram index matching Django's `icontains` SQL (`UPPER(col::text) LIKE UPPER(%s)`),
+    so admin searches use an index instead of scanning the table. Needs `pg_trgm`.
+    """
+    return GinIndex(OpClass(Upper(field), name="gin_trgm_ops"), name=name)
+
+
+class SearchVectorDeferringManager(models.Manager):
+    """`search_vector` is only read by search queries: don't load it with every row."""
+
+    def get_queryset(self):
+        return super().get_queryset().defer("search_vector")
+
 
 class Post(models.Model):
     author = models.ForeignKey(
@@ -16,20 +39,96 @@ class Post(models.Model):
     content = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # Kept up to date by Postgres on every write (stored generated column)
+    search_vector = models.GeneratedField(
+        expression=SearchVector("title", weight="A", config=SEARCH_CONFIG)
+        + SearchVector("content", weight="B", config=SEARCH_CONFIG),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
+
+    objects = SearchVectorDeferringManager()
 
     # 👇 allow Post to have reactions
     reactions = GenericRelation(
         "Reaction",
         related_query_name="post",
     )
+    reaction_counters = GenericRelation(
+        "ReactionCounter",
+        related_query_name="post",
+    )
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            # keyset pagination of the feed
+            models.Index(fields=["-created_at", "-id"], name="blog_post_feed_idx"),
+            # full-text search
+            GinIndex(fields=["search_vector"], name="blog_post_search_idx"),
+            # admin search
+            trigram_index("title", "blog_post_title_trgm_idx"),
+            trigram_index("content", "blog_post_content_trgm_idx"),
+        ]
 
     def __str__(self):
         return self.title
 
 
+class PostHotScore(models.Model):
+    """
+    Denormalized "hot" ranking of a post: activity (the post itself, comments,
+    reactions) adds weight, and the weight decays exponentially with time.
+
+    `score` is the decayed weight as of `decayed_at` (refreshed by the
+    `decay_hot_scores` beat task). Feeds order by `rank` = ln(score) + decayed_at / tau,
+    which does not change when time passes or the score is decayed: only new activity
+    moves a post, so cursor pages stay stable like in the normal feed. See `apps.blog.hot`.
+    """
+
+    post = models.OneToOneField(Post, on_delete=models.CASCADE, primary_key=True, related_name="hot_score")
+    score = models.FloatField()
+    decayed_at = models.DateTimeField()
+    rank = models.FloatField()
+
+    class Meta:
+        indexes = [
+            # keyset pagination of the hot feed
+            models.Index(fields=["-rank", "-post"], name="blog_posthotscore_rank_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.score:.2f} on post {self.post_id}"
+
+
+# Width of one zero-padded id segment in `Comment.path`
+COMMENT_PATH_SEGMENT_WIDTH = 10
+COMMENT_PATH_MAX_LENGTH = 255
+# Deepest `Comment.depth` whose path still fits (top-level comments are depth 0)
+COMMENT_MAX_NESTING = COMMENT_PATH_MAX_LENGTH // COMMENT_PATH_SEGMENT_WIDTH - 1
+
+
+class CommentQuerySet(models.QuerySet):
+    def in_thread_order(self):
+        """Depth-first display order: every reply right after its parent."""
+        return self.order_by("path")
+
+    def subtree_of(self, comment):
+        """`comment` and all of its descendants, as one range scan on `path`."""
+        # Paths are digits only, so ":" (next ASCII char after "9") bounds the prefix range
+        return self.filter(post_id=comment.post_id, path__gte=comment.path, path__lt=comment.path + ":")
+
+    def up_to_depth(self, depth):
+        return self.filter(depth__lte=depth)
+
+    def descendants_of(self, comments):
+        """Strict descendants of every comment in `comments` (one `path` range per comment)."""
+        ranges = Q(pk__in=[])
+        for comment in comments:
+            ranges |= Q(post_id=comment.post_id, path__gt=comment.path, path__lt=comment.path + ":")
+        return self.filter(ranges)
+
+
 class Comment(models.Model):
     post = models.ForeignKey(
         Post,
@@ -50,19 +149,90 @@ class Comment(models.Model):
     )
     content = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
+    search_vector = models.GeneratedField(
+        expression=SearchVector("content", config=SEARCH_CONFIG),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
+
+    # 👇 materialized path of the thread, filled on insert (see `save`)
+    root = models.ForeignKey(
+        "self",
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        editable=False,
+        related_name="thread_comments",
+    )
+    depth = models.PositiveSmallIntegerField(default=0, editable=False)
+    # Zero-padded ids from the root down to this comment, e.g. "00000000070000000012".
+    # "C" collation keeps byte order so prefix/range lookups use the index.
+    path = models.CharField(max_length=COMMENT_PATH_MAX_LENGTH, default="", editable=False, db_collation="C")
+
+    objects = SearchVectorDeferringManager.from_queryset(CommentQuerySet)()
 
     # 👇 allow Comment to have reactions
     reactions = GenericRelation(
         "Reaction",
         related_query_name="comment",
     )
+    reaction_counters = GenericRelation(
+        "ReactionCounter",
+        related_query_name="comment",
+    )
 
     class Meta:
         ordering = ["created_at"]
+        indexes = [
+            # whole thread / subtree in display order
+            models.Index(fields=["post", "path"], name="blog_comment_thread_idx"),
+            # everything up to depth N
+            models.Index(fields=["post", "depth"], name="blog_comment_depth_idx"),
+            # first replies of each comment (reply pages, pruned reply trees)
+            models.Index(fields=["parent", "path"], name="blog_comment_replies_idx"),
+            GinIndex(fields=["search_vector"], name="blog_comment_search_idx"),
+            trigram_index("content", "blog_comment_content_trgm_idx"),
+        ]
 
     def __str__(self):
         return f"Comment by {self.author} on {self.post}"
 
+    @staticmethod
+    def path_segment(comment_id):
+        return str(comment_id).zfill(COMMENT_PATH_SEGMENT_WIDTH)
+
+    def save(self, *args, **kwargs):
+        creating = self._state.adding
+        super().save(*args, **kwargs)
+
+        if creating:
+            # The path ends with our own id, so it can only be built after the INSERT
+            if self.parent_id:
+                parent = self.parent
+                self.root_id = parent.root_id or parent.id
+                self.depth = parent.depth + 1
+                self.path = parent.path + self.path_segment(self.id)
+            else:
+                self.root_id = self.id
+                self.depth = 0
+                self.path = self.path_segment(self.id)
+
+            Comment.objects.filter(pk=self.pk).update(root_id=self.root_id, depth=self.depth, path=self.path)
+
+
+def reaction_target_prefetch(lookup="content_object"):
+    """
+    Resolve a reaction `GenericForeignKey` with one query per target type
+    (posts, comments) instead of one per row, with what the targets' `__str__` needs.
+    """
+    return GenericPrefetch(lookup, [Post.objects.all(), Comment.objects.select_related("author", "post")])
+
+
+class ReactionQuerySet(models.QuerySet):
+    def with_targets(self):
+        """Rows ready for `__str__`: author joined, targets batch-loaded."""
+        return self.select_related("author").prefetch_related(reaction_target_prefetch())
+
 
 class Reaction(models.Model):
     author = models.ForeignKey(
@@ -84,10 +254,13 @@ class Reaction(models.Model):
     )
     created_at = models.DateTimeField(auto_now_add=True)
 
+    objects = ReactionQuerySet.as_manager()
+
     class Meta:
         # Prevent duplicate reaction of same type by same user on same object
         indexes = [
-            models.Index(fields=["content_type", "object_id"]),
+            # reactions of one object, newest first (cursor pagination)
+            models.Index(fields=["content_type", "object_id", "-id"], name="blog_reaction_object_idx"),
         ]
         constraints = [
             models.UniqueConstraint(
@@ -98,3 +271,28 @@ class Reaction(models.Model):
 
     def __str__(self):
         return f"{self.type} by {self.author} on {self.content_object}"
+
+
+class ReactionCounter(models.Model):
+    """
+    Denormalized number of reactions of one type on one object.
+    Kept in sync with `Reaction` inside the same transaction as every reaction write.
+    """
+
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
+    object_id = models.PositiveIntegerField()
+    content_object = GenericForeignKey("content_type", "object_id")
+
+    type = models.CharField(max_length=20, choices=ReactionType.choices)
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["content_type", "object_id", "type"],
+                name="unique_reaction_counter_per_object_type",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.count} {self.type} on {self.content_type_id}:{self.object_id}"
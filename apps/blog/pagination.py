@@ -0,0 +1,136 @@
+from django.urls import reverse
+from rest_framework.pagination import Cursor, CursorPagination, PageNumberPagination, _reverse_ordering
+
+
+class PostPagination(PageNumberPagination):
+    """
+    Classic `?page=N` pages with a total `count`.
+    Kept for admin-style UIs; costs a COUNT(*) and an OFFSET scan per page.
+    """
+
+    page_size = 10
+
+
+class PostCursorPagination(CursorPagination):
+    """
+    Keyset pagination for the feed, newest first, on (created_at, id)
+    (backed by `blog_post_feed_idx`). No COUNT(*), no OFFSET scan, and pages
+    stay stable while new posts arrive.
+    """
+
+    page_size = 10
+    ordering = ("-created_at", "-id")
+
+
+class HotPostCursorPagination(PostCursorPagination):
+    """
+    The feed ordered by `?ordering=hot`: keyset pages on the post's hot rank
+    (backed by `blog_posthotscore_rank_idx`). Ranks only move with new activity,
+    not with time, so cursors behave like the newest-first feed's.
+    """
+
+    ordering = ("-hot_rank", "-id")
+
+
+class CommentCursorPagination(CursorPagination):
+    """
+    Keyset pages of comments at one level of a thread (top-level comments of a
+    post, or direct replies of a comment), in display order. `path` is unique
+    and indexed together with `post`, so each page is one range scan.
+
+    Inside a page, every comment embeds only its first `replies_page_size`
+    replies per level; `replies_next` links to the rest.
+    """
+
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    ordering = ("path",)
+    replies_page_size = 5
+
+    def get_replies_next_link(self, request, comment, last_reply):
+        """
+        Continuation link to the replies of `comment` that come after `last_reply`.
+        """
+        self.base_url = request.build_absolute_uri(reverse("comment-replies", kwargs={"pk": comment.id}))
+        return self.encode_cursor(Cursor(offset=0, reverse=False, position=last_reply.path))
+
+
+class SearchCursorPagination(CursorPagination):
+    """
+    Keyset pages of search results, best match first. Ties on `rank` keep a
+    stable order through `id` (and the cursor offset).
+    """
+
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    ordering = ("-rank", "-id")
+
+
+class ReactionCursorPagination(CursorPagination):
+    """
+    Keyset pages of the reactions on one object, newest first
+    (backed by `blog_reaction_object_idx`).
+    """
+
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 200
+    ordering = ("-id",)
+
+
+async def apaginate_queryset(paginator, queryset, request, view=None):
+    """
+    `paginator.paginate_queryset()` of a `CursorPagination` with the page read through
+    the async ORM (`aiterator`, prefetches included). The paginator is left in the same
+    state, so `get_paginated_response()` and the links work as usual.
+    Mirrors DRF's implementation, whose only blocking step is `list(queryset[...])`.
+    """
+    paginator.request = request
+    paginator.page_size = paginator.get_page_size(request)
+    paginator.base_url = request.build_absolute_uri()
+    paginator.ordering = paginator.get_ordering(request, queryset, view)
+
+    paginator.cursor = paginator.decode_cursor(request)
+    if paginator.cursor is None:
+        offset, reverse, current_position = 0, False, None
+    else:
+        offset, reverse, current_position = paginator.cursor
+
+    ordering = _reverse_ordering(paginator.ordering) if reverse else paginator.ordering
+    queryset = queryset.order_by(*ordering)
+
+    if current_position is not None:
+        order = paginator.ordering[0]
+        order_attr = order.lstrip("-")
+        # (cursor reversed) XOR (queryset reversed)
+        lookup = "lt" if paginator.cursor.reverse != order.startswith("-") else "gt"
+        queryset = queryset.filter(**{f"{order_attr}__{lookup}": current_position})
+
+    # One extra row tells whether a page follows
+    results = [obj async for obj in queryset[offset : offset + paginator.page_size + 1].aiterator()]
+    paginator.page = results[: paginator.page_size]
+
+    has_following_position = len(results) > len(paginator.page)
+    following_position = (
+        paginator._get_position_from_instance(results[-1], paginator.ordering) if has_following_position else None
+    )
+
+    if reverse:
+        paginator.page.reverse()
+        paginator.has_next = current_position is not None or offset > 0
+        paginator.has_previous = has_following_position
+        if paginator.has_next:
+            paginator.next_position = current_position
+        if paginator.has_previous:
+            paginator.previous_position = following_position
+    else:
+        paginator.has_next = has_following_position
+        paginator.has_previous = current_position is not None or offset > 0
+        if paginator.has_next:
+            paginator.next_position = following_position
+        if paginator.has_previous:
+            paginator.previous_position = current_position
+
+    return paginator.page
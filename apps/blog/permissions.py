@@ -12,7 +12,5 @@ class IsAuthorOrReadOnly(permissions.BasePermission):
         if request.method in permissions.SAFE_METHODS:
             return True
 
-        # Only the author can update/delete
-        print("obj", obj.author)
-        print("request", request.user)
-        return obj.author == request.user
+        # Only the author can update/delete (compared by id: no query for the author)
+        return obj.author_id == request.user.pk
@@ -0,0 +1,115 @@
+import threading
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+# `BLOG_REACTION_BUFFER_URL` selecting `LocalReactionBuffer` (tests, single-process development)
+LOCAL_BUFFER_URL = "local://"
+
+PENDING_KEY = "blog:reaction-buffer:pending"
+FLUSHING_KEY = "blog:reaction-buffer:flushing"
+
+
+def _field(author_id, content_type_id, object_id):
+    return f"{author_id}:{content_type_id}:{object_id}"
+
+
+def _parse(entries):
+    # {"author:ct:object": type} -> {(author_id, content_type_id, object_id): type}
+    return {tuple(int(part) for part in field.split(":")): reaction_type for field, reaction_type in entries.items()}
+
+
+class RedisReactionBuffer:
+    """
+    Pending reactions in a Redis hash, one field per (author, object):
+    a later write for the same pair overwrites the earlier one.
+
+    A flush renames the hash aside and deletes it only once the rows are in
+    Postgres, so reads look at both hashes and never miss a reaction in flight.
+    A flush that died half-way is picked up again by the next one.
+    """
+
+    def __init__(self, url):
+        import redis
+
+        self.client = redis.Redis.from_url(url, decode_responses=True)
+
+    def add(self, author_id, content_type_id, object_id, reaction_type):
+        self.client.hset(PENDING_KEY, _field(author_id, content_type_id, object_id), reaction_type)
+
+    def get(self, author_id, content_type_id, object_id):
+        field = _field(author_id, content_type_id, object_id)
+        pending, flushing = self.client.pipeline().hget(PENDING_KEY, field).hget(FLUSHING_KEY, field).execute()
+        return pending or flushing
+
+    def discard(self, author_id, content_type_id, object_id):
+        field = _field(author_id, content_type_id, object_id)
+        self.client.pipeline().hdel(PENDING_KEY, field).hdel(FLUSHING_KEY, field).execute()
+
+    def start_flush(self):
+        if not self.client.exists(FLUSHING_KEY):
+            # RENAMENX: a concurrent flush that already moved a batch keeps it
+            if not self.client.exists(PENDING_KEY) or not self.client.renamenx(PENDING_KEY, FLUSHING_KEY):
+                return {}
+        return _parse(self.client.hgetall(FLUSHING_KEY))
+
+    def finish_flush(self):
+        self.client.delete(FLUSHING_KEY)
+
+
+class LocalReactionBuffer:
+    """
+    In-process stand-in for `RedisReactionBuffer` (tests, single-process development).
+    Only selected explicitly: a Celery worker never sees the web process's buffer.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.pending = {}
+        self.flushing = {}
+
+    def add(self, author_id, content_type_id, object_id, reaction_type):
+        with self.lock:
+            self.pending[_field(author_id, content_type_id, object_id)] = reaction_type
+
+    def get(self, author_id, content_type_id, object_id):
+        field = _field(author_id, content_type_id, object_id)
+        with self.lock:
+            return self.pending.get(field) or self.flushing.get(field)
+
+    def discard(self, author_id, content_type_id, object_id):
+        field = _field(author_id, content_type_id, object_id)
+        with self.lock:
+            self.pending.pop(field, None)
+            self.flushing.pop(field, None)
+
+    def start_flush(self):
+        with self.lock:
+            if not self.flushing:
+                self.flushing, self.pending = self.pending, {}
+            return _parse(self.flushing)
+
+    def finish_flush(self):
+        with self.lock:
+            self.flushing = {}
+
+
+_buffer = None
+
+
+def get_reaction_buffer():
+    """The process-wide buffer: Redis at `BLOG_REACTION_BUFFER_URL`, or in-process for `local://`."""
+    global _buffer
+    if _buffer is None:
+        url = settings.BLOG_REACTION_BUFFER_URL
+        if not url:
+            raise ImproperlyConfigured(
+                "BLOG_REACTION_WRITE_BEHIND needs BLOG_REACTION_BUFFER_URL (a Redis URL shared with the "
+                f"Celery workers, or {LOCAL_BUFFER_URL!r} for a single process)."
+            )
+        _buffer = LocalReactionBuffer() if url == LOCAL_BUFFER_URL else RedisReactionBuffer(url)
+    return _buffer
+
+
+def write_behind_enabled():
+    return settings.BLOG_REACTION_WRITE_BEHIND
@@ -0,0 +1,37 @@
+import re
+
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db.models import F, FloatField
+from django.db.models.functions import Cast
+
+from .models import SEARCH_CONFIG
+
+# Longer queries are cut: every term adds a GIN index probe
+SEARCH_MAX_TERMS = 8
+
+
+def search_terms(text):
+    """Plain words of a user query; tsquery operators and punctuation are dropped."""
+    return re.findall(r"[^\W_]+", (text or "").lower())[:SEARCH_MAX_TERMS]
+
+
+def search_query(text):
+    """
+    "djang orm" -> to_tsquery('english', 'djang:* & orm:*'): every word must
+    match, each as a prefix, so results show up while the user is still typing.
+    None when the text has no word.
+    """
+    terms = search_terms(text)
+    if not terms:
+        return None
+    return SearchQuery(" & ".join(f"{term}:*" for term in terms), search_type="raw", config=SEARCH_CONFIG)
+
+
+def search(queryset, query):
+    """
+    Rows of `queryset` (posts or comments) whose `search_vector` matches `query`
+    (a GIN index lookup), annotated with their `rank`.
+    """
+    # ts_rank() is a `real`: as double precision, the value in a page cursor compares exactly
+    rank = Cast(SearchRank(F("search_vector"), query), output_field=FloatField())
+    return queryset.filter(search_vector=query).annotate(rank=rank)
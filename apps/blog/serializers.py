@@ -1,11 +1,33 @@
 from rest_framework import serializers
 
+from apps.core.enums import ReactionType
+from apps.core.serializers import SparseFieldsMixin
 from apps.users.serializers import UserSerializer
 
-from .models import Comment, Post, Reaction
+from .models import COMMENT_MAX_NESTING, Comment, Post, Reaction
+from .services import build_comment_tree, load_comment_subtree
 
 
-class ReactionSerializer(serializers.ModelSerializer):
+class SideloadedAuthorMixin(serializers.Serializer):
+    """
+    With `sideload_users` in the context, renders `author` as a plain `author_id`;
+    the view adds each distinct user once under a top-level `users` map.
+    Listed before `SparseFieldsMixin`, so `?fields=author` still selects it.
+    """
+
+    def get_fields(self):
+        fields = super().get_fields()
+        if not self.context.get("sideload_users") or "author" not in fields:
+            return fields
+        return {
+            ("author_id" if name == "author" else name): (
+                serializers.IntegerField(read_only=True) if name == "author" else field
+            )
+            for name, field in fields.items()
+        }
+
+
+class ReactionSerializer(SideloadedAuthorMixin, SparseFieldsMixin, serializers.ModelSerializer):
     author = UserSerializer(read_only=True)
 
     class Meta:
@@ -13,6 +35,38 @@ class ReactionSerializer(serializers.ModelSerializer):
         fields = ["id", "type", "created_at", "author"]
 
 
+class BulkReactionItemSerializer(serializers.Serializer):
+    """One item of `POST /api/blog/reactions/bulk/`."""
+
+    TARGET_TYPES = ["post", "comment"]
+
+    target_type = serializers.ChoiceField(choices=TARGET_TYPES)
+    target_id = serializers.IntegerField(min_value=1)
+    type = serializers.ChoiceField(choices=ReactionType.choices)
+
+
+class ReactionCountsMixin(serializers.Serializer):
+    """
+    Adds `reaction_counts` ({type: count} for every ReactionType) read from the
+    denormalized `reaction_counters`, and drops the full `reactions` list when
+    the context has `include_reactions=False`.
+    """
+
+    reaction_counts = serializers.SerializerMethodField()
+
+    def get_fields(self):
+        fields = super().get_fields()
+        if not self.context.get("include_reactions", True):
+            fields.pop("reactions", None)
+        return fields
+
+    def get_reaction_counts(self, obj):
+        counts = dict.fromkeys(ReactionType.values, 0)
+        for counter in obj.reaction_counters.all():
+            counts[counter.type] = counter.count
+        return counts
+
+
 class CommentReplySerializer(serializers.ModelSerializer):
     """
     Used for replies only (1 level deep).
@@ -35,10 +89,11 @@ class CommentReplySerializer(serializers.ModelSerializer):
         ]
 
 
-class CommentSerializer(serializers.ModelSerializer):
+class CommentSerializer(SideloadedAuthorMixin, SparseFieldsMixin, ReactionCountsMixin, serializers.ModelSerializer):
     author = UserSerializer(read_only=True)
     reactions = ReactionSerializer(many=True, read_only=True)
     replies = serializers.SerializerMethodField()
+    replies_next = serializers.SerializerMethodField()
 
     class Meta:
         model = Comment
@@ -47,26 +102,51 @@ class CommentSerializer(serializers.ModelSerializer):
             "content",
             "created_at",
             "author",
+            "reaction_counts",
             "reactions",
             "replies",
+            "replies_next",
             "parent",
             "post",
         ]
 
+    def get_fields(self):
+        fields = super().get_fields()
+        # Continuation links only exist when replies are paged (see `CommentCursorPagination`)
+        if "replies_paginator" not in self.context:
+            fields.pop("replies_next", None)
+        return fields
+
     def validate(self, attrs):
         """
-        Ensure parent comment (if any) belongs to the same post.
+        Ensure parent comment (if any) belongs to the same post, that the reply
+        is not nested deeper than its tree path can hold, and that an existing
+        comment is not moved (its tree path is fixed on insert).
         """
         post = attrs.get("post") or self.context.get("post")
         parent = attrs.get("parent")
 
+        if self.instance is not None:
+            if "parent" in attrs and parent != self.instance.parent:
+                raise serializers.ValidationError({"parent": "A comment cannot be moved to another parent."})
+            if "post" in attrs and attrs["post"] != self.instance.post:
+                raise serializers.ValidationError({"post": "A comment cannot be moved to another post."})
+            return attrs
+
         if parent and parent.post_id != post.id:
             raise serializers.ValidationError({"parent": "Parent comment must belong to the same post."})
+        if parent and parent.depth >= COMMENT_MAX_NESTING:
+            raise serializers.ValidationError(
+                {"parent": f"Replies cannot be nested more than {COMMENT_MAX_NESTING} levels deep."}
+            )
         return attrs
 
     def get_replies(self, obj):
         """
         Recursively return child comments until max_depth is reached.
+
+        Children are read from the in-memory `comment_tree` in the context
+        (see `services.load_comment_tree`), so no query is issued per node.
         """
         depth = self.context.get("depth", 0)
         max_depth = self.context.get("max_depth", 5)
@@ -74,29 +154,55 @@ class CommentSerializer(serializers.ModelSerializer):
         if depth >= max_depth:
             return []
 
-        # Get direct children
-        queryset = (
-            obj.replies.all()
-            .select_related("author")
-            .prefetch_related(
-                "reactions",
-                "replies__author",
-                "replies__reactions",
+        tree = self.context.get("comment_tree")
+        if tree is None:
+            # Serializing a single comment without a preloaded tree:
+            # load its subtree once and share the map with the children.
+            tree = load_comment_subtree(
+                obj,
+                max_depth=max_depth - depth,
+                include_reactions=self.context.get("include_reactions", True),
+                selection=self.field_selection.descendants("replies", max_depth - depth),
+                with_authors=not self.context.get("sideload_users"),
             )
-        )
+
+        replies = tree.get(obj.id, [])
+        paginator = self.context.get("replies_paginator")
+        if paginator is not None:
+            replies = replies[: paginator.replies_page_size]
 
         serializer = CommentSerializer(
-            queryset,
+            replies,
             many=True,
-            context={**self.context, "depth": depth + 1},
+            context={
+                **self.context,
+                "depth": depth + 1,
+                "comment_tree": tree,
+                "field_selection": self.field_selection.child("replies"),
+            },
         )
         return serializer.data
 
+    def get_replies_next(self, obj):
+        """
+        Link to the replies not embedded in `replies`, or None if all are shown.
+        The tree holds one reply more than the page size when more exist.
+        """
+        paginator = self.context["replies_paginator"]
+        if self.context.get("depth", 0) >= self.context.get("max_depth", 5):
+            return None
+
+        replies = self.context["comment_tree"].get(obj.id, [])
+        if len(replies) <= paginator.replies_page_size:
+            return None
+        last_shown = replies[paginator.replies_page_size - 1]
+        return paginator.get_replies_next_link(self.context["request"], obj, last_shown)
 
-class PostSerializer(serializers.ModelSerializer):
+
+class PostSerializer(SideloadedAuthorMixin, SparseFieldsMixin, ReactionCountsMixin, serializers.ModelSerializer):
     author = UserSerializer(read_only=True)
     reactions = ReactionSerializer(many=True, read_only=True)
-    comments = CommentSerializer(many=True, read_only=True)
+    comments = serializers.SerializerMethodField()
 
     class Meta:
         model = Post
@@ -107,6 +213,72 @@ class PostSerializer(serializers.ModelSerializer):
             "created_at",
             "updated_at",
             "author",
+            "reaction_counts",
             "reactions",
             "comments",
         ]
+
+    def get_comments(self, obj):
+        """
+        Top-level comments with nested replies, built from `obj.comments`
+        (prefetched by the viewset) instead of one query per node.
+        """
+        tree = build_comment_tree(obj.comments.all())
+        serializer = CommentSerializer(
+            tree.get(None, []),
+            many=True,
+            context={
+                **self.context,
+                "depth": 0,
+                "comment_tree": tree,
+                "field_selection": self.field_selection.child("comments"),
+            },
+        )
+        return serializer.data
+
+
+class CommentSearchSerializer(SideloadedAuthorMixin, SparseFieldsMixin, serializers.ModelSerializer):
+    """A comment matching `/api/blog/search/?type=comments`, without its thread."""
+
+    author = UserSerializer(read_only=True)
+    rank = serializers.FloatField(read_only=True)
+
+    class Meta:
+        model = Comment
+        fields = ["id", "content", "created_at", "author", "post", "parent", "rank"]
+
+
+class PostListSerializer(SideloadedAuthorMixin, SparseFieldsMixin, ReactionCountsMixin, serializers.ModelSerializer):
+    """
+    Feed representation: no body, no nested comments or reactions.
+    `excerpt` and `comment_count` are annotated by the list queryset;
+    the full `content` is only loaded with `?expand=content`.
+    """
+
+    author = UserSerializer(read_only=True)
+    excerpt = serializers.CharField(read_only=True)
+    comment_count = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = Post
+        fields = [
+            "id",
+            "title",
+            "excerpt",
+            "content",
+            "created_at",
+            "updated_at",
+            "author",
+            "comment_count",
+            "reaction_counts",
+        ]
+        expandable_fields = ["content"]
+
+
+class PostSearchSerializer(PostListSerializer):
+    """A post matching `/api/blog/search/`: the feed representation plus its `rank`."""
+
+    rank = serializers.FloatField(read_only=True)
+
+    class Meta(PostListSerializer.Meta):
+        fields = [*PostListSerializer.Meta.fields, "rank"]
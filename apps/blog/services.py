@@ -0,0 +1,422 @@
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Prefetch, prefetch_related_objects
+from django.db.models.expressions import RawSQL
+from django.db.models.signals import post_save
+
+from apps.core.serializers import FieldSelection
+
+from .cache import bump_post_cache_versions
+from .content_types import content_type_for, target_content_types
+from .hot import record_post_activity
+from .live import publish_reaction_changes
+from .models import Comment, Reaction, ReactionCounter, reaction_target_prefetch
+
+
+def comment_queryset(include_reactions=True, selection=None, with_authors=True):
+    """
+    Comments with everything the serializers render (author, reaction counters and,
+    unless `include_reactions=False`, reactions with their authors) loaded up-front,
+    so serializing a node never hits the DB.
+
+    With a `FieldSelection`, relations nobody asked for are not loaded and
+    unrequested columns are deferred (tree columns are always kept).
+    `with_authors=False` skips the author joins when users are side-loaded.
+    """
+    selection = selection or FieldSelection()
+    queryset = Comment.objects.defer(*selection.deferred("content", "created_at"))
+
+    if with_authors and selection.includes("author"):
+        queryset = queryset.select_related("author")
+    if selection.includes("reaction_counts"):
+        queryset = queryset.prefetch_related("reaction_counters")
+    if include_reactions and selection.includes("reactions"):
+        reactions = Reaction.objects.defer(*selection.child("reactions").deferred("created_at"))
+        if with_authors and selection.child("reactions").includes("author"):
+            reactions = reactions.select_related("author")
+        queryset = queryset.prefetch_related(Prefetch("reactions", queryset=reactions))
+    return queryset
+
+
+def build_comment_tree(comments):
+    """
+    Group already-loaded comments into a {parent_id: [children]} map.
+    Top-level comments live under the `None` key.
+    """
+    tree = defaultdict(list)
+    for comment in comments:
+        tree[comment.parent_id].append(comment)
+    return tree
+
+
+def load_comment_tree(post, max_depth=None, include_reactions=True, selection=None, with_authors=True):
+    """
+    Fetch every comment of a post in a fixed number of queries
+    (comments + authors, reactions + authors) and return the parent -> children map.
+
+    `max_depth` is applied in SQL on `Comment.depth` (top-level comments are depth 0).
+    """
+    comments = comment_queryset(include_reactions, selection, with_authors).filter(post=post)
+    if max_depth is not None:
+        comments = comments.up_to_depth(max_depth)
+    return build_comment_tree(comments.in_thread_order())
+
+
+def load_comment_subtree(comment, max_depth=None, include_reactions=True, selection=None, with_authors=True):
+    """
+    Same as `load_comment_tree`, but only for `comment` and its descendants.
+    `max_depth` is relative to `comment`.
+    """
+    comments = comment_queryset(include_reactions, selection, with_authors).subtree_of(comment)
+    if max_depth is not None:
+        comments = comments.up_to_depth(comment.depth + max_depth)
+    return build_comment_tree(comments.in_thread_order())
+
+
+_KEPT_REPLIES_SQL = """
+WITH RECURSIVE kept (id, depth, rank) AS (
+    SELECT reply.id, reply.depth, reply.rank
+    FROM unnest(%s::bigint[]) AS parent (id)
+    CROSS JOIN LATERAL ({replies}) AS reply
+    WHERE reply.depth <= %s
+  UNION ALL
+    SELECT reply.id, reply.depth, reply.rank
+    FROM kept AS parent
+    CROSS JOIN LATERAL ({replies}) AS reply
+    WHERE parent.rank <= %s AND parent.depth < %s
+)
+SELECT id FROM kept
+"""
+
+# The first replies of one parent, in thread order (top-N scan of `blog_comment_replies_idx`)
+_FIRST_REPLIES_SQL = """
+    SELECT reply.id, reply.depth, ROW_NUMBER() OVER (ORDER BY reply.path) AS rank
+    FROM {table} AS reply
+    WHERE reply.parent_id = parent.id
+    ORDER BY reply.path
+    LIMIT %s
+"""
+
+
+def load_reply_tree(comments, max_depth, per_parent, include_reactions=True, selection=None, with_authors=True):
+    """
+    Replies under already-loaded `comments` (e.g. one page of top-level comments),
+    down to absolute depth `max_depth`, keeping the first `per_parent` + 1 replies
+    of every comment: the extra one only tells the serializer that more replies exist.
+
+    A recursive query walks the thread level by level and only descends into the
+    replies that are shown, so the rows loaded are bounded by the page size, not by
+    the size of the thread. Fixed number of queries.
+    """
+    comments = list(comments)
+    if not comments:
+        return build_comment_tree([])
+    replies = _reply_tree_queryset(comments, max_depth, per_parent, include_reactions, selection, with_authors)
+    return build_comment_tree(replies)
+
+
+async def aload_reply_tree(comments, max_depth, per_parent, include_reactions=True, selection=None, with_authors=True):
+    """`load_reply_tree` through the async ORM."""
+    comments = list(comments)
+    if not comments:
+        return build_comment_tree([])
+    replies = _reply_tree_queryset(comments, max_depth, per_parent, include_reactions, selection, with_authors)
+    return build_comment_tree([reply async for reply in replies.aiterator()])
+
+
+def _reply_tree_queryset(comments, max_depth, per_parent, include_reactions, selection, with_authors):
+    first_replies = _FIRST_REPLIES_SQL.format(table=connection.ops.quote_name(Comment._meta.db_table))
+    kept = RawSQL(
+        _KEPT_REPLIES_SQL.format(replies=first_replies),
+        [[comment.pk for comment in comments], per_parent + 1, max_depth, per_parent + 1, per_parent, max_depth],
+    )
+    replies = comment_queryset(include_reactions, selection, with_authors).filter(pk__in=kept)
+    return replies.in_thread_order()
+
+
+def load_reaction_targets(reactions):
+    """
+    Fill `content_object` of already-loaded reactions with one query per target
+    type (for querysets, use `Reaction.objects.with_targets()`). Returns `reactions`.
+    """
+    prefetch_related_objects(reactions, reaction_target_prefetch())
+    return reactions
+
+
+_APPLY_COUNTER_DELTAS_SQL = """
+WITH delta (content_type_id, object_id, type, delta) AS (VALUES {values})
+INSERT INTO {table} AS counter (content_type_id, object_id, type, count)
+SELECT content_type_id, object_id, type, GREATEST(delta, 0) FROM delta
+ORDER BY content_type_id, object_id, type
+ON CONFLICT (content_type_id, object_id, type) DO UPDATE SET count = GREATEST(
+    counter.count + (
+        SELECT delta.delta FROM delta
+        WHERE delta.content_type_id = EXCLUDED.content_type_id
+        AND delta.object_id = EXCLUDED.object_id
+        AND delta.type = EXCLUDED.type
+    ),
+    0
+)
+"""
+
+
+def _apply_counter_deltas(deltas):
+    # One statement for every counter: rows are created or adjusted (never below zero)
+    # in key order, so two writers always lock counter rows in the same order.
+    values = ", ".join(["(%s::integer, %s::integer, %s::varchar, %s::integer)"] * len(deltas))
+    params = [
+        value
+        for (content_type_id, object_id, reaction_type), delta in deltas
+        for value in (content_type_id, object_id, reaction_type, delta)
+    ]
+    sql = _APPLY_COUNTER_DELTAS_SQL.format(
+        values=values,
+        table=connection.ops.quote_name(ReactionCounter._meta.db_table),
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+
+
+def record_reaction_change(content_type_id, object_id, old_type, new_type):
+    """
+    Keep `ReactionCounter` (and the hot ranking of posts) in sync after a reaction write,
+    and publish it to the post's live event stream.
+    `old_type` is None for a new reaction, `new_type` is None for a deleted one.
+    Call inside the transaction that wrote the reaction.
+    """
+    record_reaction_changes([(content_type_id, object_id, old_type, new_type)])
+
+
+def record_reaction_changes(changes):
+    """
+    `record_reaction_change` for many `(content_type_id, object_id, old_type, new_type)` at once,
+    in one statement per table whatever their number.
+    """
+    changes = list(changes)
+    post_content_type_id = target_content_types()["post"].pk
+    deltas = defaultdict(int)
+    hot_weights = defaultdict(float)  # new reactions on posts feed the hot ranking
+    for content_type_id, object_id, old_type, new_type in changes:
+        if old_type == new_type:
+            continue
+        if old_type:
+            deltas[content_type_id, object_id, old_type] -= 1
+        if new_type:
+            deltas[content_type_id, object_id, new_type] += 1
+            if old_type is None and content_type_id == post_content_type_id:
+                hot_weights[object_id] += settings.BLOG_HOT_REACTION_WEIGHT
+
+    deltas = sorted((key, delta) for key, delta in deltas.items() if delta)
+    if deltas:
+        _apply_counter_deltas(deltas)
+    record_post_activity(hot_weights)
+    publish_reaction_changes(changes)
+
+
+_UPSERT_REACTION_SQL = """
+WITH old AS (
+    SELECT id, type FROM {table}
+    WHERE author_id = %(author_id)s AND content_type_id = %(content_type_id)s AND object_id = %(object_id)s
+    FOR UPDATE
+),
+inserted AS (
+    INSERT INTO {table} (author_id, content_type_id, object_id, type, created_at)
+    SELECT %(author_id)s, %(content_type_id)s, %(object_id)s, %(type)s, NOW()
+    WHERE NOT EXISTS (SELECT 1 FROM old)
+    ON CONFLICT (author_id, content_type_id, object_id) DO NOTHING
+    RETURNING id, created_at, NULL::varchar AS old_type
+),
+updated AS (
+    UPDATE {table} AS reaction SET type = %(type)s
+    FROM old
+    WHERE reaction.id = old.id
+    RETURNING reaction.id, reaction.created_at, old.type AS old_type
+)
+SELECT id, created_at, old_type FROM inserted
+UNION ALL
+SELECT id, created_at, old_type FROM updated
+"""
+
+
+def upsert_reaction(author, target, reaction_type):
+    """
+    Set `author`'s reaction on `target` (a post or a comment) to `reaction_type`
+    in a single INSERT ... ON CONFLICT statement, and keep `ReactionCounter` in sync.
+
+    The previous type comes from a row lock taken by the same statement, so
+    concurrent clicks serialize on the row instead of racing on the unique constraint.
+    Returns `(reaction, created, changed)`; `changed` is False when the type was already set.
+    """
+    content_type = content_type_for(target)
+    params = {
+        "author_id": author.pk,
+        "content_type_id": content_type.pk,
+        "object_id": target.pk,
+        "type": reaction_type,
+    }
+    sql = _UPSERT_REACTION_SQL.format(table=connection.ops.quote_name(Reaction._meta.db_table))
+
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            row = None
+            while row is None:
+                cursor.execute(sql, params)
+                # No row: a concurrent first reaction was committed between our snapshot
+                # and the insert; nothing was written, so the retry sees and locks that row.
+                row = cursor.fetchone()
+        reaction_id, created_at, old_type = row
+        created = old_type is None
+        record_reaction_change(content_type.pk, target.pk, old_type, reaction_type)
+
+    reaction = Reaction(
+        id=reaction_id,
+        author=author,
+        content_type=content_type,
+        object_id=target.pk,
+        type=reaction_type,
+        created_at=created_at,
+    )
+    changed = old_type != reaction_type
+    if changed:
+        # Raw SQL skips Model.save(): let receivers (cache invalidation) see the write
+        post_save.send(
+            sender=Reaction,
+            instance=reaction,
+            created=created,
+            update_fields=None,
+            raw=False,
+            using=connection.alias,
+        )
+    return reaction, created, changed
+
+
+def invalidate_reaction_targets(targets):
+    """
+    Bump the cache version of every post touched by reactions on `targets`
+    (`(content_type_id, object_id)` pairs), each post once, with at most one query.
+    """
+    post_content_type_id = target_content_types()["post"].pk
+    post_ids, comment_ids = set(), set()
+    for content_type_id, object_id in targets:
+        (post_ids if content_type_id == post_content_type_id else comment_ids).add(object_id)
+    if comment_ids:
+        post_ids.update(Comment.objects.filter(pk__in=comment_ids).values_list("post_id", flat=True))
+    bump_post_cache_versions(post_ids)
+
+
+def bulk_upsert_reactions(author, reactions):
+    """
+    Set many of `author`'s reactions at once: `reactions` maps
+    `(content_type_id, object_id)` to a reaction type.
+    Returns `{(content_type_id, object_id): (reaction, old_type)}`; `old_type` is None for new reactions.
+    """
+    written = write_reactions(
+        {
+            (author.pk, content_type_id, object_id): reaction_type
+            for (content_type_id, object_id), reaction_type in reactions.items()
+        }
+    )
+    return {(ct_id, object_id): result for (_, ct_id, object_id), result in written.items()}
+
+
+_INSERT_REACTIONS_SQL = """
+INSERT INTO {table} (author_id, content_type_id, object_id, type, created_at)
+VALUES {values}
+ON CONFLICT (author_id, content_type_id, object_id) DO NOTHING
+RETURNING id, author_id, content_type_id, object_id, created_at
+"""
+
+
+def _lock_reactions(keys):
+    # May read a few unrequested rows; only the requested keys are kept
+    author_ids = {author_id for author_id, _, _ in keys}
+    content_type_ids = {content_type_id for _, content_type_id, _ in keys}
+    object_ids = {object_id for _, _, object_id in keys}
+    rows = (
+        Reaction.objects.select_for_update()
+        .filter(author_id__in=author_ids, content_type_id__in=content_type_ids, object_id__in=object_ids)
+        .order_by("pk")
+    )
+    return {
+        key: reaction
+        for reaction in rows
+        if (key := (reaction.author_id, reaction.content_type_id, reaction.object_id)) in keys
+    }
+
+
+def _insert_reactions(reactions):
+    # Only the rows nobody else inserted first come back
+    sql = _INSERT_REACTIONS_SQL.format(
+        table=connection.ops.quote_name(Reaction._meta.db_table),
+        values=", ".join(["(%s, %s, %s, %s, NOW())"] * len(reactions)),
+    )
+    params = [value for key, reaction_type in reactions.items() for value in (*key, reaction_type)]
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        rows = cursor.fetchall()
+
+    inserted = {}
+    for reaction_id, author_id, content_type_id, object_id, created_at in rows:
+        key = (author_id, content_type_id, object_id)
+        inserted[key] = Reaction(
+            id=reaction_id,
+            author_id=author_id,
+            content_type_id=content_type_id,
+            object_id=object_id,
+            type=reactions[key],
+            created_at=created_at,
+        )
+    return inserted
+
+
+def write_reactions(reactions):
+    """
+    Upsert reactions of any number of authors: `reactions` maps
+    `(author_id, content_type_id, object_id)` to a reaction type.
+
+    Existing rows are locked and read by one query and updated by one `bulk_update`;
+    missing rows are inserted by one INSERT ... ON CONFLICT DO NOTHING. A row that a
+    concurrent writer inserted in between is not returned by the INSERT; it is then
+    locked and updated like an existing one, so the old type (and the counters, updated
+    by one statement in the same transaction) are always exact, as in `upsert_reaction`.
+    The number of queries does not grow with the number of reactions.
+    Returns `{(author_id, content_type_id, object_id): (reaction, old_type)}`.
+    """
+    if not reactions:
+        return {}
+
+    results = {}
+    with transaction.atomic():
+        remaining = dict(sorted(reactions.items()))
+        while remaining:
+            existing = _lock_reactions(remaining)
+            changed = []
+            for key, reaction in existing.items():
+                old_type, reaction.type = reaction.type, remaining[key]
+                results[key] = (reaction, old_type)
+                if old_type != reaction.type:
+                    changed.append(reaction)
+            if changed:
+                Reaction.objects.bulk_update(changed, ["type"])
+
+            missing = {key: reaction_type for key, reaction_type in remaining.items() if key not in existing}
+            inserted = _insert_reactions(missing) if missing else {}
+            for key, reaction in inserted.items():
+                results[key] = (reaction, None)
+            # Inserted by a concurrent transaction, committed by the time our INSERT returned
+            remaining = {key: reaction_type for key, reaction_type in missing.items() if key not in inserted}
+
+        record_reaction_changes(
+            (content_type_id, object_id, old_type, reaction.type)
+            for (_, content_type_id, object_id), (reaction, old_type) in results.items()
+        )
+
+    # Like `bulk_create`, no post_save per row: the affected posts are invalidated once each
+    invalidate_reaction_targets(
+        (reaction.content_type_id, reaction.object_id)
+        for reaction, old_type in results.values()
+        if old_type != reaction.type
+    )
+    return results
@@ -0,0 +1,82 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from .cache import bump_blog_cache_version, bump_post_cache_version
+from .content_types import target_content_types
+from .hot import record_post_activity
+from .live import publish_comment_created
+from .models import Comment, Post, Reaction
+from .services import record_reaction_changes
+
+
+@receiver([post_save, post_delete], sender=Post)
+def invalidate_post_cache_on_post_write(sender, instance, **kwargs):
+    bump_post_cache_version(instance.pk)
+
+
+@receiver([post_save, post_delete], sender=Comment)
+def invalidate_post_cache_on_comment_write(sender, instance, **kwargs):
+    bump_post_cache_version(instance.post_id)
+
+
+def _cascades_from_post_or_comment(origin):
+    """Whether a deletion started from posts or comments (instances or querysets)."""
+    model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    return model in (Post, Comment)
+
+
+@receiver([post_save, post_delete], sender=Reaction)
+def invalidate_post_cache_on_reaction_write(sender, instance, origin=None, **kwargs):
+    if instance.content_type_id == target_content_types()["post"].pk:
+        bump_post_cache_version(instance.object_id)
+        return
+
+    # Deleted with its post or comment: every reaction of that cascade targets a post
+    # or comment deleted with it, whose own signal bumps the post (no lookup per reaction)
+    if origin is not None and _cascades_from_post_or_comment(origin):
+        return
+
+    # Reaction on a comment: its post
+    post_id = Comment.objects.filter(pk=instance.object_id).values_list("post_id", flat=True).first()
+    if post_id is not None:
+        bump_post_cache_version(post_id)
+
+
+@receiver(post_save, sender=Post)
+def record_hot_activity_on_post_create(sender, instance, created, **kwargs):
+    if created:
+        record_post_activity({instance.pk: settings.BLOG_HOT_POST_WEIGHT})
+
+
+@receiver(post_save, sender=Comment)
+def record_hot_activity_on_comment_create(sender, instance, created, **kwargs):
+    if created:
+        record_post_activity({instance.post_id: settings.BLOG_HOT_COMMENT_WEIGHT})
+
+
+@receiver(post_save, sender=Comment)
+def publish_live_event_on_comment_create(sender, instance, created, **kwargs):
+    if created:
+        publish_comment_created(instance)
+
+
+@receiver(pre_delete, sender=get_user_model())
+def release_reaction_counts_on_user_delete(sender, instance, **kwargs):
+    # The user's reactions go with them (FK cascade), which skips the API write paths
+    record_reaction_changes(
+        (content_type_id, object_id, reaction_type, None)
+        for content_type_id, object_id, reaction_type in instance.reactions.values_list(
+            "content_type_id", "object_id", "type"
+        )
+    )
+
+
+@receiver(post_save, sender=get_user_model())
+def invalidate_blog_cache_on_profile_change(sender, instance, created, update_fields=None, **kwargs):
+    # Authors are nested in posts, comments and reactions; new users and logins change nothing rendered
+    if created or update_fields == frozenset({"last_login"}):
+        return
+    bump_blog_cache_version()
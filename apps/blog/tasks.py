@@ -0,0 +1,61 @@
+from celery import shared_task
+from django.conf import settings
+from django.core.cache import cache
+
+from apps.notifications.services import notify_reactions_by_recipient
+
+from . import hot
+from .content_types import REACTION_TARGET_MODELS, target_content_types
+from .reaction_buffer import get_reaction_buffer
+from .services import write_reactions
+
+FLUSH_LOCK_KEY = "blog:reaction-buffer:flush-lock"
+
+
+@shared_task
+def flush_reaction_buffer():
+    """
+    Write buffered reactions (write-behind mode) to Postgres in batches,
+    then notify each content author once.
+    """
+    if not cache.add(FLUSH_LOCK_KEY, True, timeout=60):
+        return "Flush already running."
+
+    try:
+        buffer = get_reaction_buffer()
+        pending = buffer.start_flush()
+        if not pending:
+            return "Nothing to flush."
+
+        # Drop reactions on posts/comments deleted in the meantime; keep each target's author
+        target_authors = {}
+        for kind, model in REACTION_TARGET_MODELS.items():
+            content_type_id = target_content_types()[kind].pk
+            ids = {object_id for _, ct_id, object_id in pending if ct_id == content_type_id}
+            for object_id, author_id in model.objects.filter(pk__in=ids).values_list("pk", "author_id"):
+                target_authors[content_type_id, object_id] = (kind, author_id)
+        pending = {key: reaction_type for key, reaction_type in pending.items() if key[1:] in target_authors}
+
+        notifications = {}  # recipient id -> [[type, kind, object_id], ...]
+        items = sorted(pending.items())
+        batch_size = settings.BLOG_REACTION_FLUSH_BATCH_SIZE
+        for start in range(0, len(items), batch_size):
+            written = write_reactions(dict(items[start : start + batch_size]))
+            for (_, content_type_id, object_id), (reaction, old_type) in written.items():
+                if old_type != reaction.type:
+                    kind, recipient_id = target_authors[content_type_id, object_id]
+                    notifications.setdefault(recipient_id, []).append([reaction.type, kind, object_id])
+
+        buffer.finish_flush()
+    finally:
+        cache.delete(FLUSH_LOCK_KEY)
+
+    notify_reactions_by_recipient(notifications)
+
+    return f"Flushed {len(pending)} reactions."
+
+
+@shared_task
+def decay_hot_scores():
+    """Refresh the decayed hot scores of posts (ranks, and so the hot feed, are unaffected)."""
+    return f"Decayed {hot.decay_hot_scores()} hot scores."
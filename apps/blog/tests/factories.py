@@ -3,6 +3,7 @@ from django.contrib.auth import get_user_model
 from django.contrib.contenttypes.models import ContentType
 
 from apps.blog.models import Comment, Post, Reaction
+from apps.blog.services import record_reaction_change
 
 User = get_user_model()
 
@@ -52,6 +53,13 @@ class ReactionFactory(factory.django.DjangoModelFactory):
         # default: new Post if not overridden
         return PostFactory().id
 
+    @classmethod
+    def _create(cls, model_class, *args, **kwargs):
+        # keep the denormalized counters in sync, like the API write paths do
+        reaction = super()._create(model_class, *args, **kwargs)
+        record_reaction_change(reaction.content_type_id, reaction.object_id, None, reaction.type)
+        return reaction
+
     @classmethod
     def for_post(cls, post, **kwargs):
         """
@@ -0,0 +1,87 @@
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.test import AsyncClient, TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from .factories import CommentFactory, PostFactory, ReactionFactory, UserFactory
+
+
+class AsyncReadViewTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserFactory()
+        cls.posts = [PostFactory(author=cls.user) for _ in range(3)]
+        cls.post = cls.posts[0]
+        root = CommentFactory(post=cls.post, author=cls.user)
+        CommentFactory(post=cls.post, author=cls.user, parent=root)
+        CommentFactory(post=cls.post, author=cls.user)
+        ReactionFactory.for_post(post=cls.post, author=cls.user)
+
+    def setUp(self):
+        cache.clear()
+        self.token = str(AccessToken.for_user(self.user))
+        # Scope headers: AsyncClient(headers=...) prefixes them twice in Django 5.2
+        self.async_client = AsyncClient(AUTHORIZATION=f"Bearer {self.token}")
+        self.sync_client = APIClient()
+        self.sync_client.force_authenticate(self.user)
+
+    async def _compare(self, name, params=None, **kwargs):
+        # The async endpoint returns what the DRF one does (links aside: they point at their own path)
+        response = await self.async_client.get(reverse(f"async-{name}", kwargs=kwargs), params or {})
+        self.assertEqual(response.status_code, 200)
+        expected = await sync_to_async(self.sync_client.get)(reverse(name, kwargs=kwargs), params or {})
+        self.assertEqual(_without_links(response.json()), _without_links(expected.json()))
+        return response
+
+    async def test_post_list(self):
+        response = await self._compare("post-list", {"sideload": "users"})
+        self.assertEqual(len(response.json()["results"]), 3)
+
+    async def test_hot_feed_pages(self):
+        response = await self.async_client.get(reverse("async-post-list"), {"ordering": "hot"})
+        self.assertEqual(response.json()["results"][0]["id"], self.post.id)
+
+    async def test_page_number_mode(self):
+        response = await self._compare("post-list", {"page": 1})
+        self.assertEqual(response.json()["count"], 3)
+
+    async def test_post_detail(self):
+        await self._compare("post-detail", pk=self.post.id)
+
+    async def test_post_comments_with_replies(self):
+        response = await self._compare("post-comments", pk=self.post.id)
+        self.assertEqual(len(response.json()["results"][0]["replies"]), 1)
+
+    async def test_post_reactions(self):
+        await self._compare("post-reactions", {"fields": "type,author"}, pk=self.post.id)
+
+    async def test_cached_detail_and_etag(self):
+        url = reverse("async-post-detail", kwargs={"pk": self.post.id})
+        first = await self.async_client.get(url)
+        second = await self.async_client.get(url)
+        self.assertEqual((first["X-Cache"], second["X-Cache"]), ("MISS", "HIT"))
+
+        not_modified = await self.async_client.get(url, headers={"If-None-Match": first["ETag"]})
+        self.assertEqual(not_modified.status_code, 304)
+
+    async def test_missing_post(self):
+        response = await self.async_client.get(reverse("async-post-detail", kwargs={"pk": 0}))
+        self.assertEqual(response.status_code, 404)
+
+    async def test_authentication_required(self):
+        response = await AsyncClient().get(reverse("async-post-list"))
+        self.assertEqual(response.status_code, 401)
+        self.assertIn("Bearer", response["WWW-Authenticate"])
+
+        response = await AsyncClient(AUTHORIZATION="Bearer nope").get(reverse("async-post-list"))
+        self.assertEqual(response.status_code, 401)
+
+    async def test_read_only(self):
+        response = await self.async_client.post(reverse("async-post-list"), {"title": "x"})
+        self.assertEqual(response.status_code, 405)
+
+
+def _without_links(body):
+    return {key: value for key, value in body.items() if key not in ("next", "previous")}
@@ -0,0 +1,177 @@
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+
+from apps.blog.cache import cache_stats
+
+from .factories import CommentFactory, PostFactory, ReactionFactory, UserFactory
+
+
+class PostCacheTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = UserFactory()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.post = PostFactory(author=self.user)
+        self.comment = CommentFactory(post=self.post, author=self.user)
+
+    def _detail_url(self):
+        return reverse("post-detail", kwargs={"pk": self.post.id})
+
+    def _comments_url(self):
+        return reverse("post-comments", kwargs={"pk": self.post.id})
+
+    def test_repeated_reads_are_served_from_cache(self):
+        for url in (self._detail_url(), self._comments_url()):
+            first = self.client.get(url)
+            with self.assertNumQueries(0):
+                second = self.client.get(url)
+
+            self.assertEqual(first["X-Cache"], "MISS")
+            self.assertEqual(second["X-Cache"], "HIT")
+            self.assertEqual(first.data, second.data)
+
+        self.assertEqual(cache_stats()["hits"], 2)
+        self.assertEqual(cache_stats()["misses"], 2)
+
+    def test_stats_command(self):
+        url = self._detail_url()
+        self.client.get(url)
+        self.client.get(url)
+
+        out = StringIO()
+        call_command("blog_cache_stats", "--reset", stdout=out)
+
+        self.assertIn("hits: 1  misses: 1  hit ratio: 50.0%", out.getvalue())
+        self.assertEqual(cache_stats()["hits"], 0)
+
+    def test_query_params_are_part_of_the_key(self):
+        self.client.get(self._detail_url())
+
+        resp = self.client.get(self._detail_url(), {"fields": "id"})
+
+        self.assertEqual(resp["X-Cache"], "MISS")
+        self.assertEqual(set(resp.data), {"id"})
+
+    def test_new_comment_invalidates_post_reads(self):
+        self.client.get(self._detail_url())
+        self.client.get(self._comments_url())
+
+        self.client.post(self._comments_url(), {"content": "fresh"}, format="json")
+
+        detail = self.client.get(self._detail_url())
+        comments = self.client.get(self._comments_url())
+        self.assertEqual(detail["X-Cache"], "MISS")
+        self.assertEqual(comments["X-Cache"], "MISS")
+        self.assertIn("fresh", [c["content"] for c in comments.data["results"]])
+
+    def test_comment_edit_invalidates_post_reads(self):
+        self.client.get(self._comments_url())
+
+        self.client.patch(
+            reverse("comment-detail", kwargs={"pk": self.comment.id}),
+            {"content": "edited"},
+            format="json",
+        )
+
+        resp = self.client.get(self._comments_url())
+        self.assertEqual(resp["X-Cache"], "MISS")
+        self.assertEqual(resp.data["results"][0]["content"], "edited")
+
+    def test_reaction_on_comment_invalidates_post_reads(self):
+        reaction = ReactionFactory.for_comment(comment=self.comment, author=self.user)
+        self.client.get(self._comments_url())
+
+        self.client.delete(reverse("reaction-detail", kwargs={"pk": reaction.id}))
+
+        resp = self.client.get(self._comments_url())
+        self.assertEqual(resp["X-Cache"], "MISS")
+        self.assertEqual(resp.data["results"][0]["reactions"], [])
+
+    def _delete_comment_with_reactions(self, count):
+        comment = CommentFactory(post=self.post, author=self.user)
+        for _ in range(count):
+            ReactionFactory.for_comment(comment=comment, author=UserFactory())
+        with CaptureQueriesContext(connection) as queries:
+            comment.delete()
+        return len(queries)
+
+    def test_comment_delete_queries_do_not_grow_with_its_reactions(self):
+        self.client.get(self._comments_url())
+
+        self.assertEqual(self._delete_comment_with_reactions(2), self._delete_comment_with_reactions(6))
+        self.assertEqual(self.client.get(self._comments_url())["X-Cache"], "MISS")
+
+    def test_post_update_invalidates_detail(self):
+        self.client.get(self._detail_url())
+
+        self.client.patch(self._detail_url(), {"title": "Renamed"}, format="json")
+
+        resp = self.client.get(self._detail_url())
+        self.assertEqual(resp["X-Cache"], "MISS")
+        self.assertEqual(resp.data["title"], "Renamed")
+
+    def test_missing_post_is_not_cached(self):
+        url = reverse("post-detail", kwargs={"pk": self.post.id + 1000})
+
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(cache_stats()["hits"], 0)
+
+
+class ConditionalGetTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = UserFactory()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.post = PostFactory(author=self.user)
+
+    def _detail_url(self):
+        return reverse("post-detail", kwargs={"pk": self.post.id})
+
+    def _comments_url(self):
+        return reverse("post-comments", kwargs={"pk": self.post.id})
+
+    def test_matching_etag_is_answered_with_304_without_queries(self):
+        for url in (self._detail_url(), self._comments_url(), reverse("post-list")):
+            etag = self.client.get(url)["ETag"]
+
+            with self.assertNumQueries(0):
+                resp = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+            self.assertEqual(resp.status_code, status.HTTP_304_NOT_MODIFIED)
+            self.assertEqual(resp.content, b"")
+
+    def test_etag_differs_per_query(self):
+        full = self.client.get(self._detail_url())["ETag"]
+        sparse = self.client.get(self._detail_url(), {"fields": "id"})["ETag"]
+
+        self.assertNotEqual(full, sparse)
+
+    def test_etag_changes_after_a_write(self):
+        etags = [self.client.get(url)["ETag"] for url in (self._detail_url(), reverse("post-list"))]
+
+        ReactionFactory.for_comment(comment=CommentFactory(post=self.post, author=self.user), author=self.user)
+
+        for url, etag in zip((self._detail_url(), reverse("post-list")), etags):
+            resp = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(resp.status_code, status.HTTP_200_OK)
+            self.assertNotEqual(resp["ETag"], etag)
+
+    def test_author_profile_change_invalidates(self):
+        etag = self.client.get(self._detail_url())["ETag"]
+
+        self.user.first_name = "Renamed"
+        self.user.save()
+
+        resp = self.client.get(self._detail_url(), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp.data["author"]["first_name"], "Renamed")
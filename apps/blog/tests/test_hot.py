@@ -0,0 +1,115 @@
+import math
+from datetime import timedelta
+from unittest import mock
+
+from django.db.models import F
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient, APITestCase
+
+from apps.blog.hot import decay_hot_scores
+from apps.blog.models import PostHotScore
+from apps.blog.pagination import HotPostCursorPagination
+from apps.blog.services import upsert_reaction
+from apps.core.enums import ReactionType
+
+from .factories import CommentFactory, PostFactory, UserFactory
+
+
+@override_settings(BLOG_HOT_POST_WEIGHT=1, BLOG_HOT_COMMENT_WEIGHT=3, BLOG_HOT_REACTION_WEIGHT=2)
+class HotScoreTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserFactory()
+
+    def _score(self, post):
+        return PostHotScore.objects.get(post=post)
+
+    def test_activity_adds_weight(self):
+        post = PostFactory(author=self.user)
+        self.assertAlmostEqual(self._score(post).score, 1, places=3)
+
+        CommentFactory(post=post, author=self.user)
+        upsert_reaction(self.user, post, ReactionType.LIKE)
+
+        self.assertAlmostEqual(self._score(post).score, 6, places=3)
+
+    def test_only_new_reactions_on_the_post_count(self):
+        post = PostFactory(author=self.user)
+        comment = CommentFactory(post=post, author=self.user)
+        upsert_reaction(self.user, post, ReactionType.LIKE)
+        before = self._score(post).score
+
+        upsert_reaction(self.user, post, ReactionType.LOVE)  # changed, not new
+        upsert_reaction(self.user, comment, ReactionType.LIKE)  # on a comment
+
+        self.assertAlmostEqual(self._score(post).score, before, places=3)
+
+    def test_decay_halves_score_per_half_life_and_keeps_rank(self):
+        post = PostFactory(author=self.user)
+        with self.settings(BLOG_HOT_HALF_LIFE=3600):
+            PostHotScore.objects.filter(post=post).update(
+                score=4, decayed_at=F("decayed_at") - timedelta(hours=1), rank=7.5
+            )
+
+            self.assertEqual(decay_hot_scores(), 1)
+
+        hot = self._score(post)
+        self.assertAlmostEqual(hot.score, 2, places=3)
+        self.assertEqual(hot.rank, 7.5)
+
+    def test_negligible_scores_drop_to_zero(self):
+        post = PostFactory(author=self.user)
+        PostHotScore.objects.filter(post=post).update(decayed_at=F("decayed_at") - timedelta(days=3650))
+
+        decay_hot_scores()
+
+        self.assertEqual(self._score(post).score, 0)
+        # zero scores are not rewritten again
+        self.assertEqual(decay_hot_scores(), 0)
+
+    def test_rank_matches_decayed_score(self):
+        # ln(score) + t / tau: older activity is worth exactly its decayed weight
+        old, new = PostFactory(author=self.user), PostFactory(author=self.user)
+        tau = 12 * 3600 / math.log(2)
+        PostHotScore.objects.filter(post=old).update(rank=F("rank") - 3600 * 12 / tau)  # one half-life ago
+
+        CommentFactory(post=old, author=self.user)
+        new_rank, old_rank = self._score(new).rank, self._score(old).rank
+
+        # old: 1/2 + 3 against new: 1
+        self.assertAlmostEqual(old_rank - new_rank, math.log(3.5), places=6)
+
+
+class HotFeedTests(APITestCase):
+    def setUp(self):
+        self.user = UserFactory()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_hot_ordering_ranks_by_activity(self):
+        quiet, busy, newest = (PostFactory(author=self.user) for _ in range(3))
+        CommentFactory(post=busy, author=self.user)
+        self.client.post(reverse("post-reactions", kwargs={"pk": quiet.id}), {"type": "like"})
+
+        resp = self.client.get(reverse("post-list"), {"ordering": "hot"})
+
+        self.assertEqual([post["id"] for post in resp.data["results"]], [busy.id, quiet.id, newest.id])
+        # the default feed is unchanged
+        resp = self.client.get(reverse("post-list"))
+        self.assertEqual([post["id"] for post in resp.data["results"]], [newest.id, busy.id, quiet.id])
+
+    def test_hot_cursor_pages_are_stable_across_decay(self):
+        posts = [PostFactory(author=self.user) for _ in range(3)]
+        for post in posts[:2]:
+            CommentFactory(post=post, author=self.user)
+
+        with mock.patch.object(HotPostCursorPagination, "page_size", 2):
+            first = self.client.get(reverse("post-list"), {"ordering": "hot"})
+            PostHotScore.objects.update(decayed_at=F("decayed_at") - timedelta(hours=6))
+            decay_hot_scores()
+            second = self.client.get(first.data["next"])
+
+        ids = [post["id"] for post in first.data["results"] + second.data["results"]]
+        self.assertEqual(ids, [posts[1].id, posts[0].id, posts[2].id])
+        self.assertIsNone(second.data["next"])
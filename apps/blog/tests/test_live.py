@@ -0,0 +1,98 @@
+from unittest import mock
+
+from asgiref.sync import sync_to_async
+from django.test import AsyncClient, TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.blog.live import COMMENT_CREATED, LOCAL_EVENTS_URL, REACTION_CHANGED, get_event_bus
+
+from .factories import CommentFactory, PostFactory, UserFactory
+
+
+@override_settings(BLOG_LIVE_EVENTS_URL=LOCAL_EVENTS_URL, BLOG_LIVE_KEEPALIVE=0.05)
+class LiveEventTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserFactory()
+        cls.post = PostFactory(author=cls.user)
+        cls.comment = CommentFactory(post=cls.post, author=cls.user)
+
+    def setUp(self):
+        patcher = mock.patch("apps.blog.live._bus", None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.bus = get_event_bus()
+
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.async_client = AsyncClient(AUTHORIZATION=f"Bearer {AccessToken.for_user(self.user)}")
+
+    def _events(self, post=None):
+        return [(event_type, data) for _, event_type, data in self.bus.streams[(post or self.post).id]]
+
+    def test_comment_and_reaction_writes_publish_after_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            reply = self.client.post(
+                reverse("post-comments", kwargs={"pk": self.post.id}), {"content": "Hi", "parent": self.comment.id}
+            ).data
+            self.client.post(reverse("comment-reactions", kwargs={"pk": self.comment.id}), {"type": "like"})
+            self.client.post(reverse("post-reactions", kwargs={"pk": self.post.id}), {"type": "wow"})
+            self.client.post(reverse("post-reactions", kwargs={"pk": self.post.id}), {"type": "wow"})  # no change
+
+        (comment_type, comment), *reactions = self._events()
+        self.assertEqual(comment_type, COMMENT_CREATED)
+        self.assertEqual((comment["id"], comment["parent"], comment["depth"]), (reply["id"], self.comment.id, 1))
+        self.assertEqual(
+            reactions,
+            [
+                (
+                    REACTION_CHANGED,
+                    {"target": "comment", "object_id": self.comment.id, "old_type": None, "new_type": "like"},
+                ),
+                (REACTION_CHANGED, {"target": "post", "object_id": self.post.id, "old_type": None, "new_type": "wow"}),
+            ],
+        )
+
+    def test_rolled_back_writes_publish_nothing(self):
+        with self.captureOnCommitCallbacks(execute=False):
+            CommentFactory(post=self.post, author=self.user)
+        self.assertEqual(self._events(), [])
+
+    async def _stream(self, **headers):
+        response = await self.async_client.get(reverse("async-post-events", kwargs={"pk": self.post.id}), **headers)
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        return response.streaming_content
+
+    async def test_stream_pushes_new_events(self):
+        self.bus.publish(self.post.id, COMMENT_CREATED, {"id": 1})  # before connecting: not replayed
+        stream = await self._stream()
+        self.assertEqual(await anext(stream), b"retry: 3000\n\n")
+        self.assertEqual(await anext(stream), b": keep-alive\n\n")
+
+        await sync_to_async(self.bus.publish)(self.post.id, REACTION_CHANGED, {"object_id": 2})
+        self.bus.publish(self.post.id + 1, COMMENT_CREATED, {"id": 3})  # another post
+
+        self.assertEqual(await anext(stream), b'id: 2-0\nevent: reaction.changed\ndata: {"object_id":2}\n\n')
+        await stream.aclose()
+
+    async def test_stream_resumes_after_last_event_id(self):
+        for i in range(3):
+            self.bus.publish(self.post.id, COMMENT_CREATED, {"id": i})
+
+        stream = await self._stream(headers={"Last-Event-ID": "1-0"})
+        await anext(stream)
+
+        self.assertEqual(await anext(stream), b'id: 2-0\nevent: comment.created\ndata: {"id":1}\n\n')
+        self.assertEqual(await anext(stream), b'id: 3-0\nevent: comment.created\ndata: {"id":2}\n\n')
+        await stream.aclose()
+
+    async def test_stream_errors(self):
+        url = reverse("async-post-events", kwargs={"pk": self.post.id})
+        response = await self.async_client.get(url, headers={"Last-Event-ID": "nope"})
+        self.assertEqual(response.status_code, 400)
+        response = await self.async_client.get(reverse("async-post-events", kwargs={"pk": 0}))
+        self.assertEqual(response.status_code, 404)
+        with self.settings(BLOG_LIVE_EVENTS_URL=None):
+            self.assertEqual((await self.async_client.get(url)).status_code, 503)
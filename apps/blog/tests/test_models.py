@@ -0,0 +1,81 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from apps.blog.models import Comment, Reaction
+from apps.blog.services import load_reaction_targets
+
+from .factories import CommentFactory, PostFactory, ReactionFactory, UserFactory
+
+
+class CommentTreePathTests(TestCase):
+    def setUp(self):
+        self.post = PostFactory()
+        self.root = CommentFactory(post=self.post)
+        self.reply = CommentFactory(post=self.post, parent=self.root)
+        self.nested_reply = CommentFactory(post=self.post, parent=self.reply)
+        self.other_root = CommentFactory(post=self.post)
+
+    def test_tree_fields_are_filled_on_insert(self):
+        self.nested_reply.refresh_from_db()
+
+        self.assertEqual(self.nested_reply.root_id, self.root.id)
+        self.assertEqual(self.nested_reply.depth, 2)
+        self.assertEqual(
+            self.nested_reply.path,
+            Comment.path_segment(self.root.id)
+            + Comment.path_segment(self.reply.id)
+            + Comment.path_segment(self.nested_reply.id),
+        )
+
+    def test_in_thread_order_is_depth_first(self):
+        ids = list(Comment.objects.filter(post=self.post).in_thread_order().values_list("id", flat=True))
+
+        self.assertEqual(ids, [self.root.id, self.reply.id, self.nested_reply.id, self.other_root.id])
+
+    def test_subtree_of(self):
+        ids = set(Comment.objects.subtree_of(self.reply).values_list("id", flat=True))
+
+        self.assertEqual(ids, {self.reply.id, self.nested_reply.id})
+
+    def test_up_to_depth(self):
+        ids = set(Comment.objects.filter(post=self.post).up_to_depth(1).values_list("id", flat=True))
+
+        self.assertEqual(ids, {self.root.id, self.reply.id, self.other_root.id})
+
+
+class ReactionTargetTests(TestCase):
+    def setUp(self):
+        self.user = UserFactory()
+        self.post = PostFactory(author=self.user)
+
+    def _make_reactions(self, n):
+        for i in range(n):
+            if i % 2:
+                ReactionFactory.for_post(post=PostFactory(author=self.user), author=self.user)
+            else:
+                ReactionFactory.for_comment(comment=CommentFactory(post=self.post, author=self.user), author=self.user)
+
+    def _str_queries(self, n):
+        self._make_reactions(n)
+        with CaptureQueriesContext(connection) as queries:
+            labels = [str(reaction) for reaction in Reaction.objects.with_targets()]
+        self.assertEqual(len(labels), n)
+        return len(queries)
+
+    def test_with_targets_resolves_in_constant_queries(self):
+        # reactions + posts + comments (with their authors and posts)
+        self.assertEqual(self._str_queries(4), 3)
+        Reaction.objects.all().delete()
+        self.assertEqual(self._str_queries(12), 3)
+
+    def test_load_reaction_targets(self):
+        comment = CommentFactory(post=self.post, author=self.user)
+        ReactionFactory.for_comment(comment=comment, author=self.user)
+        ReactionFactory.for_post(post=self.post, author=self.user)
+        reactions = list(Reaction.objects.order_by("id"))
+
+        load_reaction_targets(reactions)
+
+        with self.assertNumQueries(0):
+            self.assertEqual([r.content_object for r in reactions], [comment, self.post])
@@ -0,0 +1,117 @@
+from urllib.parse import urlencode
+
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.core.tests.query_budgets import QueryBudgetTestCase
+
+from .factories import CommentFactory, PostFactory, ReactionFactory, UserFactory
+
+
+class BlogQueryBudgetTests(QueryBudgetTestCase):
+    """Every blog endpoint runs as many queries for 10 posts, comments and reactions as for 2."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserFactory()
+        cls.others = [UserFactory() for _ in range(cls.LARGE)]
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.async_client = AsyncClient(AUTHORIZATION=f"Bearer {AccessToken.for_user(self.user)}")
+
+    def seed(self, size):
+        """
+        `size` posts; on the first: `size` threads, replies and reactions (on it and on its
+        first comment). The user's own post and comment, which the writes update and delete
+        (cascades included), carry `size` replies, `size` levels deep, and reactions on each.
+        """
+        users = self.others[:size]
+        posts = [PostFactory(author=user) for user in users]
+        post = posts[0]
+        roots = [CommentFactory(post=post, author=user) for user in users]
+        for user in users:
+            reply = CommentFactory(post=post, author=user, parent=roots[0])
+            CommentFactory(post=post, author=user, parent=reply)
+            ReactionFactory.for_post(post=post, author=user)
+            ReactionFactory.for_comment(comment=roots[0], author=user, type="love")
+
+        own_post = PostFactory(author=self.user)
+        own_comment = CommentFactory(post=post, author=self.user)
+        own_post_reply, own_comment_reply = CommentFactory(post=own_post, author=users[0]), own_comment
+        for user in users:
+            ReactionFactory.for_post(post=own_post, author=user)
+            ReactionFactory.for_comment(comment=own_comment, author=user)
+            own_post_reply = CommentFactory(post=own_post, author=user, parent=own_post_reply)
+            ReactionFactory.for_comment(comment=own_post_reply, author=user)
+            own_comment_reply = CommentFactory(post=post, author=user, parent=own_comment_reply)
+            ReactionFactory.for_comment(comment=own_comment_reply, author=user)
+        return {
+            "posts": posts,
+            "post": post.id,
+            "comment": roots[0].id,
+            "own_post": own_post.id,
+            "own_comment": own_comment.id,
+            "own_reaction": ReactionFactory.for_comment(comment=roots[1], author=self.user).id,
+            "reacted_comment": roots[1].id,
+            "reacted_post": ReactionFactory.for_post(post=posts[1], author=self.user).object_id,
+        }
+
+    def request(self, method, url, data=None):
+        if url.startswith("/api/async/"):
+            return async_to_sync(getattr(self.async_client, method.lower()))(url, data or {})
+        return getattr(self.client, method.lower())(url, data, format=None if method == "GET" else "json")
+
+    def _url(self, name, key=None, params=None):
+        query = f"?{urlencode(params)}" if params else ""
+        return lambda seeded: reverse(name, kwargs={"pk": seeded[key]} if key else {}) + query
+
+    def _assert_reads(self, names, key=None, variants=({}, {"sideload": "users"})):
+        for name in names:
+            for params in variants:
+                with self.subTest(name, params=params):
+                    self.assertWithinQueryBudget("GET", self._url(name, key, params))
+
+    def test_post_reads(self):
+        list_variants = ({}, {"ordering": "hot"}, {"page": 1}, {"sideload": "users"}, {"fields": "id,title"})
+        self._assert_reads(["post-list"], variants=list_variants)
+        self._assert_reads(["post-detail", "post-comments", "post-reactions"], "post")
+
+    def test_search(self):
+        self._assert_reads(["post-search"], variants=({"q": "post"}, {"q": "comment", "type": "comments"}))
+
+    def test_comment_reads(self):
+        self._assert_reads(["comment-replies", "comment-reactions"], "comment")
+
+    def test_own_reactions(self):
+        self.assertWithinQueryBudget("GET", self._url("post-my-reaction", "reacted_post"))
+        self.assertWithinQueryBudget("GET", self._url("comment-my-reaction", "reacted_comment"))
+
+    def test_post_writes(self):
+        self.assertWithinQueryBudget("POST", self._url("post-list"), {"title": "New", "content": "Body"})
+        self.assertWithinQueryBudget("PATCH", self._url("post-detail", "own_post"), {"title": "Edited"})
+        self.assertWithinQueryBudget("DELETE", self._url("post-detail", "own_post"))
+        self.assertWithinQueryBudget("POST", self._url("post-comments", "post"), {"content": "Hi"})
+        self.assertWithinQueryBudget("POST", self._url("post-reactions", "post"), {"type": "wow"})
+
+    def test_comment_writes(self):
+        self.assertWithinQueryBudget("PATCH", self._url("comment-detail", "own_comment"), {"content": "Edited"})
+        self.assertWithinQueryBudget("DELETE", self._url("comment-detail", "own_comment"))
+        self.assertWithinQueryBudget("POST", self._url("comment-reactions", "comment"), {"type": "wow"})
+
+    def test_reaction_writes(self):
+        self.assertWithinQueryBudget("PATCH", self._url("reaction-detail", "own_reaction"), {"type": "sad"})
+        self.assertWithinQueryBudget("DELETE", self._url("reaction-detail", "own_reaction"))
+        self.assertWithinQueryBudget(
+            "POST",
+            self._url("reaction-bulk"),
+            lambda seeded: [{"target_type": "post", "target_id": post.id, "type": "like"} for post in seeded["posts"]],
+        )
+
+    def test_async_reads(self):
+        self._assert_reads(["async-post-list"], variants=({}, {"page": 1}, {"sideload": "users"}))
+        self._assert_reads(["async-post-detail", "async-post-comments", "async-post-reactions"], "post")
@@ -0,0 +1,100 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+
+from apps.blog.models import Reaction
+from apps.blog.reaction_buffer import LOCAL_BUFFER_URL, LocalReactionBuffer, get_reaction_buffer
+from apps.blog.tasks import flush_reaction_buffer
+from apps.notifications.models import OutboxEvent
+from apps.notifications.tasks import send_reaction_summary_email
+
+from .factories import CommentFactory, PostFactory, ReactionFactory, UserFactory
+
+
+@override_settings(
+    BLOG_REACTION_WRITE_BEHIND=True,
+    BLOG_REACTION_BUFFER_URL=LOCAL_BUFFER_URL,
+    BLOG_REACTION_FLUSH_BATCH_SIZE=2,
+)
+class WriteBehindReactionTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        patcher = mock.patch("apps.blog.reaction_buffer._buffer", None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.buffer = get_reaction_buffer()
+
+        self.user = UserFactory()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.post = PostFactory()
+        self.comment = CommentFactory(post=self.post)
+
+    def _mine(self, url_name, pk):
+        return self.client.get(reverse(url_name, kwargs={"pk": pk}))
+
+    def test_buffered_reactions_are_flushed_last_write_wins(self):
+        url = reverse("post-reactions", kwargs={"pk": self.post.id})
+
+        resp = self.client.post(url, {"type": "like"}, format="json")
+        self.client.post(url, {"type": "wow"}, format="json")
+        self.client.post(reverse("comment-reactions", kwargs={"pk": self.comment.id}), {"type": "sad"}, format="json")
+
+        self.assertEqual(resp.status_code, status.HTTP_202_ACCEPTED)
+        self.assertTrue(resp.data["pending"])
+        self.assertFalse(Reaction.objects.exists())
+        mine = self._mine("post-my-reaction", self.post.id)
+        self.assertEqual((mine.data["type"], mine.data["pending"]), ("wow", True))
+
+        flush_reaction_buffer()
+
+        self.assertEqual(
+            set(Reaction.objects.values_list("object_id", "type")),
+            {(self.post.id, "wow"), (self.comment.id, "sad")},
+        )
+        mine = self._mine("post-my-reaction", self.post.id)
+        self.assertEqual((mine.data["type"], mine.data["pending"]), ("wow", False))
+        counts = self.client.get(reverse("post-detail", kwargs={"pk": self.post.id})).data["reaction_counts"]
+        self.assertEqual((counts["like"], counts["wow"]), (0, 1))
+        # post author and comment author
+        self.assertEqual(OutboxEvent.objects.filter(task_name=send_reaction_summary_email.name).count(), 2)
+        self.assertEqual(flush_reaction_buffer(), "Nothing to flush.")
+
+    def test_own_reaction_reads_buffer_while_flush_is_in_flight(self):
+        ReactionFactory.for_post(post=self.post, author=self.user, type="like")
+        self.client.post(reverse("post-reactions", kwargs={"pk": self.post.id}), {"type": "love"}, format="json")
+
+        self.buffer.start_flush()  # moved aside, not yet written
+
+        self.assertEqual(self._mine("post-my-reaction", self.post.id).data["type"], "love")
+        self.assertEqual(self._mine("comment-my-reaction", self.comment.id).status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_delete_discards_buffered_write(self):
+        reaction = ReactionFactory.for_post(post=self.post, author=self.user, type="like")
+        self.client.post(reverse("post-reactions", kwargs={"pk": self.post.id}), {"type": "love"}, format="json")
+
+        self.client.delete(reverse("reaction-detail", kwargs={"pk": reaction.id}))
+        flush_reaction_buffer()
+
+        self.assertFalse(Reaction.objects.exists())
+
+    def test_reactions_on_deleted_targets_are_dropped(self):
+        self.client.post(reverse("comment-reactions", kwargs={"pk": self.comment.id}), {"type": "sad"}, format="json")
+        self.comment.delete()
+
+        flush_reaction_buffer()
+
+        self.assertFalse(Reaction.objects.exists())
+
+    def test_local_buffer_only_when_selected(self):
+        self.assertIsInstance(self.buffer, LocalReactionBuffer)
+
+        with mock.patch("apps.blog.reaction_buffer._buffer", None), override_settings(BLOG_REACTION_BUFFER_URL=None):
+            # a per-process buffer would be invisible to the worker that flushes it
+            with self.assertRaises(ImproperlyConfigured):
+                get_reaction_buffer()
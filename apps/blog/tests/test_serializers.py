@@ -1,6 +1,7 @@
 from django.test import TestCase
 
 from apps.blog.serializers import CommentSerializer
+from apps.blog.services import load_comment_tree
 
 from .factories import CommentFactory, PostFactory
 
@@ -36,3 +37,21 @@ class CommentSerializerTests(TestCase):
         self.assertEqual(data["id"], parent.id)
         self.assertEqual(len(data["replies"]), 1)
         self.assertEqual(data["replies"][0]["id"], reply.id)
+
+    def test_replies_use_preloaded_tree_without_queries(self):
+        post = PostFactory()
+        parent = CommentFactory(post=post)
+        reply = CommentFactory(post=post, parent=parent)
+        CommentFactory(post=post, parent=reply)
+        tree = load_comment_tree(post)
+
+        serializer = CommentSerializer(
+            tree[None],
+            many=True,
+            context={"depth": 0, "max_depth": 5, "comment_tree": tree},
+        )
+        with self.assertNumQueries(0):
+            data = serializer.data
+
+        self.assertEqual(data[0]["replies"][0]["id"], reply.id)
+        self.assertEqual(len(data[0]["replies"][0]["replies"]), 1)
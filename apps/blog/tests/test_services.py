@@ -0,0 +1,170 @@
+import threading
+
+from django.db import connection
+from django.db.models import Count, Sum
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+
+from apps.blog.content_types import target_content_types
+from apps.blog.models import Reaction, ReactionCounter
+from apps.blog.services import bulk_upsert_reactions, load_reply_tree, upsert_reaction
+from apps.core.enums import ReactionType
+
+from .factories import CommentFactory, PostFactory, UserFactory
+
+
+class UpsertReactionTests(TestCase):
+    def setUp(self):
+        self.user = UserFactory()
+        self.post = PostFactory(author=self.user)
+
+    def test_create_change_and_repeat(self):
+        with CaptureQueriesContext(connection) as queries:
+            reaction, created, changed = upsert_reaction(self.user, self.post, ReactionType.LIKE)
+        reaction_table = f'"{Reaction._meta.db_table}"'
+        self.assertEqual(len([q for q in queries.captured_queries if reaction_table in q["sql"]]), 1)
+        self.assertTrue(created)
+        self.assertTrue(changed)
+
+        same, created, changed = upsert_reaction(self.user, self.post, ReactionType.WOW)
+        self.assertEqual(same.id, reaction.id)
+        self.assertFalse(created)
+        self.assertTrue(changed)
+
+        _, created, changed = upsert_reaction(self.user, self.post, ReactionType.WOW)
+        self.assertFalse(created)
+        self.assertFalse(changed)
+
+        self.assertEqual(Reaction.objects.get().type, ReactionType.WOW)
+        counts = dict(ReactionCounter.objects.values_list("type", "count"))
+        self.assertEqual(counts, {ReactionType.LIKE: 0, ReactionType.WOW: 1})
+
+    def test_works_on_comments(self):
+        comment = CommentFactory(post=self.post, author=self.user)
+
+        reaction, created, _ = upsert_reaction(self.user, comment, ReactionType.LOVE)
+
+        self.assertTrue(created)
+        self.assertEqual(reaction.content_object, comment)
+
+
+class UpsertReactionConcurrencyTests(TransactionTestCase):
+    THREADS = 8
+    CLICKS = 10
+
+    def test_concurrent_clicks_keep_one_row_and_exact_counters(self):
+        users = [UserFactory(), UserFactory()]
+        post = PostFactory(author=users[0])
+        types = list(ReactionType.values)
+        barrier = threading.Barrier(self.THREADS)
+        errors = []
+
+        def click(worker):
+            try:
+                barrier.wait()
+                for i in range(self.CLICKS):
+                    upsert_reaction(users[worker % 2], post, types[(worker + i) % len(types)])
+            except Exception as e:  # surfaced by the assertion below
+                errors.append(e)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=click, args=(n,)) for n in range(self.THREADS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(Reaction.objects.count(), 2)
+        actual = dict(Reaction.objects.values("type").annotate(n=Count("id")).values_list("type", "n"))
+        for counter in ReactionCounter.objects.all():
+            self.assertEqual(counter.count, actual.get(counter.type, 0))
+
+
+class LoadReplyTreeTests(TestCase):
+    def test_only_replies_that_are_shown_are_expanded(self):
+        user = UserFactory()
+        post = PostFactory(author=user)
+        top = CommentFactory(post=post, author=user)
+        replies = [CommentFactory(post=post, author=user, parent=top) for _ in range(40)]
+        for reply in replies:
+            for _ in range(3):
+                CommentFactory(post=post, author=user, parent=reply)
+
+        tree = load_reply_tree([top], max_depth=5, per_parent=3)
+
+        # 3 shown replies + 1 "more" marker, and the same under each shown reply only
+        self.assertEqual([comment.pk for comment in tree[top.pk]], [reply.pk for reply in replies[:4]])
+        self.assertEqual(sum(len(children) for children in tree.values()), 4 + 3 * 3)
+        self.assertNotIn(replies[3].pk, tree)
+
+    def test_stops_at_max_depth(self):
+        user = UserFactory()
+        top = CommentFactory(post=PostFactory(author=user), author=user)
+        child = CommentFactory(post=top.post, author=user, parent=top)
+        CommentFactory(post=top.post, author=user, parent=child)
+
+        tree = load_reply_tree([top], max_depth=1, per_parent=3)
+
+        self.assertEqual(list(tree), [top.pk])
+
+
+class UserDeleteReactionCounterTests(TestCase):
+    def test_deleting_a_user_releases_their_reactions_from_the_counters(self):
+        author, reader = UserFactory(), UserFactory()
+        post = PostFactory(author=author)
+        comment = CommentFactory(post=post, author=author)
+        upsert_reaction(author, post, "like")
+        upsert_reaction(reader, post, "like")
+        upsert_reaction(reader, comment, "wow")
+
+        reader.delete()
+
+        counts = dict(ReactionCounter.objects.filter(count__gt=0).values_list("type", "count"))
+        self.assertEqual(counts, {"like": 1})
+
+
+class BulkUpsertReactionConcurrencyTests(TransactionTestCase):
+    THREADS = 4
+    ROUNDS = 5
+    TARGETS = 5
+
+    def test_concurrent_bulk_writes_of_new_targets_keep_counters_exact(self):
+        user = UserFactory()
+        content_type_id = target_content_types()["post"].pk
+        types = list(ReactionType.values)
+        created = []
+        errors = []
+
+        for _ in range(self.ROUNDS):
+            posts = [PostFactory(author=user) for _ in range(self.TARGETS)]
+            barrier = threading.Barrier(self.THREADS)
+
+            def sync(worker):
+                try:
+                    barrier.wait()
+                    written = bulk_upsert_reactions(
+                        user, {(content_type_id, post.pk): types[worker % len(types)] for post in posts}
+                    )
+                    created.extend(key for key, (_, old_type) in written.items() if old_type is None)
+                except Exception as e:  # surfaced by the assertion below
+                    errors.append(e)
+                finally:
+                    connection.close()
+
+            threads = [threading.Thread(target=sync, args=(n,)) for n in range(self.THREADS)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(errors, [])
+        # every target was created exactly once, whoever won the race
+        self.assertEqual(len(created), self.ROUNDS * self.TARGETS)
+        self.assertEqual(len(set(created)), len(created))
+        actual = dict(Reaction.objects.values("type").annotate(n=Count("id")).values_list("type", "n"))
+        counted = dict(
+            ReactionCounter.objects.values("type").annotate(n=Sum("count")).filter(n__gt=0).values_list("type", "n")
+        )
+        self.assertEqual(counted, actual)
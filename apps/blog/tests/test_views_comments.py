@@ -1,8 +1,12 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient, APITestCase
 
-from .factories import CommentFactory, PostFactory, UserFactory
+from apps.blog.models import COMMENT_MAX_NESTING
+
+from .factories import CommentFactory, PostFactory, ReactionFactory, UserFactory
 
 
 class CommentAPITests(APITestCase):
@@ -25,9 +29,9 @@ class CommentAPITests(APITestCase):
         resp = self.client.get(self._post_comments_url())
 
         self.assertEqual(resp.status_code, status.HTTP_200_OK)
-        self.assertIsInstance(resp.data, list)
-        self.assertGreaterEqual(len(resp.data), 1)
-        self.assertIn("content", resp.data[0])
+        self.assertIsInstance(resp.data["results"], list)
+        self.assertGreaterEqual(len(resp.data["results"]), 1)
+        self.assertIn("content", resp.data["results"][0])
 
     def test_create_top_level_comment(self):
         payload = {
@@ -58,6 +62,22 @@ class CommentAPITests(APITestCase):
         self.assertEqual(resp.data["post"], self.post.id)
         self.assertEqual(resp.data["author"]["id"], self.user.id)
 
+    def test_reply_nesting_is_limited_by_path_length(self):
+        parent = CommentFactory(post=self.post, author=self.user)
+        for _ in range(COMMENT_MAX_NESTING - 1):
+            parent = CommentFactory(post=self.post, author=self.user, parent=parent)
+        self.assertEqual(parent.depth, COMMENT_MAX_NESTING - 1)
+
+        resp = self.client.post(self._post_comments_url(), {"content": "deepest", "parent": parent.id}, format="json")
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+
+        # one more level would overflow `Comment.path`: 400, not a database error
+        resp = self.client.post(
+            self._post_comments_url(), {"content": "too deep", "parent": resp.data["id"]}, format="json"
+        )
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("parent", resp.data)
+
     def test_update_comment(self):
         comment = CommentFactory(post=self.post, author=self.user)
 
@@ -78,3 +98,114 @@ class CommentAPITests(APITestCase):
         resp = self.client.delete(url)
 
         self.assertEqual(resp.status_code, status.HTTP_204_NO_CONTENT)
+
+    def _create_thread(self, roots, replies_per_root):
+        for _ in range(roots):
+            parent = CommentFactory(post=self.post, author=self.user)
+            ReactionFactory.for_comment(parent, author=self.user)
+            for _ in range(replies_per_root):
+                reply = CommentFactory(post=self.post, parent=parent, author=self.user)
+                ReactionFactory.for_comment(reply, author=self.user)
+                CommentFactory(post=self.post, parent=reply, author=self.user)
+
+    def test_list_comments_returns_nested_tree(self):
+        parent = CommentFactory(post=self.post)
+        reply = CommentFactory(post=self.post, parent=parent)
+        nested_reply = CommentFactory(post=self.post, parent=reply)
+
+        resp = self.client.get(self._post_comments_url())
+
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        results = resp.data["results"]
+        self.assertEqual([c["id"] for c in results], [parent.id])
+        self.assertEqual(results[0]["replies"][0]["id"], reply.id)
+        self.assertEqual(results[0]["replies"][0]["replies"][0]["id"], nested_reply.id)
+
+    def test_list_comments_query_count_does_not_grow_with_thread(self):
+        self._create_thread(roots=1, replies_per_root=1)
+        with CaptureQueriesContext(connection) as small:
+            self.client.get(self._post_comments_url())
+
+        self._create_thread(roots=5, replies_per_root=4)
+        with CaptureQueriesContext(connection) as large:
+            resp = self.client.get(self._post_comments_url())
+
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(resp.data["results"]), 6)
+        self.assertEqual(len(small), len(large))
+
+    def test_list_comments_stops_at_max_depth(self):
+        parent = None
+        for _ in range(7):
+            parent = CommentFactory(post=self.post, parent=parent, author=self.user)
+
+        resp = self.client.get(self._post_comments_url())
+
+        node, levels = resp.data["results"][0], 0
+        while node["replies"]:
+            node, levels = node["replies"][0], levels + 1
+        self.assertEqual(levels, 5)
+
+    def test_update_comment_cannot_change_parent(self):
+        comment = CommentFactory(post=self.post, author=self.user)
+        other = CommentFactory(post=self.post)
+
+        resp = self.client.patch(self._comment_detail_url(comment.id), {"parent": other.id}, format="json")
+
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("parent", resp.data)
+
+    def test_list_comments_pages_replies_per_level(self):
+        parent = CommentFactory(post=self.post, author=self.user)
+        replies = [CommentFactory(post=self.post, parent=parent, author=self.user) for _ in range(7)]
+
+        resp = self.client.get(self._post_comments_url())
+
+        node = resp.data["results"][0]
+        self.assertEqual([r["id"] for r in node["replies"]], [r.id for r in replies[:5]])
+        self.assertIsNone(node["replies"][0]["replies_next"])
+
+        more = self.client.get(node["replies_next"])
+
+        self.assertEqual(more.status_code, status.HTTP_200_OK)
+        self.assertEqual([r["id"] for r in more.data["results"]], [r.id for r in replies[5:]])
+        self.assertIsNone(more.data["next"])
+
+    def test_list_comments_cursor_pages_top_level(self):
+        comments = [CommentFactory(post=self.post, author=self.user) for _ in range(3)]
+
+        first = self.client.get(self._post_comments_url(), {"page_size": 2})
+        second = self.client.get(first.data["next"])
+
+        self.assertEqual([c["id"] for c in first.data["results"]], [c.id for c in comments[:2]])
+        self.assertEqual([c["id"] for c in second.data["results"]], [comments[2].id])
+
+    def test_list_comments_sparse_fields_on_replies(self):
+        parent = CommentFactory(post=self.post, author=self.user)
+        reply = CommentFactory(post=self.post, parent=parent, author=self.user)
+
+        resp = self.client.get(self._post_comments_url(), {"fields": "id,replies.id,replies.content"})
+
+        node = resp.data["results"][0]
+        self.assertEqual(set(node), {"id", "replies"})
+        self.assertEqual(node["replies"], [{"id": reply.id, "content": reply.content}])
+
+    def test_list_comments_without_replies_skips_reply_query(self):
+        CommentFactory(post=self.post, author=self.user)
+        with CaptureQueriesContext(connection) as with_replies:
+            self.client.get(self._post_comments_url())
+        with CaptureQueriesContext(connection) as without_replies:
+            self.client.get(self._post_comments_url(), {"omit": "replies"})
+
+        self.assertLess(len(without_replies), len(with_replies))
+
+    def test_list_comments_sideload_users(self):
+        root = CommentFactory(post=self.post, author=self.user)
+        CommentFactory(post=self.post, parent=root, author=self.user)
+
+        resp = self.client.get(self._post_comments_url(), {"sideload": "users"})
+
+        item = resp.data["results"][0]
+        self.assertEqual(item["author_id"], self.user.id)
+        self.assertEqual(item["replies"][0]["author_id"], self.user.id)
+        self.assertEqual(list(resp.data["users"]), [self.user.id])
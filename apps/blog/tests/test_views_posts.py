@@ -1,3 +1,5 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient, APITestCase
@@ -96,9 +98,9 @@ class PostAPITests(APITestCase):
         resp = self.client.get(self._post_comments_url())
 
         self.assertEqual(resp.status_code, status.HTTP_200_OK)
-        self.assertIsInstance(resp.data, list)
-        self.assertGreaterEqual(len(resp.data), 1)
-        self.assertIn("content", resp.data[0])
+        self.assertIsInstance(resp.data["results"], list)
+        self.assertGreaterEqual(len(resp.data["results"]), 1)
+        self.assertIn("content", resp.data["results"][0])
 
     def test_add_post_comment(self):
         payload = {
@@ -118,9 +120,9 @@ class PostAPITests(APITestCase):
         resp = self.client.get(self._post_reactions_url())
 
         self.assertEqual(resp.status_code, status.HTTP_200_OK)
-        self.assertIsInstance(resp.data, list)
-        self.assertGreaterEqual(len(resp.data), 1)
-        self.assertIn("type", resp.data[0])
+        self.assertIsInstance(resp.data["results"], list)
+        self.assertGreaterEqual(len(resp.data["results"]), 1)
+        self.assertIn("type", resp.data["results"][0])
 
     def test_add_post_reaction(self):
         payload = {
@@ -132,3 +134,135 @@ class PostAPITests(APITestCase):
         self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
         self.assertEqual(resp.data["type"], "like")
         self.assertEqual(resp.data["author"]["id"], self.user.id)
+
+    def test_retrieve_post_without_reaction_list(self):
+        ReactionFactory.for_post(post=self.post, type="like")
+
+        resp = self.client.get(self._post_detail_url(), {"include_reactions": "false"})
+
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertNotIn("reactions", resp.data)
+        self.assertEqual(resp.data["reaction_counts"]["like"], 1)
+
+    def test_list_posts_uses_lightweight_representation(self):
+        self.post.content = "x" * 500
+        self.post.save()
+        CommentFactory(post=self.post, author=self.user)
+        ReactionFactory.for_post(post=self.post, author=self.user, type="love")
+
+        resp = self.client.get(self._post_list_url())
+
+        item = resp.data["results"][0]
+        self.assertEqual(item["id"], self.post.id)
+        self.assertEqual(len(item["excerpt"]), 200)
+        self.assertEqual(item["comment_count"], 1)
+        self.assertEqual(item["reaction_counts"]["love"], 1)
+        for heavy in ("content", "comments", "reactions"):
+            self.assertNotIn(heavy, item)
+
+    def test_list_posts_query_count_does_not_grow_with_comments(self):
+        with CaptureQueriesContext(connection) as small:
+            self.client.get(self._post_list_url())
+
+        for _ in range(5):
+            post = PostFactory(author=self.user)
+            CommentFactory(post=post, author=self.user)
+            ReactionFactory.for_post(post=post, author=self.user)
+        with CaptureQueriesContext(connection) as large:
+            resp = self.client.get(self._post_list_url())
+
+        self.assertEqual(len(resp.data["results"]), 6)
+        self.assertEqual(len(small), len(large))
+
+    def test_list_posts_cursor_pages_are_stable_while_new_posts_arrive(self):
+        for _ in range(11):
+            PostFactory(author=self.user)
+
+        first = self.client.get(self._post_list_url())
+        self.assertNotIn("count", first.data)
+        self.assertEqual(len(first.data["results"]), 10)
+
+        PostFactory(author=self.user)  # arrives between page loads
+        second = self.client.get(first.data["next"])
+
+        first_ids = [p["id"] for p in first.data["results"]]
+        second_ids = [p["id"] for p in second.data["results"]]
+        self.assertEqual(len(second_ids), 2)
+        self.assertFalse(set(first_ids) & set(second_ids))
+        self.assertIsNone(second.data["next"])
+
+    def test_list_posts_page_number_mode(self):
+        resp = self.client.get(self._post_list_url(), {"page": 1})
+
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp.data["count"], 1)
+
+    def test_get_post_reactions_is_paginated(self):
+        reactions = [ReactionFactory.for_post(post=self.post) for _ in range(3)]
+
+        first = self.client.get(self._post_reactions_url(), {"page_size": 2})
+        second = self.client.get(first.data["next"])
+
+        # newest first
+        ids = [r["id"] for r in first.data["results"] + second.data["results"]]
+        self.assertEqual(ids, [r.id for r in reversed(reactions)])
+
+    def test_retrieve_post_sparse_fields_skip_unrequested_work(self):
+        CommentFactory(post=self.post, author=self.user)
+        ReactionFactory.for_post(post=self.post, author=self.user)
+
+        with CaptureQueriesContext(connection) as queries:
+            resp = self.client.get(self._post_detail_url(), {"fields": "id,title,author.username"})
+
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(set(resp.data), {"id", "title", "author"})
+        self.assertEqual(resp.data["author"], {"username": self.user.username})
+        sql = " ".join(q["sql"] for q in queries.captured_queries)
+        for table in ("blog_comment", "blog_reaction", '"content"'):
+            self.assertNotIn(table, sql)
+
+    def test_retrieve_post_omit_nested_field(self):
+        resp = self.client.get(self._post_detail_url(), {"omit": "content,author.email"})
+
+        self.assertNotIn("content", resp.data)
+        self.assertNotIn("email", resp.data["author"])
+        self.assertIn("username", resp.data["author"])
+
+    def test_list_posts_expand_content(self):
+        resp = self.client.get(self._post_list_url())
+        self.assertNotIn("content", resp.data["results"][0])
+
+        resp = self.client.get(self._post_list_url(), {"expand": "content,author.date_joined"})
+
+        item = resp.data["results"][0]
+        self.assertEqual(item["content"], self.post.content)
+        self.assertIn("date_joined", item["author"])
+
+    def test_retrieve_post_sideloads_distinct_users(self):
+        other = UserFactory()
+        for author in (self.user, other, self.user):
+            comment = CommentFactory(post=self.post, author=author)
+            CommentFactory(post=self.post, parent=comment, author=other)
+        ReactionFactory.for_post(post=self.post, author=other)
+
+        with CaptureQueriesContext(connection) as queries:
+            resp = self.client.get(self._post_detail_url(), {"sideload": "users"})
+
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp.data["author_id"], self.user.id)
+        self.assertNotIn("author", resp.data)
+        self.assertEqual(resp.data["reactions"][0]["author_id"], other.id)
+        self.assertEqual(resp.data["comments"][0]["replies"][0]["author_id"], other.id)
+        self.assertEqual(set(resp.data["users"]), {self.user.id, other.id})
+        self.assertEqual(resp.data["users"][other.id]["username"], other.username)
+        user_table = f'FROM "{type(self.user)._meta.db_table}"'
+        user_queries = [q for q in queries.captured_queries if user_table in q["sql"]]
+        self.assertEqual(len(user_queries), 1)
+
+    def test_list_posts_sideload_users(self):
+        PostFactory(author=self.user)
+
+        resp = self.client.get(self._post_list_url(), {"sideload": "users", "fields": "id,author,users.username"})
+
+        self.assertEqual({item["author_id"] for item in resp.data["results"]}, {self.user.id})
+        self.assertEqual(resp.data["users"], {self.user.id: {"username": self.user.username}})
@@ -1,10 +1,12 @@
-from unittest.mock import patch
-
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient, APITestCase
 
-from apps.blog.models import Reaction
+from apps.blog.models import Reaction, ReactionCounter
+from apps.notifications.models import OutboxEvent
+from apps.notifications.tasks import send_new_reaction_email, send_reaction_summary_email
 
 from .factories import CommentFactory, PostFactory, ReactionFactory, UserFactory
 
@@ -17,8 +19,10 @@ class PostReactionAPITests(APITestCase):
         self.post = PostFactory()
         self.comment = CommentFactory(post=self.post)
 
-    @patch("apps.notifications.tasks.send_new_reaction_email.delay")
-    def test_create_reaction_first_time_sends_email(self, mock_delay):
+    def _enqueued(self, task):
+        return OutboxEvent.objects.filter(task_name=task.name)
+
+    def test_create_reaction_first_time_sends_email(self):
         url = reverse("post-reactions", kwargs={"pk": self.post.id})
         payload = {"type": "like"}
 
@@ -26,26 +30,22 @@ class PostReactionAPITests(APITestCase):
 
         self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
         self.assertEqual(Reaction.objects.count(), 1)
-        mock_delay.assert_called_once()  # email enqueued
+        self.assertEqual(self._enqueued(send_new_reaction_email).count(), 1)  # email enqueued
 
-    @patch("apps.notifications.tasks.send_new_reaction_email.delay")
-    def test_same_type_reaction_does_not_resend_email(self, mock_delay):
+    def test_same_type_reaction_does_not_resend_email(self):
         url = reverse("post-reactions", kwargs={"pk": self.post.id})
 
         # First time → should send email
         resp1 = self.client.post(url, {"type": "like"}, format="json")
         self.assertEqual(resp1.status_code, status.HTTP_201_CREATED)
         self.assertEqual(Reaction.objects.count(), 1)
-        mock_delay.assert_called_once()
-
-        # Reset mock to only track second call
-        mock_delay.reset_mock()
+        self.assertEqual(self._enqueued(send_new_reaction_email).count(), 1)
 
         # Second time same type → should NOT send email
         resp2 = self.client.post(url, {"type": "like"}, format="json")
         self.assertEqual(resp2.status_code, status.HTTP_201_CREATED)
         self.assertEqual(Reaction.objects.count(), 1)
-        mock_delay.assert_not_called()  # no new email
+        self.assertEqual(self._enqueued(send_new_reaction_email).count(), 1)  # no new email
 
     def test_update_reaction_type(self):
         url = reverse("post-reactions", kwargs={"pk": self.post.id})
@@ -72,3 +72,112 @@ class PostReactionAPITests(APITestCase):
 
         self.assertEqual(resp.status_code, status.HTTP_204_NO_CONTENT)
         self.assertEqual(Reaction.objects.count(), 0)
+
+    def _counts(self, url):
+        return self.client.get(url).data["reaction_counts"]
+
+    def test_reaction_counts_follow_create_change_and_delete(self):
+        post_url = reverse("post-detail", kwargs={"pk": self.post.id})
+        reactions_url = reverse("post-reactions", kwargs={"pk": self.post.id})
+
+        self.client.post(reactions_url, {"type": "like"}, format="json")
+        other = APIClient()
+        other.force_authenticate(UserFactory())
+        other.post(reactions_url, {"type": "like"}, format="json")
+        self.assertEqual(self._counts(post_url)["like"], 2)
+
+        # changing type moves one count across
+        resp = self.client.post(reactions_url, {"type": "wow"}, format="json")
+        counts = self._counts(post_url)
+        self.assertEqual((counts["like"], counts["wow"]), (1, 1))
+
+        # PATCH through ReactionViewSet
+        detail_url = reverse("reaction-detail", kwargs={"pk": resp.data["id"]})
+        self.client.patch(detail_url, {"type": "sad"}, format="json")
+        counts = self._counts(post_url)
+        self.assertEqual((counts["wow"], counts["sad"]), (0, 1))
+
+        self.client.delete(detail_url)
+        counts = self._counts(post_url)
+        self.assertEqual((counts["like"], counts["sad"]), (1, 0))
+
+    def test_comment_reaction_counts(self):
+        url = reverse("comment-reactions", kwargs={"pk": self.comment.id})
+
+        self.client.post(url, {"type": "love"}, format="json")
+
+        resp = self.client.get(reverse("post-comments", kwargs={"pk": self.post.id}))
+        self.assertEqual(resp.data["results"][0]["reaction_counts"]["love"], 1)
+        self.assertEqual(resp.data["results"][0]["reaction_counts"]["like"], 0)
+
+    def test_bulk_reactions(self):
+        other_post = PostFactory(author=self.post.author)
+        ReactionFactory.for_post(post=self.post, author=self.user, type="like")
+        url = reverse("reaction-bulk")
+        payload = [
+            {"target_type": "post", "target_id": self.post.id, "type": "like"},
+            {"target_type": "post", "target_id": other_post.id, "type": "sad"},
+            {"target_type": "comment", "target_id": self.comment.id, "type": "wow"},
+            {"target_type": "comment", "target_id": self.comment.id + 1000, "type": "wow"},
+        ]
+
+        resp = self.client.post(url, payload, format="json")
+
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [item["status"] for item in resp.data["results"]],
+            ["unchanged", "created", "created", "not_found"],
+        )
+        self.assertEqual(Reaction.objects.filter(author=self.user).count(), 3)
+        self.assertEqual(self._counts(reverse("post-detail", kwargs={"pk": other_post.id}))["sad"], 1)
+
+        # post and comment have different authors: one email each, however many items
+        recipients = [event.args[0] for event in self._enqueued(send_reaction_summary_email)]
+        self.assertCountEqual(recipients, [self.post.author_id, self.comment.author_id])
+
+    def _bulk_query_count(self, comments, reaction_type):
+        payload = [{"target_type": "comment", "target_id": comment.id, "type": reaction_type} for comment in comments]
+        with CaptureQueriesContext(connection) as queries:
+            resp = self.client.post(reverse("reaction-bulk"), payload, format="json")
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        return len(queries)
+
+    def test_bulk_reactions_query_count_does_not_grow_with_items(self):
+        authors = [self.user, self.post.author]
+        few = [CommentFactory(post=self.post, author=authors[i % 2]) for i in range(2)]
+        many = [CommentFactory(post=self.post, author=authors[i % 2]) for i in range(20)]
+        ReactionFactory.for_comment(comment=few[0], author=self.user, type="like")
+        ReactionFactory.for_comment(comment=many[0], author=self.user, type="like")
+
+        # creates and updates, with counters, cache invalidation and notifications
+        self.assertEqual(self._bulk_query_count(few, "wow"), self._bulk_query_count(many, "wow"))
+        # every target changes type
+        self.assertEqual(self._bulk_query_count(few, "sad"), self._bulk_query_count(many, "sad"))
+        self.assertEqual(self._counts_of_comment(many[0]), {"sad": 1})
+
+    def _counts_of_comment(self, comment):
+        counters = ReactionCounter.objects.filter(comment=comment, count__gt=0)
+        return dict(counters.values_list("type", "count"))
+
+    def test_bulk_reactions_last_item_wins(self):
+        url = reverse("reaction-bulk")
+        payload = [
+            {"target_type": "post", "target_id": self.post.id, "type": "like"},
+            {"target_type": "post", "target_id": self.post.id, "type": "love"},
+        ]
+
+        resp = self.client.post(url, payload, format="json")
+
+        self.assertEqual([item["type"] for item in resp.data["results"]], ["love", "love"])
+        self.assertEqual(Reaction.objects.get().type, "love")
+        counts = self._counts(reverse("post-detail", kwargs={"pk": self.post.id}))
+        self.assertEqual((counts["like"], counts["love"]), (0, 1))
+        self.assertEqual(self._enqueued(send_reaction_summary_email).count(), 1)
+
+    def test_bulk_reactions_validates_items(self):
+        url = reverse("reaction-bulk")
+
+        resp = self.client.post(url, [{"target_type": "user", "target_id": 1, "type": "like"}], format="json")
+
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.post(url, [], format="json").status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,62 @@
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+
+from .factories import CommentFactory, PostFactory, UserFactory
+
+
+class SearchAPITests(APITestCase):
+    def setUp(self):
+        self.user = UserFactory()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.in_title = PostFactory(author=self.user, title="Django ORM tips", content="Queries and indexes.")
+        self.in_body = PostFactory(author=self.user, title="Weekly notes", content="Some Django ORM internals.")
+        PostFactory(author=self.user, title="Gardening", content="Tomatoes and basil.")
+
+    def _search(self, **params):
+        return self.client.get(reverse("post-search"), params)
+
+    def test_search_posts_best_match_first(self):
+        resp = self._search(q="django orm")
+
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual([post["id"] for post in resp.data["results"]], [self.in_title.id, self.in_body.id])
+        first, second = resp.data["results"]
+        self.assertGreater(first["rank"], second["rank"])
+        self.assertIn("excerpt", first)
+
+    def test_search_matches_prefixes_and_stems(self):
+        resp = self._search(q="Djan quer")
+
+        self.assertEqual([post["id"] for post in resp.data["results"]], [self.in_title.id])
+
+    def test_search_ignores_query_operators(self):
+        resp = self._search(q="django & !orm | (")
+
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(resp.data["results"]), 2)
+
+    def test_search_comments(self):
+        comment = CommentFactory(post=self.in_body, author=self.user, content="Great write-up on indexes")
+        CommentFactory(post=self.in_body, author=self.user, content="Thanks")
+
+        resp = self._search(q="index", type="comments")
+
+        self.assertEqual([item["id"] for item in resp.data["results"]], [comment.id])
+        self.assertEqual(resp.data["results"][0]["post"], self.in_body.id)
+
+    def test_search_keyset_pages(self):
+        resp = self._search(q="django", page_size=1)
+        self.assertEqual(len(resp.data["results"]), 1)
+        self.assertIsNotNone(resp.data["next"])
+
+        next_page = self.client.get(resp.data["next"])
+
+        ids = [resp.data["results"][0]["id"], next_page.data["results"][0]["id"]]
+        self.assertCountEqual(ids, [self.in_title.id, self.in_body.id])
+        self.assertIsNone(next_page.data["next"])
+
+    def test_search_validates_params(self):
+        self.assertEqual(self._search(q=" ?! ").status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self._search(q="django", type="users").status_code, status.HTTP_400_BAD_REQUEST)
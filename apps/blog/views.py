@@ -1,72 +1,423 @@
 import logging
 
-from django.contrib.contenttypes.models import ContentType
+from django.contrib.auth import get_user_model
 from django.db import transaction
+from django.db.models import Count, F, OuterRef, Prefetch, Q, Subquery
+from django.db.models.functions import Coalesce, Substr
 from rest_framework import mixins, permissions, status, viewsets
 from rest_framework.decorators import action
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.permissions import SAFE_METHODS
 from rest_framework.response import Response
 
 from apps.blog.permissions import IsAuthorOrReadOnly
-from apps.notifications.tasks import send_new_comment_email, send_new_reaction_email
+from apps.core.serializers import FieldSelection
+from apps.notifications.services import notify_new_comment, notify_new_reaction, notify_reactions_by_recipient
+from apps.users.serializers import UserSerializer
 
+from .cache import cached_post_response, post_list_response
+from .content_types import REACTION_TARGET_MODELS, content_type_for, target_content_types
 from .models import Comment, Post, Reaction
-from .serializers import CommentSerializer, PostSerializer, ReactionSerializer
+from .pagination import (
+    CommentCursorPagination,
+    HotPostCursorPagination,
+    PostCursorPagination,
+    PostPagination,
+    ReactionCursorPagination,
+    SearchCursorPagination,
+)
+from .reaction_buffer import get_reaction_buffer, write_behind_enabled
+from .search import search, search_query
+from .serializers import (
+    BulkReactionItemSerializer,
+    CommentSearchSerializer,
+    CommentSerializer,
+    PostListSerializer,
+    PostSearchSerializer,
+    PostSerializer,
+    ReactionSerializer,
+)
+from .services import (
+    build_comment_tree,
+    bulk_upsert_reactions,
+    comment_queryset,
+    load_reply_tree,
+    record_reaction_change,
+    upsert_reaction,
+)
 
 logger = logging.getLogger(__name__)
+User = get_user_model()
 
+POST_EXCERPT_LENGTH = 200
+COMMENT_MAX_DEPTH = 5
+BULK_REACTIONS_MAX_ITEMS = 100
+HOT_ORDERING = "hot"
 
-class PostPagination(PageNumberPagination):
-    page_size = 10
+
+def include_reactions(request):
+    """
+    `?include_reactions=false` leaves out the full reaction lists;
+    `reaction_counts` is always returned.
+    """
+    return request.query_params.get("include_reactions", "true").lower() not in ("0", "false", "no")
+
+
+def sideload_users(request):
+    """
+    `?sideload=users` renders nested authors as `author_id` and lists each
+    distinct user once in a top-level `users` map (read requests only).
+    """
+    if request.method not in SAFE_METHODS:
+        return False
+    return "users" in request.query_params.get("sideload", "").split(",")
+
+
+def _collect_author_ids(data, ids):
+    if isinstance(data, dict):
+        for key, value in data.items():
+            if key == "author_id":
+                ids.add(value)
+            else:
+                _collect_author_ids(value, ids)
+    elif isinstance(data, list):
+        for item in data:
+            _collect_author_ids(item, ids)
+    return ids
+
+
+def add_sideloaded_users(request, response):
+    """
+    Add the `users` map for every `author_id` in a `?sideload=users` response,
+    loaded by one query whatever the number of nested objects.
+    """
+    if response.status_code != 200 or not sideload_users(request):
+        return response
+
+    ids = _collect_author_ids(response.data, set())
+    users = User.objects.filter(pk__in=ids).order_by("pk") if ids else User.objects.none()
+    serializer = UserSerializer(
+        users,
+        many=True,
+        context={"request": request, "field_selection": FieldSelection.from_request(request).child("users")},
+    )
+    # keyed by pk even if `?fields=users.username` leaves out "id"
+    response.data["users"] = {user.pk: data for user, data in zip(users, serializer.data)}
+    return response
+
+
+def comment_level_response(view, request, filters, depth):
+    """
+    One cursor page of the comments matching `filters` (a single level of a thread,
+    whose comments are at `depth`), each with its first replies per level embedded
+    down to COMMENT_MAX_DEPTH.
+    """
+    paginator = CommentCursorPagination()
+    with_reactions = include_reactions(request)
+    selection = FieldSelection.from_request(request)
+
+    with_authors = not sideload_users(request)
+
+    comments = comment_queryset(with_reactions, selection, with_authors).filter(filters)
+    page = paginator.paginate_queryset(comments, request, view=view)
+
+    # Every reply level is read by one query, so it loads what any level asked for
+    reply_selection = selection.descendants("replies", COMMENT_MAX_DEPTH - depth)
+    tree = build_comment_tree([])
+    if reply_selection is not None:
+        tree = load_reply_tree(
+            page,
+            max_depth=COMMENT_MAX_DEPTH,
+            per_parent=paginator.replies_page_size,
+            include_reactions=with_reactions,
+            selection=reply_selection,
+            with_authors=with_authors,
+        )
+
+    serializer = CommentSerializer(
+        page,
+        many=True,
+        context={
+            "request": request,
+            "include_reactions": with_reactions,
+            "depth": depth,
+            "max_depth": COMMENT_MAX_DEPTH,
+            "comment_tree": tree,
+            "replies_paginator": paginator,
+            "field_selection": selection,
+            "sideload_users": not with_authors,
+        },
+    )
+    return add_sideloaded_users(request, paginator.get_paginated_response(serializer.data))
+
+
+def reaction_page_response(view, request, content_type, object_id):
+    """One cursor page of the reactions on an object, newest first."""
+    paginator = ReactionCursorPagination()
+    selection = FieldSelection.from_request(request)
+
+    reactions = Reaction.objects.filter(content_type=content_type, object_id=object_id)
+    reactions = reactions.defer(*selection.deferred("created_at"))
+    with_authors = not sideload_users(request)
+    if with_authors and selection.includes("author"):
+        reactions = reactions.select_related("author")
+
+    page = paginator.paginate_queryset(reactions, request, view=view)
+    serializer = ReactionSerializer(
+        page,
+        many=True,
+        context={"request": request, "field_selection": selection, "sideload_users": not with_authors},
+    )
+    return add_sideloaded_users(request, paginator.get_paginated_response(serializer.data))
+
+
+def reaction_create_response(request, target, target_kind):
+    """
+    Set the requesting user's reaction on `target` (one upsert statement, see
+    `services.upsert_reaction`) and notify its author when the reaction is new or changed.
+    """
+    serializer = ReactionSerializer(data=request.data, context={"request": request})
+    serializer.is_valid(raise_exception=True)
+
+    if write_behind_enabled():
+        # Buffered: written (and notified) by `tasks.flush_reaction_buffer`
+        content_type = content_type_for(target)
+        get_reaction_buffer().add(request.user.pk, content_type.pk, target.pk, serializer.validated_data["type"])
+        reaction = Reaction(
+            author=request.user, content_type=content_type, object_id=target.pk, **serializer.validated_data
+        )
+        data = {**ReactionSerializer(reaction, context={"request": request}).data, "pending": True}
+        return Response(data, status=status.HTTP_202_ACCEPTED)
+
+    with transaction.atomic():
+        reaction, _, changed = upsert_reaction(request.user, target, serializer.validated_data["type"])
+        if changed:
+            # Outbox row in the same transaction: published to Celery after commit
+            notify_new_reaction(target.author_id, reaction.type, target_kind, target.id)
+
+    return Response(ReactionSerializer(reaction, context={"request": request}).data, status=status.HTTP_201_CREATED)
+
+
+def own_reaction_response(request, target):
+    """
+    The requesting user's reaction on `target`. In write-behind mode a buffered
+    reaction wins over the stored one (`"pending": true`), so users see their latest click.
+    """
+    content_type = content_type_for(target)
+    buffered = (
+        get_reaction_buffer().get(request.user.pk, content_type.pk, target.pk) if write_behind_enabled() else None
+    )
+    if buffered:
+        reaction = Reaction(author=request.user, content_type=content_type, object_id=target.pk, type=buffered)
+    else:
+        reaction = Reaction.objects.filter(author=request.user, content_type=content_type, object_id=target.pk).first()
+        if reaction is None:
+            return Response({"detail": "No reaction."}, status=status.HTTP_404_NOT_FOUND)
+
+    data = ReactionSerializer(reaction, context={"request": request}).data
+    return Response({**data, "pending": bool(buffered)})
+
+
+def reload_for_response(queryset, serializer):
+    """
+    Re-read an updated instance through `queryset` (what its reads prefetch) before it
+    is rendered. Updates look up the bare row: `UpdateModelMixin` drops prefetched
+    relations after saving, so the response would otherwise cost a query per nested
+    comment, reaction and author.
+    """
+    serializer.instance = queryset.get(pk=serializer.instance.pk)
 
 
 class PostViewSet(viewsets.ModelViewSet):
     """
     Full CRUD for Post:
-      - GET    /api/blog/        -> list posts
+      - GET    /api/blog/        -> list posts (lightweight: excerpt + counts, cursor pages;
+                                    `?page=N` switches to page-number pagination,
+                                    `?ordering=hot` ranks by recent activity instead of date)
       - POST   /api/blog/        -> create post
       - GET    /api/blog/{id}/   -> retrieve post
       - PUT    /api/blog/{id}/   -> full update
       - PATCH  /api/blog/{id}/   -> partial update
       - DELETE /api/blog/{id}/   -> delete post
+      - GET    /api/blog/search/?q=...  -> full-text search of posts (or `&type=comments`)
     """
 
     serializer_class = PostSerializer
     permission_classes = [permissions.IsAuthenticated, IsAuthorOrReadOnly]
-    pagination_class = PostPagination
+    pagination_class = PostCursorPagination
+    # Most queries per request, whatever the number of posts, comments and reactions
+    # (apps.core.query_budget; enforced by apps/blog/tests/test_query_budgets.py)
+    query_budgets = {
+        "list": 3,
+        "create": 5,
+        "retrieve": 7,
+        "update": 8,
+        "partial_update": 8,
+        "destroy": 14,
+        "search": 2,
+        "comments": {"GET": 8, "POST": 11},
+        "reactions": {"GET": 3, "POST": 5},
+        "my_reaction": 6,
+    }
+
+    @property
+    def paginator(self):
+        """
+        Cursor pagination by default; `?page=N` opts into page-number mode,
+        `?ordering=hot` into cursor pages of the hot ranking.
+        """
+        if not hasattr(self, "_paginator"):
+            if self._hot_ordering():
+                self._paginator = HotPostCursorPagination()
+            elif PostPagination.page_query_param in self.request.query_params:
+                self._paginator = PostPagination()
+            else:
+                self._paginator = self.pagination_class()
+        return self._paginator
+
+    def _hot_ordering(self):
+        return self.action == "list" and self.request.query_params.get("ordering") == HOT_ORDERING
+
+    def get_serializer_class(self):
+        if self.action == "list":
+            return PostListSerializer
+        return super().get_serializer_class()
 
     def get_queryset(self):
-        return Post.objects.select_related("author").prefetch_related(
-            "reactions",
-            "comments__author",
-            "comments__reactions",
-        )
+        selection = FieldSelection.from_request(self.request)
+
+        if self.action == "list":
+            return self._get_list_queryset(selection)
+
+        if self.action in ("comments", "reactions", "update", "partial_update", "destroy"):
+            # Sub-resource actions load their own rows, writes none (updates reload for the response):
+            # only the post itself is needed
+            return Post.objects.select_related("author")
+        return self._get_detail_queryset(selection)
+
+    def _get_detail_queryset(self, selection):
+        with_authors = not sideload_users(self.request)
+        queryset = Post.objects.defer(*selection.deferred("title", "content", "updated_at"))
+        if with_authors and selection.includes("author"):
+            queryset = queryset.select_related("author")
+        if selection.includes("reaction_counts"):
+            queryset = queryset.prefetch_related("reaction_counters")
+
+        with_reactions = include_reactions(self.request)
+        if with_reactions and selection.includes("reactions"):
+            reactions = Reaction.objects.all()
+            if with_authors and selection.child("reactions").includes("author"):
+                reactions = reactions.select_related("author")
+            queryset = queryset.prefetch_related(Prefetch("reactions", queryset=reactions))
+
+        if selection.includes("comments"):
+            # All comment levels come from one prefetch, so it loads what any level asked for
+            comments_selection = selection.child("comments")
+            replies_selection = comments_selection.descendants("replies", COMMENT_MAX_DEPTH)
+            if replies_selection is not None:
+                comments_selection = comments_selection.union(replies_selection)
+            queryset = queryset.prefetch_related(
+                Prefetch("comments", queryset=comment_queryset(with_reactions, comments_selection, with_authors)),
+            )
+        return queryset
+
+    def _get_list_queryset(self, selection):
+        # Feed page: excerpt and comment count computed in SQL, full body only with `?expand=content`
+        queryset = Post.objects.defer(*selection.deferred("title", "updated_at"))
+        if not selection.includes("content", expandable=True):
+            queryset = queryset.defer("content")
+        if selection.includes("excerpt"):
+            queryset = queryset.annotate(excerpt=Substr("content", 1, POST_EXCERPT_LENGTH))
+        if selection.includes("comment_count"):
+            # Correlated subquery (not a JOIN + GROUP BY) so only the rows of the page are counted
+            comment_count = (
+                Comment.objects.filter(post=OuterRef("pk"))
+                .order_by()
+                .values("post")
+                .annotate(total=Count("id"))
+                .values("total")
+            )
+            queryset = queryset.annotate(comment_count=Coalesce(Subquery(comment_count), 0))
+        if selection.includes("author") and not sideload_users(self.request):
+            queryset = queryset.select_related("author")
+        if selection.includes("reaction_counts"):
+            queryset = queryset.prefetch_related("reaction_counters")
+        if self._hot_ordering():
+            # Inner join: every post gets its hot score row when it is created
+            queryset = queryset.filter(hot_score__isnull=False).annotate(hot_rank=F("hot_score__rank"))
+        return queryset
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context["include_reactions"] = include_reactions(self.request)
+        context["field_selection"] = FieldSelection.from_request(self.request)
+        context["sideload_users"] = sideload_users(self.request)
+        return context
 
     def perform_create(self, serializer):
         serializer.save(author=self.request.user)
 
-    # helper methods for comments on this post
-    def _get_post_comments(self, post, request):
-        comments = (
-            post.comments.filter(parent__isnull=True)
-            .select_related("author")
-            .prefetch_related(
-                "reactions",
-                "replies__author",
-                "replies__reactions",
-            )
+    def perform_update(self, serializer):
+        super().perform_update(serializer)
+        reload_for_response(self._get_detail_queryset(FieldSelection.from_request(self.request)), serializer)
+
+    def _cached_read(self, name, build_response):
+        """
+        Serve a post read from the write-invalidated cache (see `apps.blog.cache`).
+        Only canonical ids are cached: "01" would be a key no write ever invalidates.
+        """
+        pk = self.kwargs["pk"]
+        if not pk.isdigit() or str(int(pk)) != pk:
+            return build_response()
+        return cached_post_response(name, int(pk), self.request, build_response)
+
+    def list(self, request, *args, **kwargs):
+        return post_list_response(
+            request,
+            lambda: add_sideloaded_users(request, super(PostViewSet, self).list(request, *args, **kwargs)),
         )
 
-        return CommentSerializer(
-            comments,
-            many=True,
-            context={
-                "request": request,
-                "depth": 0,
-                "max_depth": 5,
-            },
+    def retrieve(self, request, *args, **kwargs):
+        return self._cached_read(
+            "retrieve",
+            lambda: add_sideloaded_users(request, super(PostViewSet, self).retrieve(request, *args, **kwargs)),
         )
 
+    @action(detail=False, methods=["get"], url_path="search")
+    def search(self, request):
+        """
+        - GET /api/blog/search/?q=django orm            -> posts matching every word (prefixes too)
+        - GET /api/blog/search/?q=django&type=comments  -> comments instead
+
+        Best match first (title words weigh more than body words), keyset pages.
+        """
+        query = search_query(request.query_params.get("q"))
+        if query is None:
+            return Response({"q": ["Enter at least one word."]}, status=status.HTTP_400_BAD_REQUEST)
+
+        kind = request.query_params.get("type", "posts")
+        selection = FieldSelection.from_request(request)
+        with_authors = not sideload_users(request)
+        if kind == "posts":
+            queryset = search(self._get_list_queryset(selection), query)
+            serializer_class = PostSearchSerializer
+        elif kind == "comments":
+            queryset = search(Comment.objects.defer(*selection.deferred("content", "created_at")), query)
+            if with_authors and selection.includes("author"):
+                queryset = queryset.select_related("author")
+            serializer_class = CommentSearchSerializer
+        else:
+            return Response({"type": ['Must be "posts" or "comments".']}, status=status.HTTP_400_BAD_REQUEST)
+
+        paginator = SearchCursorPagination()
+        page = paginator.paginate_queryset(queryset, request, view=self)
+        serializer = serializer_class(page, many=True, context=self.get_serializer_context())
+        return add_sideloaded_users(request, paginator.get_paginated_response(serializer.data))
+
+    # helper methods for comments on this post
+    def _get_post_comments(self, post, request):
+        # Top-level comments paged by cursor; replies loaded in a fixed number of queries
+        return comment_level_response(self, request, Q(post=post, depth=0), depth=0)
+
     def _create_post_comment(self, post, request):
         data = request.data.copy()
         data["post"] = post.id  # always bind to this post
@@ -76,22 +427,13 @@ class PostViewSet(viewsets.ModelViewSet):
             context={"request": request, "post": post},
         )
         serializer.is_valid(raise_exception=True)
-        comment = serializer.save(author=request.user)
-
-        # Get parent comment author id if this is a reply
-        parent_id = data.get("parent") or request.data.get("parent")
-        parent_author_id = None
-        if parent_id:
-            try:
-                parent_comment = Comment.objects.select_related("author").get(id=parent_id)
-                parent_author_id = parent_comment.author.id
-            except Comment.DoesNotExist:
-                parent_author_id = None
-
-        try:
-            send_new_comment_email.delay(post.author.id, parent_author_id, comment.id)
-        except Exception as e:
-            logger.error("Failed to enqueue reaction email task: %s", e)
+
+        with transaction.atomic():
+            comment = serializer.save(author=request.user)
+
+            # Parent comment author if this is a reply (the parent was loaded by validation)
+            parent_author_id = comment.parent.author_id if comment.parent_id else None
+            notify_new_comment(comment, post.author_id, parent_author_id)
 
         return serializer
 
@@ -101,11 +443,10 @@ class PostViewSet(viewsets.ModelViewSet):
         - GET  /api/blog/{post_id}/comments/  -> list top-level comments for this post
         - POST /api/blog/{post_id}/comments/  -> create comment or reply for this post
         """
-        post = self.get_object()
-
         if request.method == "GET":
-            serializer = self._get_post_comments(post, request)
-            return Response(serializer.data)
+            return self._cached_read("comments", lambda: self._get_post_comments(self.get_object(), request))
+
+        post = self.get_object()
 
         # POST
         serializer = self._create_post_comment(post, request)
@@ -113,59 +454,8 @@ class PostViewSet(viewsets.ModelViewSet):
 
     # helper methods for reactions on this post
     def _get_post_reactions(self, post, request):
-        ct = ContentType.objects.get_for_model(Post)
-        reactions = Reaction.objects.filter(content_type=ct, object_id=post.id).select_related("author")
-        return ReactionSerializer(
-            reactions,
-            many=True,
-            context={"request": request},
-        )
-
-    def _create_post_reaction(self, post, request):
-        serializer = ReactionSerializer(
-            data=request.data,
-            context={"request": request},
-        )
-        serializer.is_valid(raise_exception=True)
-
-        new_type = serializer.validated_data["type"]
-        ct = ContentType.objects.get_for_model(Post)
-
-        # 1) Check existing reaction first (to compare types later)
-        existing = Reaction.objects.filter(
-            author=request.user,
-            content_type=ct,
-            object_id=post.id,
-        ).first()
-        old_type = existing.type if existing else None
-
-        # 2) Upsert reaction
-        with transaction.atomic():
-            reaction, created = Reaction.objects.update_or_create(
-                author=request.user,
-                content_type=ct,
-                object_id=post.id,
-                defaults={"type": new_type},
-            )
-
-        # 3) Only send email if:
-        #    - reaction is newly created, OR
-        #    - the type actually changed
-        if created or old_type != reaction.type:
-            try:
-                send_new_reaction_email.delay(
-                    post.author.id,
-                    reaction.type,
-                    "post",
-                    post.id,
-                )
-            except Exception as e:
-                logger.error("Failed to enqueue reaction email task: %s", e)
-
-        return ReactionSerializer(
-            reaction,
-            context={"request": request},
-        )
+        ct = target_content_types()["post"]
+        return reaction_page_response(self, request, ct, post.id)
 
     @action(
         detail=True, methods=["get", "post"], url_path="reactions", permission_classes=[permissions.IsAuthenticated]
@@ -178,11 +468,16 @@ class PostViewSet(viewsets.ModelViewSet):
         post = self.get_object()
 
         if request.method == "GET":
-            serializer = self._get_post_reactions(post, request)
-            return Response(serializer.data)
+            return self._get_post_reactions(post, request)
 
-        serializer = self._create_post_reaction(post, request)
-        return Response(serializer.data, status=status.HTTP_201_CREATED)
+        return reaction_create_response(request, post, "post")
+
+    @action(detail=True, methods=["get"], url_path="reactions/mine", permission_classes=[permissions.IsAuthenticated])
+    def my_reaction(self, request, pk=None):
+        """
+        - GET /api/blog/{post_id}/reactions/mine/  -> your reaction on this post (404 if none)
+        """
+        return own_reaction_response(request, self.get_object())
 
 
 class CommentViewSet(
@@ -199,66 +494,47 @@ class CommentViewSet(
     queryset = Comment.objects.select_related("author", "post", "parent")
     serializer_class = CommentSerializer
     permission_classes = [permissions.IsAuthenticated, IsAuthorOrReadOnly]
+    query_budgets = {
+        "partial_update": 8,
+        "destroy": 9,
+        "replies": 8,
+        "reactions": {"GET": 3, "POST": 5},
+        "my_reaction": 3,
+    }
 
     # Only allow these HTTP methods for this ViewSet
     http_method_names = ["get", "post", "patch", "delete", "head", "options"]
 
-    # helper methods for reactions on this comment
-    def _get_comment_reactions(self, comment, request):
-        ct = ContentType.objects.get_for_model(Comment)
-        reactions = Reaction.objects.filter(content_type=ct, object_id=comment.id).select_related("author")
-        return ReactionSerializer(
-            reactions,
-            many=True,
-            context={"request": request},
-        )
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context["include_reactions"] = include_reactions(self.request)
+        return context
 
-    def _create_comment_reaction(self, comment, request):
-        serializer = ReactionSerializer(
-            data=request.data,
-            context={"request": request},
-        )
-        serializer.is_valid(raise_exception=True)
+    def perform_update(self, serializer):
+        super().perform_update(serializer)
+        # The response renders the comment's reactions (its replies are loaded by the serializer)
+        queryset = comment_queryset(include_reactions(self.request)).select_related("post", "parent")
+        reload_for_response(queryset, serializer)
 
-        new_type = serializer.validated_data["type"]
-        ct = ContentType.objects.get_for_model(Comment)
+    def perform_destroy(self, instance):
+        # The whole subtree as one batch: cascading from the comment would walk its replies level by level
+        Comment.objects.subtree_of(instance).delete()
 
-        # 1) Check existing reaction first to compare types later
-        existing = Reaction.objects.filter(
-            author=request.user,
-            content_type=ct,
-            object_id=comment.id,
-        ).first()
-
-        old_type = existing.type if existing else None
+    # helper methods for reactions on this comment
+    def _get_comment_reactions(self, comment, request):
+        ct = target_content_types()["comment"]
+        return reaction_page_response(self, request, ct, comment.id)
 
-        # 2) Upsert reaction
-        with transaction.atomic():
-            reaction, created = Reaction.objects.update_or_create(
-                author=request.user,
-                content_type=ct,
-                object_id=comment.id,
-                defaults={"type": new_type},
-            )
+    # ---------- /api/blog/comments/{id}/replies/ ----------
 
-        # 3) Only send email if:
-        #    - reaction is newly created, OR
-        #    - the type actually changed
-        if created or old_type != reaction.type:
-            try:
-                send_new_reaction_email.delay(
-                    comment.author.id,
-                    reaction.type,
-                    "comment",
-                    comment.id,
-                )
-            except Exception as e:
-                logger.error("Failed to enqueue reaction email task: %s", e)
-
-        return ReactionSerializer(
-            reaction,
-            context={"request": request},
-        )
+    @action(detail=True, methods=["get"], url_path="replies", permission_classes=[permissions.IsAuthenticated])
+    def replies(self, request, pk=None):
+        """
+        - GET /api/blog/comments/{comment_id}/replies/  -> next page of direct replies
+          (the `replies_next` link of a comment in a thread points here)
+        """
+        comment = self.get_object()
+        return comment_level_response(self, request, Q(parent=comment), depth=comment.depth + 1)
 
     # ---------- /api/blog/comments/{id}/reactions/ ----------
 
@@ -273,12 +549,17 @@ class CommentViewSet(
         comment = self.get_object()
 
         if request.method == "GET":
-            serializer = self._get_comment_reactions(comment, request)
-            return Response(serializer.data)
+            return self._get_comment_reactions(comment, request)
 
         # POST
-        serializer = self._create_comment_reaction(comment, request)
-        return Response(serializer.data, status=status.HTTP_201_CREATED)
+        return reaction_create_response(request, comment, "comment")
+
+    @action(detail=True, methods=["get"], url_path="reactions/mine", permission_classes=[permissions.IsAuthenticated])
+    def my_reaction(self, request, pk=None):
+        """
+        - GET /api/blog/comments/{comment_id}/reactions/mine/  -> your reaction on this comment (404 if none)
+        """
+        return own_reaction_response(request, self.get_object())
 
 
 class ReactionViewSet(
@@ -290,9 +571,107 @@ class ReactionViewSet(
     Only update & delete reaction:
       - PATCH /api/blog/reactions/{id}/   -> update reaction type
       - DELETE /api/blog/reactions/{id}/  -> delete reaction
+      - POST /api/blog/reactions/bulk/    -> set many of your reactions at once
     """
 
-    queryset = Reaction.objects.select_related("author", "content_type")
+    queryset = Reaction.objects.select_related("author")
     serializer_class = ReactionSerializer
     permission_classes = [permissions.IsAuthenticated, IsAuthorOrReadOnly]
-    http_method_names = ["patch", "delete", "head", "options"]
+    http_method_names = ["post", "patch", "delete", "head", "options"]
+    query_budgets = {"partial_update": 5, "destroy": 5, "bulk": 6}
+
+    @action(detail=False, methods=["post"], url_path="bulk")
+    def bulk(self, request):
+        """
+        Body: [{"target_type": "post" | "comment", "target_id": 1, "type": "like"}, ...]
+
+        Targets are checked with one query per target type and all reactions are
+        written together; a later item for the same target wins. Each item gets a
+        result ("created", "updated", "unchanged" or "not_found"), and each author
+        of a reacted-to post or comment gets a single notification.
+        """
+        serializer = BulkReactionItemSerializer(
+            data=request.data,
+            many=True,
+            allow_empty=False,
+            max_length=BULK_REACTIONS_MAX_ITEMS,
+        )
+        serializer.is_valid(raise_exception=True)
+        items = serializer.validated_data
+
+        content_types = target_content_types()
+        target_authors = {}  # (target_type, target_id) -> author id
+        for kind, model in REACTION_TARGET_MODELS.items():
+            ids = {item["target_id"] for item in items if item["target_type"] == kind}
+            if ids:
+                for target_id, author_id in model.objects.filter(pk__in=ids).values_list("pk", "author_id"):
+                    target_authors[kind, target_id] = author_id
+
+        wanted = {
+            (content_types[item["target_type"]].pk, item["target_id"]): item["type"]
+            for item in items
+            if (item["target_type"], item["target_id"]) in target_authors
+        }
+        if write_behind_enabled():
+            buffer = get_reaction_buffer()
+            for content_type_id, object_id in wanted:
+                buffer.discard(request.user.pk, content_type_id, object_id)
+
+        with transaction.atomic():
+            written = bulk_upsert_reactions(request.user, wanted)
+            results = self._bulk_results(items, written, content_types, target_authors)
+
+        return Response({"results": results})
+
+    def _bulk_results(self, items, written, content_types, target_authors):
+        """Per-item statuses; notifies each affected author once (outbox, same transaction)."""
+        results = []
+        notifications = {}  # recipient id -> {(target_type, target_id): type}
+        for item in items:
+            key = (item["target_type"], item["target_id"])
+            if key not in target_authors:
+                results.append({**item, "id": None, "status": "not_found"})
+                continue
+
+            reaction, old_type = written[content_types[item["target_type"]].pk, item["target_id"]]
+            if old_type is None:
+                item_status = "created"
+            elif old_type != reaction.type:
+                item_status = "updated"
+            else:
+                item_status = "unchanged"
+            results.append({**item, "type": reaction.type, "id": reaction.pk, "status": item_status})
+
+            if item_status != "unchanged":
+                notifications.setdefault(target_authors[key], {})[key] = reaction.type
+
+        notify_reactions_by_recipient(
+            {
+                recipient_id: [
+                    [reaction_type, kind, target_id] for (kind, target_id), reaction_type in reactions.items()
+                ]
+                for recipient_id, reactions in notifications.items()
+            }
+        )
+        return results
+
+    def _discard_buffered(self, reaction):
+        # A buffered older click must not overwrite this newer write when it is flushed
+        if write_behind_enabled():
+            get_reaction_buffer().discard(reaction.author_id, reaction.content_type_id, reaction.object_id)
+
+    def perform_update(self, serializer):
+        self._discard_buffered(serializer.instance)
+        with transaction.atomic():
+            old_type = (
+                Reaction.objects.select_for_update().values_list("type", flat=True).get(pk=serializer.instance.pk)
+            )
+            reaction = serializer.save()
+            record_reaction_change(reaction.content_type_id, reaction.object_id, old_type, reaction.type)
+
+    def perform_destroy(self, instance):
+        self._discard_buffered(instance)
+        with transaction.atomic():
+            deleted, _ = Reaction.objects.filter(pk=instance.pk).delete()
+            if deleted:
+                record_reaction_change(instance.content_type_id, instance.object_id, instance.type, None)
@@ -0,0 +1,226 @@
+"""
+Read replicas: `ReplicaRouter` sends the reads of safe-method requests (GET, HEAD,
+OPTIONS) to a Postgres replica listed in `DATABASE_REPLICAS`, everything else to the
+primary (`default`).
+
+Reads stay on the primary when staleness would show:
+  - in unsafe-method requests, and for the rest of a request once it wrote;
+  - inside `transaction.atomic()` on the primary;
+  - for `DATABASE_REPLICA_STICKY_SECONDS` after a user's write (read-your-writes:
+    the user is pinned to the primary across requests, through the cache);
+  - when no replica is within `DATABASE_REPLICA_MAX_LAG` seconds of the primary.
+
+Outside requests (Celery tasks, commands), reads go to the primary unless the
+code says otherwise with `reads_from(REPLICA)` (or a database alias).
+"""
+
+import asyncio
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+from django.utils.decorators import sync_and_async_middleware
+from django.utils.functional import SimpleLazyObject, empty
+
+PRIMARY = DEFAULT_DB_ALIAS
+# Any replica within the lag threshold (the primary if none is)
+REPLICA = "replica"
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+PINNED_KEY = "db:pinned:user:{user_id}"
+
+# Seconds the replica is behind the primary (0 on a primary or a caught-up replica)
+REPLICA_LAG_SQL = """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+"""
+
+
+class _Routing:
+    """Where the reads of the current request or `reads_from` block go."""
+
+    def __init__(self, target, request=None):
+        self.target = target
+        self.request = request
+        self.wrote = False
+        self.pinned = None  # unknown until the request's user is
+
+
+_routing = ContextVar("db_routing", default=None)
+
+# {alias: (monotonic time of the check, usable)}, per process
+_replica_checks = {}
+
+
+def replica_lag(alias):
+    with connections[alias].cursor() as cursor:
+        cursor.execute(REPLICA_LAG_SQL)
+        return float(cursor.fetchone()[0])
+
+
+def _in_event_loop():
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+def _check_is_due(alias):
+    checked_at = _replica_checks.get(alias, (None, False))[0]
+    return checked_at is None or time.monotonic() - checked_at >= settings.DATABASE_REPLICA_LAG_CHECK_INTERVAL
+
+
+def check_replica(alias):
+    try:
+        usable = replica_lag(alias) <= settings.DATABASE_REPLICA_MAX_LAG
+    except DatabaseError:
+        usable = False
+    _replica_checks[alias] = (time.monotonic(), usable)
+
+
+def refresh_replica_checks():
+    for alias in settings.DATABASE_REPLICAS:
+        if _check_is_due(alias):
+            check_replica(alias)
+
+
+def replica_is_usable(alias):
+    """
+    Whether `alias` lagged at most `DATABASE_REPLICA_MAX_LAG` seconds when last checked
+    (at most `DATABASE_REPLICA_LAG_CHECK_INTERVAL` seconds ago). An unreachable replica is
+    unusable. In an event loop nothing is queried: async requests are checked by the middleware.
+    """
+    if _check_is_due(alias) and not _in_event_loop():
+        check_replica(alias)
+    return _replica_checks.get(alias, (None, False))[1]
+
+
+def choose_replica():
+    """A random usable replica, or the primary when there is none."""
+    usable = [alias for alias in settings.DATABASE_REPLICAS if replica_is_usable(alias)]
+    return random.choice(usable) if usable else PRIMARY
+
+
+@contextmanager
+def reads_from(target):
+    """
+    Send the reads of the block (or decorated function) to `target`: `PRIMARY`,
+    `REPLICA`, or a database alias. Writes always go to the primary.
+    """
+    token = _routing.set(_Routing(target))
+    try:
+        yield
+    finally:
+        _routing.reset(token)
+
+
+def pin_to_primary(user_id):
+    """Read `user_id`'s requests from the primary for `DATABASE_REPLICA_STICKY_SECONDS`."""
+    cache.set(PINNED_KEY.format(user_id=user_id), True, timeout=settings.DATABASE_REPLICA_STICKY_SECONDS)
+
+
+def _resolved_user(request):
+    # The request's user if already known: never load it from here (the router runs inside queries)
+    user = getattr(request, "user", None)
+    if isinstance(user, SimpleLazyObject) and user._wrapped is empty:
+        return None
+    return user if user is not None and user.is_authenticated else None
+
+
+def _is_pinned(routing):
+    if routing.pinned is None:
+        user = _resolved_user(routing.request)
+        if user is None:
+            return False  # asked again once authentication has run
+        # One small cache read per request, also from async views (no thread hop for it)
+        routing.pinned = bool(cache.get(PINNED_KEY.format(user_id=user.pk)))
+    return routing.pinned
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        routing = _routing.get()
+        if routing is None:
+            return PRIMARY
+        if routing.target != REPLICA:
+            return routing.target
+        if routing.wrote or connections[PRIMARY].in_atomic_block or _is_pinned(routing):
+            return PRIMARY
+        return choose_replica()
+
+    def db_for_write(self, model, **hints):
+        routing = _routing.get()
+        if routing is not None:
+            routing.wrote = True
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the primary's rows
+        databases = {PRIMARY, *settings.DATABASE_REPLICAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas get the schema through replication
+        return False if db in settings.DATABASE_REPLICAS else None
+
+
+def _start(request):
+    target = REPLICA if request.method in SAFE_METHODS else PRIMARY
+    routing = _Routing(target, request)
+    return routing, _routing.set(routing)
+
+
+def _user_to_pin(request, routing):
+    if routing.target == REPLICA and not routing.wrote:
+        return None
+    user = _resolved_user(request)
+    return user.pk if user is not None else None
+
+
+@sync_and_async_middleware
+def replica_routing_middleware(get_response):
+    """
+    Route the request's reads (see the module docstring); after a request that wrote
+    (or could have: any unsafe method), pin its user to the primary.
+    """
+    if iscoroutinefunction(get_response):
+
+        async def middleware(request):
+            if any(_check_is_due(alias) for alias in settings.DATABASE_REPLICAS):
+                await sync_to_async(refresh_replica_checks)()
+            routing, token = _start(request)
+            try:
+                response = await get_response(request)
+            finally:
+                _routing.reset(token)
+            user_id = _user_to_pin(request, routing)
+            if user_id is not None:
+                await sync_to_async(pin_to_primary)(user_id)
+            return response
+
+    else:
+
+        def middleware(request):
+            routing, token = _start(request)
+            try:
+                response = get_response(request)
+            finally:
+                _routing.reset(token)
+            user_id = _user_to_pin(request, routing)
+            if user_id is not None:
+                pin_to_primary(user_id)
+            return response
+
+    return middleware
@@ -0,0 +1,12 @@
+"""
+Connection pooling for PostgreSQL with psycopg2 (`DATABASE_POOL=true`): use
+`"ENGINE": "apps.core.postgresql_pool"` with a `"POOL"` entry in the database settings.
+"""
+
+
+def pool_stats(alias="default"):
+    """`ConnectionPool.stats()` of this process's pool for `alias`, or None when it is not pooled."""
+    from django.db import connections
+
+    pool = getattr(connections[alias], "pool", None)
+    return pool.stats() if pool is not None else None
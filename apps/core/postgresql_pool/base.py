@@ -0,0 +1,58 @@
+import os
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.base.base import NO_DB_ALIAS
+from django.db.backends.postgresql import base
+
+from .pool import ConnectionPool
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """
+    Django's PostgreSQL backend with connections from a `ConnectionPool` per database
+    and process, configured by `settings_dict["POOL"]` (the keyword arguments of the
+    pool). Django still "opens" a connection per request or task and "closes" it at the
+    end (`CONN_MAX_AGE = 0`): that takes one from the pool and gives it back.
+
+    Django's own `OPTIONS["pool"]` needs psycopg 3; this works with psycopg2.
+    """
+
+    _connection_pools = {}
+
+    @property
+    def pool(self):
+        options = self.settings_dict.get("POOL")
+        if self.alias == NO_DB_ALIAS or not options:
+            return None
+        if self.settings_dict["CONN_MAX_AGE"] != 0:
+            raise ImproperlyConfigured("Pooling doesn't support persistent connections.")
+
+        params = self.get_connection_params()
+        pool = self._connection_pools.get(self.alias)
+        # A forked child (Celery prefork, gunicorn) must not share its parent's sockets, and
+        # tests switch NAME to the test database: both get a pool of their own.
+        if pool is None or pool.pid != os.getpid() or pool.params != params:
+            pool = ConnectionPool(lambda: self._connect_for_pool(params), params=params, **options)
+            self._connection_pools[self.alias] = pool
+        return pool
+
+    def close_pool(self):
+        pool = self._connection_pools.pop(self.alias, None)
+        if pool is not None and pool.pid == os.getpid():
+            pool.close()
+
+    def _connect_for_pool(self, params):
+        connection = self.Database.connect(**params)
+        # Session settings once per connection: a checkout only sets what Django's `connect()` does
+        connection.autocommit = True
+        self._configure_connection(connection)
+        return connection
+
+    def _close(self):
+        if self.connection is not None:
+            with self.wrap_database_errors:
+                if self.pool:
+                    self.pool.putconn(self.connection)
+                    self.connection = None
+                else:
+                    return self.connection.close()
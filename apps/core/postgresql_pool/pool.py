@@ -0,0 +1,185 @@
+import os
+import threading
+import time
+
+import psycopg2
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE
+
+COUNTERS = ("checkouts", "waits", "timeouts", "connections_created", "connections_closed", "health_check_failures")
+
+
+class PoolTimeout(psycopg2.OperationalError):
+    """No connection became free within the pool's timeout (an `OperationalError` for Django)."""
+
+
+class ConnectionPool:
+    """
+    A thread-safe pool of psycopg2 connections for one database in one process.
+
+    At most `max_size` connections are open; `getconn()` waits up to `timeout`
+    seconds for one to be returned when all are in use. Connections idle for
+    `check_after` seconds or more are checked with `SELECT 1` before reuse, and
+    connections older than `max_lifetime` seconds are closed instead of reused.
+    Connections are opened lazily by `connect()`.
+    """
+
+    def __init__(self, connect, max_size, timeout, max_lifetime, check_after, params=None):
+        self.connect = connect
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_lifetime = max_lifetime
+        self.check_after = check_after
+        self.params = params  # what the connections were opened with (see `DatabaseWrapper.pool`)
+        self.pid = os.getpid()
+
+        self._cond = threading.Condition()
+        self._idle = []  # (connection, created_at, returned_at); the most recently returned last
+        self._in_use = {}  # id(connection) -> created_at
+        self._opening = 0
+        self._waiting = 0
+        self._closed = False
+        self._counters = dict.fromkeys(COUNTERS, 0)
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    def open(self):
+        # psycopg_pool's API, which Django's backend calls: connections are opened on demand
+        pass
+
+    def getconn(self):
+        started = time.monotonic()
+        while True:
+            with self._cond:
+                connection, returned_at = self._take(started + self.timeout)
+            if connection is None:
+                connection = self._open()
+                break
+            if time.monotonic() - returned_at < self.check_after or self._is_alive(connection):
+                break
+            with self._cond:
+                self._counters["health_check_failures"] += 1
+                self._in_use.pop(id(connection))
+                self._close(connection)
+                self._cond.notify()
+
+        waited = time.monotonic() - started
+        with self._cond:
+            self._counters["checkouts"] += 1
+            self._wait_total += waited
+            self._wait_max = max(self._wait_max, waited)
+        return connection
+
+    def putconn(self, connection):
+        with self._cond:
+            created_at = self._in_use.pop(id(connection), None)
+        if created_at is None:
+            # Not from this pool (it was replaced or closed meanwhile)
+            connection.close()
+            return
+
+        reusable = not connection.closed and not self._expired(created_at)
+        if reusable and connection.info.transaction_status != TRANSACTION_STATUS_IDLE:
+            try:
+                connection.rollback()
+            except psycopg2.Error:
+                reusable = False
+
+        with self._cond:
+            if reusable and not self._closed:
+                self._idle.append((connection, created_at, time.monotonic()))
+            else:
+                self._close(connection)
+            self._cond.notify()
+
+    def close(self):
+        """Close the idle connections now and the ones in use when they are returned."""
+        with self._cond:
+            self._closed = True
+            for connection, _, _ in self._idle:
+                self._close(connection)
+            self._idle.clear()
+            self._cond.notify_all()
+
+    def stats(self):
+        """
+        Current connections (`in_use`, `idle`, `opening`) and requests waiting for one,
+        plus counters since the pool was created. `wait_ms_*` is the time `getconn()`
+        took: waiting for a free connection, opening or health-checking one.
+        """
+        with self._cond:
+            checkouts = self._counters["checkouts"]
+            return {
+                "max_size": self.max_size,
+                "in_use": len(self._in_use),
+                "idle": len(self._idle),
+                "opening": self._opening,
+                "waiting": self._waiting,
+                **self._counters,
+                "wait_ms_avg": round(self._wait_total * 1000 / checkouts, 3) if checkouts else 0.0,
+                "wait_ms_max": round(self._wait_max * 1000, 3),
+            }
+
+    def _take(self, deadline):
+        # Under the lock: (idle connection, when it was returned), or (None, None) to open one
+        waited = False
+        while True:
+            if self._closed:
+                raise psycopg2.OperationalError("The connection pool is closed.")
+            while self._idle:
+                connection, created_at, returned_at = self._idle.pop()
+                if connection.closed or self._expired(created_at):
+                    self._close(connection)
+                    continue
+                self._in_use[id(connection)] = created_at
+                return connection, returned_at
+            if len(self._in_use) + self._opening < self.max_size:
+                self._opening += 1
+                return None, None
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                self._counters["timeouts"] += 1
+                raise PoolTimeout(f"No database connection became free within {self.timeout}s.")
+            if not waited:
+                self._counters["waits"] += 1
+                waited = True
+            self._waiting += 1
+            try:
+                self._cond.wait(remaining)
+            finally:
+                self._waiting -= 1
+
+    def _open(self):
+        try:
+            connection = self.connect()
+        except BaseException:
+            with self._cond:
+                self._opening -= 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self._opening -= 1
+            self._in_use[id(connection)] = time.monotonic()
+            self._counters["connections_created"] += 1
+        return connection
+
+    def _expired(self, created_at):
+        return self.max_lifetime is not None and time.monotonic() - created_at >= self.max_lifetime
+
+    def _close(self, connection):
+        self._counters["connections_closed"] += 1
+        try:
+            connection.close()
+        except psycopg2.Error:
+            pass
+
+    @staticmethod
+    def _is_alive(connection):
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            if not connection.autocommit:
+                connection.rollback()
+        except psycopg2.Error:
+            return False
+        return True
@@ -0,0 +1,148 @@
+"""
+Query budgets: the most SQL queries a view may run for one request, whatever the
+size of the data behind it. Declared next to the views:
+
+  - DRF viewsets: `query_budgets = {"list": 4, "comments": {"GET": 6, "POST": 12}}`
+    (action -> budget, or action -> {method: budget})
+  - function views: `@query_budget(4)`
+
+`apps.core.tests.query_budgets.QueryBudgetTestCase` enforces them in tests (against
+small and large fixtures); `query_budget_middleware` (`QUERY_BUDGET_LOGGING=true`,
+e.g. in staging) logs the requests that exceed theirs, with their SQL grouped by shape.
+"""
+
+import logging
+import re
+from collections import Counter
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.db import connections
+from django.utils.decorators import sync_and_async_middleware
+
+logger = logging.getLogger(__name__)
+
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+_LIST_RE = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_LISTS_RE = re.compile(r"\(\.\.\.\)(?:\s*,\s*\(\.\.\.\))+")
+_SPACE_RE = re.compile(r"\s+")
+# Savepoints of nested `atomic()` blocks: tests nest every block, production does not
+_SAVEPOINT_RE = re.compile(r"^\s*(?:SAVEPOINT|RELEASE SAVEPOINT|ROLLBACK TO SAVEPOINT)\b", re.IGNORECASE)
+
+
+def query_budget(limit):
+    """Declare the query budget of a function view (an int, or {method: int})."""
+
+    def decorator(view):
+        view.query_budget = limit
+        return view
+
+    return decorator
+
+
+def budget_for(view, method):
+    """The query budget of the resolved `view` function for `method`, or None if it declares none."""
+    method = method.upper()
+    actions = getattr(view, "actions", None)
+    if actions is not None:
+        # A DRF viewset: `as_view()` keeps the class and the {method: action} mapping
+        action = actions.get(method.lower()) or (actions.get("get") if method == "HEAD" else None)
+        budget = getattr(view.cls, "query_budgets", {}).get(action)
+    else:
+        budget = getattr(view, "query_budget", None)
+    if isinstance(budget, dict):
+        budget = budget.get(method) or (budget.get("GET") if method == "HEAD" else None)
+    return budget
+
+
+def counted_queries(queries):
+    """The statements of `queries` (SQL strings) that count against a budget: all but savepoints."""
+    return [sql for sql in queries if not _SAVEPOINT_RE.match(sql)]
+
+
+def sql_shape(sql):
+    """`sql` with its values replaced by `?` and value lists by `(...)`: one shape per statement kind."""
+    shape = _STRING_RE.sub("?", sql).replace("%s", "?")
+    shape = _NUMBER_RE.sub("?", shape)
+    shape = _LISTS_RE.sub("(...)", _LIST_RE.sub("(...)", shape))
+    return _SPACE_RE.sub(" ", shape).strip()
+
+
+def group_by_shape(queries):
+    """[(shape, count)] of `queries` (SQL strings), the most repeated first."""
+    return Counter(sql_shape(sql) for sql in queries).most_common()
+
+
+def format_shapes(queries):
+    return "\n".join(f"{count:>5} x {shape}" for shape, count in group_by_shape(queries))
+
+
+class QueryRecorder:
+    """Records the SQL run on every database connection of the current thread between `start()` and `stop()`."""
+
+    def __init__(self):
+        self.queries = []
+        self._connections = []
+
+    def __call__(self, execute, sql, params, many, context):
+        self.queries.append(sql)
+        return execute(sql, params, many, context)
+
+    def start(self):
+        self._connections = list(connections.all())
+        for connection in self._connections:
+            connection.execute_wrappers.append(self)
+
+    def stop(self):
+        for connection in self._connections:
+            connection.execute_wrappers.remove(self)
+        self._connections = []
+
+
+def check_budget(request, queries):
+    """Log a warning if the request's view ran more `queries` than its budget."""
+    queries = counted_queries(queries)
+    match = getattr(request, "resolver_match", None)
+    budget = budget_for(match.func, request.method) if match is not None else None
+    if budget is None or len(queries) <= budget:
+        return
+    logger.warning(
+        "%s %s (%s) ran %d queries, over its budget of %d:\n%s",
+        request.method,
+        request.path,
+        match.view_name,
+        len(queries),
+        budget,
+        format_shapes(queries),
+    )
+
+
+@sync_and_async_middleware
+def query_budget_middleware(get_response):
+    """Count the queries of each request and report the views over their budget (see `check_budget`)."""
+    if iscoroutinefunction(get_response):
+
+        async def middleware(request):
+            # The async ORM runs queries in the request's thread-sensitive thread, on its connections
+            recorder = QueryRecorder()
+            await sync_to_async(recorder.start)()
+            try:
+                response = await get_response(request)
+            finally:
+                await sync_to_async(recorder.stop)()
+            check_budget(request, recorder.queries)
+            return response
+
+    else:
+
+        def middleware(request):
+            recorder = QueryRecorder()
+            recorder.start()
+            try:
+                response = get_response(request)
+            finally:
+                recorder.stop()
+            check_budget(request, recorder.queries)
+            return response
+
+    return middleware
@@ -0,0 +1,166 @@
+from rest_framework.permissions import SAFE_METHODS
+
+
+def parse_field_paths(value):
+    """
+    "id,author.username" -> {"id": None, "author": {"username": None}}
+    A `None` leaf selects the whole field; a less specific path wins over a more specific one.
+    """
+    tree = {}
+    for path in (value or "").split(","):
+        parts = [part for part in path.strip().split(".") if part]
+        if not parts:
+            continue
+
+        node = tree
+        for part in parts[:-1]:
+            if part in node and node[part] is None:
+                break  # whole field already selected
+            node = node.setdefault(part, {})
+        else:
+            node[parts[-1]] = None
+    return tree
+
+
+def _union_fields(a, b):
+    # `None` = no restriction
+    if a is None or b is None:
+        return None
+    merged = dict(a)
+    for name, sub in b.items():
+        merged[name] = _union_fields(merged[name], sub) if name in merged else sub
+    return merged
+
+
+def _intersect_omit(a, b):
+    # a `None` value omits the whole field, a dict omits only inside it
+    common = {}
+    for name in a.keys() & b.keys():
+        if a[name] is None:
+            common[name] = b[name]
+        elif b[name] is None:
+            common[name] = a[name]
+        else:
+            sub = _intersect_omit(a[name], b[name])
+            if sub:
+                common[name] = sub
+    return common
+
+
+def _union_expand(a, b):
+    # a `None` value expands the field itself, a dict also expands inside it
+    merged = dict(a)
+    for name, sub in b.items():
+        current = merged.get(name)
+        if current is None:
+            merged[name] = sub
+        elif sub is not None:
+            merged[name] = _union_expand(current, sub)
+    return merged
+
+
+class FieldSelection:
+    """
+    Which fields a client asked for, relative to one serializer:
+
+      ?fields=id,title,author.username   -> only these (dotted paths select nested fields)
+      ?omit=content,author.email         -> everything but these
+      ?expand=content                    -> also render fields listed in `Meta.expandable_fields`
+
+    Used by `SparseFieldsMixin` to drop fields, and by views to skip the joins,
+    prefetches and columns that only unrequested fields need.
+    """
+
+    def __init__(self, fields=None, omit=None, expand=None):
+        self.fields = fields
+        self.omit = omit or {}
+        self.expand = expand or {}
+
+    @classmethod
+    def from_request(cls, request):
+        # Writes always validate and return the full representation
+        if request is None or request.method not in SAFE_METHODS:
+            return cls()
+        params = request.query_params
+        return cls(
+            fields=parse_field_paths(params["fields"]) if params.get("fields") else None,
+            omit=parse_field_paths(params.get("omit")),
+            expand=parse_field_paths(params.get("expand")),
+        )
+
+    def includes(self, name, expandable=False):
+        if self.fields is not None and name not in self.fields:
+            return False
+        if name in self.omit and self.omit[name] is None:
+            return False
+        if expandable:
+            return name in self.expand or self.fields is not None
+        return True
+
+    def child(self, name):
+        """Selection for the nested serializer rendered under `name`."""
+        return FieldSelection(
+            fields=None if self.fields is None else self.fields.get(name),
+            omit=self.omit.get(name),
+            expand=self.expand.get(name),
+        )
+
+    def union(self, other):
+        """Everything either selection needs (for one queryset serving several levels)."""
+        return FieldSelection(
+            fields=_union_fields(self.fields, other.fields),
+            omit=_intersect_omit(self.omit, other.omit),
+            expand=_union_expand(self.expand, other.expand),
+        )
+
+    def descendants(self, name, levels):
+        """
+        Union of the selections of a recursive field (e.g. `replies`) over
+        `levels` nesting levels, or None if the field is not requested at all.
+        """
+        if not self.includes(name):
+            return None
+        level = merged = self.child(name)
+        for _ in range(levels - 1):
+            if not level.includes(name):
+                break
+            level = level.child(name)
+            merged = merged.union(level)
+        return merged
+
+    def deferred(self, *names):
+        """The model columns among `names` that no requested field needs."""
+        return [name for name in names if not self.includes(name)]
+
+
+class SparseFieldsMixin:
+    """
+    Drops the fields the client did not ask for (see `FieldSelection`).
+
+    The root serializer reads `field_selection` from its context; nested
+    serializers narrow it down by their field name. Fields in
+    `Meta.expandable_fields` are only rendered when expanded (or listed in `?fields=`).
+    """
+
+    def get_fields(self):
+        fields = super().get_fields()
+        selection = self.field_selection
+        expandable = getattr(self.Meta, "expandable_fields", ())
+        for name in list(fields):
+            if not selection.includes(name, expandable=name in expandable):
+                fields.pop(name)
+        return fields
+
+    @property
+    def field_selection(self):
+        path = []
+        node = self
+        while node.parent is not None:
+            if node.field_name:  # the child of a ListSerializer has no name of its own
+                path.append(node.field_name)
+            node = node.parent
+
+        selection = node.context.get("field_selection") or FieldSelection()
+        for name in reversed(path):
+            selection = selection.child(name)
+        return selection
@@ -0,0 +1,58 @@
+from urllib.parse import urlsplit
+
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve
+
+from apps.core.query_budget import budget_for, counted_queries, format_shapes
+
+
+class QueryBudgetTestCase(TestCase):
+    """
+    Checks views against their declared query budgets (see `apps.core.query_budget`).
+
+    Subclasses implement `seed(size)`: create fixtures with `size` items of everything
+    the endpoints under test list (posts, comments, replies, reactions...) and return
+    what their URLs need. `assertWithinQueryBudget` runs the same request on the
+    `SMALL` and the `LARGE` seed, each rolled back afterwards, and fails if the
+    query count grows with the data (an N+1) or exceeds the view's budget.
+    """
+
+    SMALL = 2
+    LARGE = 10
+
+    def seed(self, size):
+        raise NotImplementedError
+
+    def request(self, method, url, data=None):
+        return getattr(self.client, method.lower())(url, data)
+
+    def _count_queries(self, size, method, url, data):
+        with transaction.atomic():
+            seeded = self.seed(size)
+            path = url(seeded) if callable(url) else url
+            payload = data(seeded) if callable(data) else data
+            cache.clear()  # every request runs its queries, no cached response
+            with CaptureQueriesContext(connection) as queries:
+                response = self.request(method, path, payload)
+            self.assertLess(response.status_code, 400, f"{method} {path}: {response.status_code}")
+            transaction.set_rollback(True)
+        return path, counted_queries(query["sql"] for query in queries.captured_queries)
+
+    def assertWithinQueryBudget(self, method, url, data=None):
+        """`url` and `data` may be callables taking what `seed()` returned."""
+        path, small = self._count_queries(self.SMALL, method, url, data)
+        _, large = self._count_queries(self.LARGE, method, url, data)
+
+        if len(large) > len(small):
+            self.fail(
+                f"{method} {path}: queries grow with the data ({len(small)} for {self.SMALL} items, "
+                f"{len(large)} for {self.LARGE}):\n{format_shapes(large)}"
+            )
+        budget = budget_for(resolve(urlsplit(path).path).func, method)
+        self.assertIsNotNone(budget, f"{method} {path} declares no query budget (it ran {len(large)} queries)")
+        if len(large) > budget:
+            self.fail(f"{method} {path}: {len(large)} queries, over the budget of {budget}:\n{format_shapes(large)}")
+        return len(large)
@@ -0,0 +1,127 @@
+from unittest import mock
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.db import DatabaseError, connections
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from apps.blog.models import Post
+from apps.blog.tests.factories import PostFactory, UserFactory
+from apps.core import db
+from apps.core.db import PINNED_KEY, PRIMARY, REPLICA, ReplicaRouter, reads_from, replica_routing_middleware
+
+router = ReplicaRouter()
+
+
+class _User:
+    is_authenticated = True
+
+    def __init__(self, pk):
+        self.pk = pk
+
+
+@override_settings(DATABASE_REPLICAS=["replica_1"], DATABASE_REPLICA_MAX_LAG=5, DATABASE_REPLICA_LAG_CHECK_INTERVAL=60)
+class ReplicaRouterTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        for patcher in (mock.patch.dict(db._replica_checks, clear=True), mock.patch.object(db, "replica_lag")):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        db.replica_lag.return_value = 0.5
+
+    def _request(self, method="get", user=None, write=False):
+        """Run a request through the middleware; the database its view read from."""
+        request = getattr(RequestFactory(), method)("/")
+        request.user = user or AnonymousUser()
+        used = []
+
+        def view(request):
+            if write:
+                router.db_for_write(Post)
+            used.append(router.db_for_read(Post))
+            return None
+
+        replica_routing_middleware(view)(request)
+        return used[0]
+
+    def test_safe_requests_read_from_a_replica(self):
+        self.assertEqual(self._request(), "replica_1")
+        self.assertEqual(router.db_for_write(Post), PRIMARY)
+
+    def test_unsafe_requests_and_writes_read_from_the_primary(self):
+        self.assertEqual(self._request("post"), PRIMARY)
+        self.assertEqual(self._request(write=True), PRIMARY)
+        with mock.patch.object(connections[PRIMARY], "in_atomic_block", True):
+            self.assertEqual(self._request(), PRIMARY)
+
+    def test_writer_is_pinned_to_the_primary(self):
+        writer, other = _User(1), _User(2)
+        self._request("post", user=writer)
+        self.assertEqual(self._request(user=writer), PRIMARY)
+        self.assertEqual(self._request(user=other), "replica_1")
+
+        self._request(user=other, write=True)  # a GET that wrote pins too
+        self.assertEqual(self._request(user=other), PRIMARY)
+
+        cache.delete(PINNED_KEY.format(user_id=writer.pk))  # the window expired
+        self.assertEqual(self._request(user=writer), "replica_1")
+
+    def test_lagging_or_unreachable_replicas_are_skipped(self):
+        db.replica_lag.return_value = 30
+        self.assertEqual(self._request(), PRIMARY)
+
+        db._replica_checks.clear()
+        db.replica_lag.side_effect = DatabaseError("connection refused")
+        self.assertEqual(self._request(), PRIMARY)
+
+    async def test_async_requests_check_lag_outside_the_event_loop(self):
+        used = []
+
+        async def view(request):
+            used.append(router.db_for_read(Post))  # as `aiterator()` does, in the event loop
+
+        request = RequestFactory().get("/")
+        request.user = AnonymousUser()
+        await replica_routing_middleware(view)(request)
+        self.assertEqual(used, ["replica_1"])
+        db.replica_lag.assert_called_once_with("replica_1")
+
+    def test_lag_is_checked_once_per_interval(self):
+        for _ in range(3):
+            self._request()
+        db.replica_lag.assert_called_once_with("replica_1")
+
+    def test_outside_requests_reads_from_the_primary_unless_told_otherwise(self):
+        self.assertEqual(router.db_for_read(Post), PRIMARY)
+        with reads_from(REPLICA):
+            self.assertEqual(router.db_for_read(Post), "replica_1")
+            with reads_from(PRIMARY):
+                self.assertEqual(router.db_for_read(Post), PRIMARY)
+        with reads_from("replica_2"):
+            self.assertEqual(router.db_for_read(Post), "replica_2")
+
+    def test_replicas_are_never_migrated(self):
+        self.assertFalse(router.allow_migrate("replica_1", "blog"))
+        self.assertIsNone(router.allow_migrate(PRIMARY, "blog"))
+
+
+class ReplicaRoutingIntegrationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_api_writes_pin_the_user(self):
+        user = UserFactory()
+        client = APIClient()
+        client.force_authenticate(user)
+        post = PostFactory(author=user)
+
+        client.get(reverse("post-detail", kwargs={"pk": post.id}))
+        self.assertIsNone(cache.get(PINNED_KEY.format(user_id=user.id)))
+
+        client.post(reverse("post-reactions", kwargs={"pk": post.id}), {"type": "like"})
+        self.assertTrue(cache.get(PINNED_KEY.format(user_id=user.id)))
+
+    def test_lag_query(self):
+        self.assertEqual(db.replica_lag(PRIMARY), 0)
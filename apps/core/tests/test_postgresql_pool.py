@@ -0,0 +1,135 @@
+import threading
+import time
+from unittest import mock
+
+import psycopg2
+from django.db import connections
+from django.db.utils import load_backend
+from django.test import SimpleTestCase, TestCase
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE, TRANSACTION_STATUS_INTRANS
+
+from apps.core.postgresql_pool import pool_stats
+from apps.core.postgresql_pool.pool import ConnectionPool, PoolTimeout
+
+
+class _Connection:
+    """What the pool uses of a psycopg2 connection."""
+
+    def __init__(self, alive=True):
+        self.closed = False
+        self.alive = alive
+        self.autocommit = True
+        self.info = mock.Mock(transaction_status=TRANSACTION_STATUS_IDLE)
+        self.rollback = mock.Mock()
+
+    def cursor(self):
+        if not self.alive:
+            raise psycopg2.OperationalError("server closed the connection unexpectedly")
+        return mock.MagicMock()
+
+    def close(self):
+        self.closed = True
+
+
+def _pool(**options):
+    return ConnectionPool(
+        _Connection, **{"max_size": 2, "timeout": 1, "max_lifetime": None, "check_after": 60, **options}
+    )
+
+
+class ConnectionPoolTests(SimpleTestCase):
+    def test_connections_are_reused(self):
+        pool = _pool()
+        first = pool.getconn()
+        self.assertEqual((pool.stats()["in_use"], pool.stats()["idle"]), (1, 0))
+        pool.putconn(first)
+        self.assertIs(pool.getconn(), first)
+
+        stats = pool.stats()
+        self.assertEqual((stats["in_use"], stats["idle"]), (1, 0))
+        self.assertEqual((stats["checkouts"], stats["connections_created"]), (2, 1))
+
+    def test_waits_for_a_returned_connection(self):
+        pool = _pool(max_size=1)
+        connection = pool.getconn()
+        threading.Timer(0.05, pool.putconn, [connection]).start()
+
+        self.assertIs(pool.getconn(), connection)
+        stats = pool.stats()
+        self.assertEqual((stats["waits"], stats["connections_created"]), (1, 1))
+        self.assertGreaterEqual(stats["wait_ms_max"], 40)
+
+    def test_times_out_when_exhausted(self):
+        pool = _pool(max_size=1, timeout=0.01)
+        pool.getconn()
+        with self.assertRaises(PoolTimeout):
+            pool.getconn()
+        self.assertEqual(pool.stats()["timeouts"], 1)
+
+    def test_idle_connections_are_health_checked(self):
+        pool = _pool(check_after=0)
+        broken = pool.getconn()
+        pool.putconn(broken)
+        broken.alive = False
+
+        replacement = pool.getconn()
+        self.assertIsNot(replacement, broken)
+        self.assertTrue(broken.closed)
+        stats = pool.stats()
+        self.assertEqual((stats["health_check_failures"], stats["connections_created"]), (1, 2))
+
+    def test_old_connections_are_replaced(self):
+        pool = _pool(max_lifetime=0.01)
+        old = pool.getconn()
+        time.sleep(0.02)
+        pool.putconn(old)
+        self.assertTrue(old.closed)
+        self.assertIsNot(pool.getconn(), old)
+
+    def test_returned_transactions_are_rolled_back(self):
+        pool = _pool()
+        connection = pool.getconn()
+        connection.info.transaction_status = TRANSACTION_STATUS_INTRANS
+        pool.putconn(connection)
+        connection.rollback.assert_called_once()
+        self.assertEqual(pool.stats()["idle"], 1)
+
+        connection = pool.getconn()
+        connection.rollback.side_effect = psycopg2.InterfaceError("connection already closed")
+        pool.putconn(connection)
+        self.assertEqual((pool.stats()["idle"], pool.stats()["connections_closed"]), (0, 1))
+
+    def test_close(self):
+        pool = _pool()
+        idle, in_use = pool.getconn(), pool.getconn()
+        pool.putconn(idle)
+        pool.close()
+        self.assertTrue(idle.closed)
+        pool.putconn(in_use)
+        self.assertTrue(in_use.closed)
+        with self.assertRaises(psycopg2.OperationalError):
+            pool.getconn()
+
+
+class PooledBackendTests(TestCase):
+    def test_django_connections_come_from_the_pool(self):
+        settings_dict = {
+            **connections["default"].settings_dict,
+            "ENGINE": "apps.core.postgresql_pool",
+            "POOL": {"max_size": 2, "timeout": 1, "max_lifetime": None, "check_after": 60},
+        }
+        # A second wrapper for the test database (the real `default` is not pooled)
+        wrapper = load_backend(settings_dict["ENGINE"]).DatabaseWrapper(settings_dict, "default")
+        self.addCleanup(wrapper.close_pool)
+
+        for _ in range(3):
+            with wrapper.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            wrapper.close()  # what Django does at the end of each request or task
+
+        stats = wrapper.pool.stats()
+        self.assertEqual((stats["checkouts"], stats["connections_created"]), (3, 1))
+        self.assertEqual((stats["in_use"], stats["idle"]), (0, 1))
+
+    def test_unpooled_database_has_no_stats(self):
+        self.assertIsNone(pool_stats("default"))
@@ -0,0 +1,80 @@
+from asgiref.sync import async_to_sync, sync_to_async
+from django.contrib.auth import get_user_model
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase
+from django.urls import ResolverMatch, resolve
+
+from apps.core.query_budget import budget_for, group_by_shape, query_budget, query_budget_middleware, sql_shape
+
+
+@query_budget(1)
+def _view(request):
+    return HttpResponse()
+
+
+class SqlShapeTests(SimpleTestCase):
+    def test_values_are_replaced(self):
+        self.assertEqual(
+            sql_shape("SELECT * FROM blog_post WHERE id = 12 AND title = 'It''s'  LIMIT 21"),
+            "SELECT * FROM blog_post WHERE id = ? AND title = ? LIMIT ?",
+        )
+
+    def test_same_statement_with_other_values_is_one_shape(self):
+        queries = [
+            'SELECT * FROM "blog_comment" WHERE "post_id" IN (1, 2, 3)',
+            'SELECT * FROM "blog_comment" WHERE "post_id" IN (4)',
+            'INSERT INTO "blog_reaction" VALUES (1, 2), (3, 4)',
+        ]
+        self.assertEqual(
+            group_by_shape(queries),
+            [
+                ('SELECT * FROM "blog_comment" WHERE "post_id" IN (...)', 2),
+                ('INSERT INTO "blog_reaction" VALUES (...)', 1),
+            ],
+        )
+
+
+class BudgetForTests(SimpleTestCase):
+    def test_viewset_actions(self):
+        comments = resolve("/api/blog/1/comments/").func
+        self.assertEqual(budget_for(comments, "GET"), comments.cls.query_budgets["comments"]["GET"])
+        self.assertEqual(budget_for(comments, "HEAD"), comments.cls.query_budgets["comments"]["GET"])
+        self.assertEqual(budget_for(comments, "POST"), comments.cls.query_budgets["comments"]["POST"])
+
+    def test_function_views(self):
+        self.assertEqual(budget_for(_view, "GET"), 1)
+        self.assertIsNone(budget_for(lambda request: None, "GET"))
+
+
+class QueryBudgetMiddlewareTests(TestCase):
+    def _request(self, queries):
+        request = RequestFactory().get("/budgeted/")
+        request.resolver_match = ResolverMatch(_view, (), {}, url_name="budgeted")
+        self.queries = queries
+        return request
+
+    def _get_response(self, request):
+        for _ in range(self.queries):
+            get_user_model().objects.filter(pk=1).exists()
+        return HttpResponse()
+
+    def test_requests_over_budget_are_logged_with_their_queries(self):
+        middleware = query_budget_middleware(self._get_response)
+        with self.assertLogs("apps.core.query_budget", "WARNING") as logs:
+            middleware(self._request(queries=3))
+        self.assertIn("ran 3 queries, over its budget of 1", logs.output[0])
+        self.assertIn('    3 x SELECT ? AS "a" FROM "users_user"', logs.output[0])
+
+    def test_requests_within_budget_are_not_logged(self):
+        middleware = query_budget_middleware(self._get_response)
+        with self.assertNoLogs("apps.core.query_budget"):
+            middleware(self._request(queries=1))
+
+    def test_async_requests(self):
+        async def get_response(request):
+            return await sync_to_async(self._get_response)(request)
+
+        middleware = query_budget_middleware(get_response)
+        with self.assertLogs("apps.core.query_budget", "WARNING") as logs:
+            async_to_sync(middleware)(self._request(queries=2))
+        self.assertIn("ran 2 queries, over its budget of 1", logs.output[0])
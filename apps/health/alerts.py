@@ -0,0 +1,81 @@
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.mail import send_mail
+
+ALERT_KEY = "health:alert:{name}"
+
+# Used while the cache is unreachable (per process, so at worst one email per worker process)
+_local_state = {}
+
+
+def _get_state(name):
+    try:
+        return cache.get(ALERT_KEY.format(name=name))
+    except Exception:
+        return _local_state.get(name)
+
+
+def _set_state(name, state):
+    _local_state[name] = state
+    try:
+        cache.set(ALERT_KEY.format(name=name), state, timeout=None)
+    except Exception:
+        pass
+
+
+def _clear_state(name):
+    _local_state.pop(name, None)
+    try:
+        cache.delete(ALERT_KEY.format(name=name))
+    except Exception:
+        pass
+
+
+def _send(subject, message):
+    send_mail(
+        subject=subject,
+        message=message,
+        from_email="no-reply@yourapp.com",
+        recipient_list=["quypq.dev@gmail.com"],
+        fail_silently=False,
+    )
+
+
+def process_alerts(results, now=None):
+    """
+    Email Admin about failing checks without repeating on every run.
+
+    The first failure of a check alerts at once; while it keeps failing, reminders
+    go out after `HEALTH_ALERT_BACKOFF` seconds, doubling up to `HEALTH_ALERT_MAX_BACKOFF`.
+    A check that recovers sends one "resolved" email. Returns the names alerted about.
+    """
+    now = time.time() if now is None else now
+    alerted = []
+    for name, result in results.items():
+        state = _get_state(name)
+
+        if result["ok"]:
+            if state:
+                _send(
+                    subject=f"[RESOLVED] Health check '{name}' recovered",
+                    message=f"'{name}' is healthy again after {int(now - state['since'])}s.",
+                )
+                _clear_state(name)
+            continue
+
+        if state and now < state["last_sent"] + state["backoff"]:
+            continue
+
+        since = state["since"] if state else now
+        _send(
+            subject=f"[CRITICAL] Health check '{name}' failed",
+            message=f"'{name}' has been failing for {int(now - since)}s: {result.get('error')}",
+        )
+        backoff = settings.HEALTH_ALERT_BACKOFF
+        if state:
+            backoff = min(state["backoff"] * 2, settings.HEALTH_ALERT_MAX_BACKOFF)
+        _set_state(name, {"since": since, "last_sent": now, "backoff": backoff})
+        alerted.append(name)
+    return alerted
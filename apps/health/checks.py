@@ -0,0 +1,134 @@
+import math
+import time
+
+from celery import current_app
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+
+from apps.core.postgresql_pool import pool_stats
+
+LATENCY_KEY = "health:latency:{name}"
+REPORT_KEY = "health:report"
+
+
+def _probe(check):
+    # {"ok": bool, "latency_ms": float, ...}; a probe never raises
+    start = time.perf_counter()
+    try:
+        details = check() or {}
+        ok = True
+    except Exception as exc:
+        details = {"error": f"{type(exc).__name__}: {exc}"}
+        ok = False
+    return {"ok": ok, "latency_ms": round((time.perf_counter() - start) * 1000, 2), **details}
+
+
+def check_database():
+    with connections["default"].cursor() as cursor:
+        cursor.execute("SELECT 1")
+        cursor.fetchone()
+    stats = pool_stats("default")
+    return {"pool": stats} if stats is not None else None
+
+
+def check_cache():
+    key = "health:ping"
+    cache.set(key, 1, timeout=60)
+    if cache.get(key) != 1:
+        raise RuntimeError("cache did not return the value just written")
+
+
+def check_broker():
+    with current_app.connection_for_write() as connection:
+        connection.ensure_connection(max_retries=1, timeout=settings.HEALTH_PROBE_TIMEOUT)
+
+
+def check_workers():
+    replies = current_app.control.ping(timeout=settings.HEALTH_PROBE_TIMEOUT)
+    if not replies:
+        raise RuntimeError("no Celery worker answered the ping")
+    return {"workers": len(replies)}
+
+
+# What a web process needs to serve requests (readiness)
+READINESS_CHECKS = {
+    "database": check_database,
+    "cache": check_cache,
+}
+
+# Everything the periodic health task watches
+ALL_CHECKS = {
+    **READINESS_CHECKS,
+    "broker": check_broker,
+    "workers": check_workers,
+}
+
+
+def run_checks(checks):
+    """Probe every check in `checks` ({name: callable}) and time it."""
+    return {name: _probe(check) for name, check in checks.items()}
+
+
+def record_latencies(results):
+    """Append each probe's latency to its rolling window (the last `HEALTH_LATENCY_WINDOW` samples)."""
+    for name, result in results.items():
+        key = LATENCY_KEY.format(name=name)
+        try:
+            samples = cache.get(key) or []
+            samples.append(result["latency_ms"])
+            cache.set(key, samples[-settings.HEALTH_LATENCY_WINDOW :], timeout=None)
+        except Exception:
+            pass  # the cache itself may be what is down
+
+
+def _percentile(samples, percent):
+    # nearest-rank
+    ordered = sorted(samples)
+    return ordered[max(0, math.ceil(percent / 100 * len(ordered)) - 1)]
+
+
+def latency_percentiles(name):
+    """p50/p95/p99 of the rolling latency window of check `name`, or None without samples."""
+    try:
+        samples = cache.get(LATENCY_KEY.format(name=name))
+    except Exception:
+        return None
+    if not samples:
+        return None
+    return {
+        "samples": len(samples),
+        "p50": _percentile(samples, 50),
+        "p95": _percentile(samples, 95),
+        "p99": _percentile(samples, 99),
+    }
+
+
+def build_report(results):
+    """Probe results plus their latency percentiles, as served by `/healthz`."""
+    return {
+        "status": "ok" if all(result["ok"] for result in results.values()) else "fail",
+        "checked_at": time.time(),
+        "checks": {name: {**result, "latency": latency_percentiles(name)} for name, result in results.items()},
+    }
+
+
+def store_report(report):
+    try:
+        cache.set(REPORT_KEY, report, timeout=settings.HEALTH_REPORT_TTL)
+    except Exception:
+        pass
+
+
+def last_report():
+    """
+    The last stored report, flagged `stale` when the monitor has not refreshed it
+    for `HEALTH_REPORT_STALE_AFTER` seconds (the monitor itself is down or stuck).
+    """
+    try:
+        report = cache.get(REPORT_KEY)
+    except Exception:
+        return None
+    if report is not None:
+        report["stale"] = time.time() - report["checked_at"] > settings.HEALTH_REPORT_STALE_AFTER
+    return report
@@ -0,0 +1,25 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from apps.health.monitor import run_health_checks
+
+
+class Command(BaseCommand):
+    help = "Probe Postgres, the cache, the Celery broker and workers every HEALTH_CHECK_INTERVAL seconds."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true", help="Run the checks once and exit.")
+
+    def handle(self, *args, once=False, **options):
+        while True:
+            started = time.monotonic()
+            # A connection broken during an outage must not poison the next run
+            close_old_connections()
+            status = run_health_checks()
+            self.stdout.write(f"health: {status}")
+            if once:
+                return
+            time.sleep(max(0.0, settings.HEALTH_CHECK_INTERVAL - (time.monotonic() - started)))
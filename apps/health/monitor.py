@@ -0,0 +1,18 @@
+from .alerts import process_alerts
+from .checks import ALL_CHECKS, build_report, record_latencies, run_checks, store_report
+
+
+def run_health_checks():
+    """
+    Probe Postgres, the cache, the broker and the workers, record their latencies,
+    store the report served by `/healthz` and alert about failures (deduplicated).
+
+    Runs in the `health_monitor` process, not in Celery: a probe of the broker
+    or the workers must not depend on them to be scheduled.
+    """
+    results = run_checks(ALL_CHECKS)
+    record_latencies(results)
+    report = build_report(results)
+    store_report(report)
+    process_alerts(results)
+    return report["status"]
@@ -0,0 +1,152 @@
+import io
+import time
+from unittest import mock
+
+from django.core import mail
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from apps.health import alerts, checks, views
+from apps.health.alerts import process_alerts
+from apps.health.monitor import run_health_checks
+
+
+def _fail():
+    raise ConnectionError("connection refused")
+
+
+class HealthEndpointTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        views._readiness["results"] = None
+
+    def test_healthz_serves_last_report_without_probing(self):
+        with mock.patch.object(checks, "run_checks") as run_checks:
+            response = self.client.get(reverse("healthz"))
+        run_checks.assert_not_called()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"status": "ok", "report": None})
+
+    def test_readyz_ok(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse("readyz"))
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual(body["status"], "ok")
+        self.assertEqual(set(body["checks"]), {"database", "cache"})
+
+    def test_readyz_is_cached_between_polls(self):
+        self.client.get(reverse("readyz"))
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(reverse("readyz")).status_code, 200)
+
+    def test_readyz_fails_when_a_dependency_is_down(self):
+        with mock.patch.dict(checks.READINESS_CHECKS, {"database": _fail}):
+            response = self.client.get(reverse("readyz"))
+        self.assertEqual(response.status_code, 503)
+        database = response.json()["checks"]["database"]
+        self.assertFalse(database["ok"])
+        self.assertIn("connection refused", database["error"])
+
+
+@override_settings(EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend")
+class HealthCheckTaskTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def _run(self, **overrides):
+        all_checks = {**checks.ALL_CHECKS, "broker": lambda: None, "workers": lambda: {"workers": 1}, **overrides}
+        with mock.patch("apps.health.monitor.ALL_CHECKS", all_checks):
+            return run_health_checks()
+
+    def test_report_with_latency_percentiles(self):
+        for _ in range(3):
+            self.assertEqual(self._run(), "ok")
+
+        report = self.client.get(reverse("healthz")).json()["report"]
+        self.assertEqual(report["status"], "ok")
+        self.assertFalse(report["stale"])
+        self.assertEqual(report["checks"]["workers"]["workers"], 1)
+        latency = report["checks"]["database"]["latency"]
+        self.assertEqual(latency["samples"], 3)
+        self.assertLessEqual(latency["p50"], latency["p99"])
+        self.assertEqual(len(mail.outbox), 0)
+
+    @override_settings(HEALTH_LATENCY_WINDOW=2)
+    def test_latency_window_is_bounded(self):
+        for _ in range(3):
+            self._run()
+        self.assertEqual(checks.latency_percentiles("database")["samples"], 2)
+
+    def test_report_goes_stale_when_the_monitor_stops(self):
+        self._run()
+        with mock.patch("apps.health.checks.time.time", return_value=time.time() + 600):
+            self.assertTrue(self.client.get(reverse("healthz")).json()["report"]["stale"])
+
+    def test_broker_outage_is_alerted_without_celery(self):
+        # the monitor probes the broker itself, nothing goes through it
+        with mock.patch("celery.app.task.Task.apply_async") as apply_async:
+            self.assertEqual(self._run(broker=_fail), "fail")
+        apply_async.assert_not_called()
+        self.assertIn("broker", mail.outbox[0].subject)
+
+    def test_management_command_runs_once(self):
+        out = io.StringIO()
+        command = "apps.health.management.commands.health_monitor"
+        # closing connections would end the test transaction
+        with (
+            mock.patch(f"{command}.close_old_connections"),
+            mock.patch(f"{command}.run_health_checks", return_value="ok"),
+        ):
+            call_command("health_monitor", "--once", stdout=out)
+        self.assertIn("health: ok", out.getvalue())
+
+    def test_failure_is_reported(self):
+        self.assertEqual(self._run(workers=_fail), "fail")
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertIn("workers", mail.outbox[0].subject)
+
+
+@override_settings(
+    EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend",
+    HEALTH_ALERT_BACKOFF=60,
+    HEALTH_ALERT_MAX_BACKOFF=100,
+)
+class AlertTests(TestCase):
+    down = {"database": {"ok": False, "latency_ms": 1.0, "error": "down"}}
+    up = {"database": {"ok": True, "latency_ms": 1.0}}
+
+    def setUp(self):
+        cache.clear()
+        alerts._local_state.clear()
+
+    def test_alerts_are_deduplicated_with_backoff(self):
+        self.assertEqual(process_alerts(self.down, now=0), ["database"])
+        # every run within the back-off is silent
+        self.assertEqual(process_alerts(self.down, now=30), [])
+        self.assertEqual(process_alerts(self.down, now=60), ["database"])
+        # back-off doubled, capped at HEALTH_ALERT_MAX_BACKOFF
+        self.assertEqual(process_alerts(self.down, now=159), [])
+        self.assertEqual(process_alerts(self.down, now=160), ["database"])
+        self.assertEqual(process_alerts(self.down, now=259), [])
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertIn("failing for 160s", mail.outbox[-1].body)
+
+    def test_recovery_is_reported_once(self):
+        process_alerts(self.down, now=0)
+        process_alerts(self.up, now=10)
+        process_alerts(self.up, now=20)
+        self.assertEqual([message.subject[:10] for message in mail.outbox], ["[CRITICAL]", "[RESOLVED]"])
+
+        # a new outage alerts right away
+        self.assertEqual(process_alerts(self.down, now=30), ["database"])
+
+    def test_cache_outage_falls_back_to_process_state(self):
+        with mock.patch("apps.health.alerts.cache") as broken_cache:
+            broken_cache.get.side_effect = ConnectionError
+            broken_cache.set.side_effect = ConnectionError
+            process_alerts(self.down, now=0)
+            process_alerts(self.down, now=1)
+        self.assertEqual(len(mail.outbox), 1)
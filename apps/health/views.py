@@ -0,0 +1,41 @@
+import threading
+import time
+
+from django.conf import settings
+from django.http import JsonResponse
+from django.views.decorators.cache import never_cache
+from django.views.decorators.http import require_safe
+
+from .checks import READINESS_CHECKS, last_report, run_checks
+
+_readiness_lock = threading.Lock()
+_readiness = {"checked_at": 0.0, "results": None}
+
+
+def _readiness_results():
+    # Load balancers poll often: probe at most once per HEALTH_READYZ_CACHE_TTL per process
+    with _readiness_lock:
+        now = time.monotonic()
+        if _readiness["results"] is None or now - _readiness["checked_at"] >= settings.HEALTH_READYZ_CACHE_TTL:
+            _readiness["results"] = run_checks(READINESS_CHECKS)
+            _readiness["checked_at"] = now
+        return _readiness["results"]
+
+
+@never_cache
+@require_safe
+def healthz(request):
+    """
+    Liveness: answers 200 as long as the process serves requests, without touching
+    any dependency. Includes the last report of the `health_monitor` process.
+    """
+    return JsonResponse({"status": "ok", "report": last_report()})
+
+
+@never_cache
+@require_safe
+def readyz(request):
+    """Readiness: 200 if Postgres and the cache answer, 503 otherwise."""
+    results = _readiness_results()
+    ready = all(result["ok"] for result in results.values())
+    return JsonResponse({"status": "ok" if ready else "fail", "checks": results}, status=200 if ready else 503)
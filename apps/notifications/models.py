@@ -0,0 +1,66 @@
+from django.conf import settings
+from django.db import models
+from django.db.models import Q
+from django.utils import timezone
+
+
+class Notification(models.Model):
+    """
+    One event waiting for the next digest email of its recipient
+    (`NOTIFICATIONS_MODE = "digest"`, see `tasks.send_notification_digests`).
+    """
+
+    class Kind(models.TextChoices):
+        COMMENT = "comment", "Comment on your post"
+        REPLY = "reply", "Reply to your comment"
+        REACTION = "reaction", "Reaction on your content"
+
+    recipient = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="notifications",
+    )
+    kind = models.CharField(max_length=20, choices=Kind.choices)
+    # Reactions on a comment only set `comment`; its post is reached through it
+    post = models.ForeignKey("blog.Post", on_delete=models.CASCADE, null=True, blank=True, related_name="+")
+    comment = models.ForeignKey("blog.Comment", on_delete=models.CASCADE, null=True, blank=True, related_name="+")
+    reaction_type = models.CharField(max_length=20, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            # the digest task only ever scans unsent events
+            models.Index(
+                fields=["recipient", "id"],
+                name="notification_pending_idx",
+                condition=Q(sent_at__isnull=True),
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} for {self.recipient_id}"
+
+
+class OutboxEvent(models.Model):
+    """
+    A Celery task call recorded in the caller's transaction (see `outbox.enqueue`)
+    and published to the broker later by `tasks.relay_outbox`, which deletes it once sent.
+    """
+
+    task_name = models.CharField(max_length=255)
+    args = models.JSONField(default=list)
+    kwargs = models.JSONField(default=dict)
+    created_at = models.DateTimeField(auto_now_add=True)
+    # not published before this time (retry backoff)
+    available_at = models.DateTimeField(default=timezone.now)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["available_at", "id"], name="outbox_available_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.task_name}{tuple(self.args)}"
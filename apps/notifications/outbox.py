@@ -0,0 +1,17 @@
+from .models import OutboxEvent
+
+
+def enqueue(task, *args, **kwargs):
+    """
+    Record `task.delay(*args, **kwargs)` in the outbox instead of calling the broker.
+
+    The row commits (or rolls back) with the caller's transaction, and
+    `tasks.relay_outbox` publishes it afterwards, at least once: tasks must
+    tolerate an occasional duplicate. Arguments must be JSON-serializable.
+    """
+    return OutboxEvent.objects.create(task_name=task.name, args=list(args), kwargs=kwargs)
+
+
+def enqueue_many(task, calls):
+    """`enqueue` for many calls of `task` (one positional args list each), in one INSERT."""
+    return OutboxEvent.objects.bulk_create(OutboxEvent(task_name=task.name, args=list(args)) for args in calls)
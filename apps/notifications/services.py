@@ -0,0 +1,68 @@
+from django.conf import settings
+
+from .models import Notification
+from .outbox import enqueue, enqueue_many
+from .tasks import send_new_comment_email, send_new_reaction_email, send_reaction_summary_email
+
+
+def digest_mode():
+    return settings.NOTIFICATIONS_MODE == "digest"
+
+
+def notify_new_comment(comment, post_author_id, parent_author_id=None):
+    """The post author (and the parent comment's author for a reply) learn about `comment`."""
+    if not digest_mode():
+        enqueue(send_new_comment_email, post_author_id, parent_author_id, comment.id)
+        return
+
+    events = [
+        Notification(
+            recipient_id=post_author_id, kind=Notification.Kind.COMMENT, post_id=comment.post_id, comment=comment
+        )
+    ]
+    if parent_author_id:
+        events.append(
+            Notification(
+                recipient_id=parent_author_id, kind=Notification.Kind.REPLY, post_id=comment.post_id, comment=comment
+            )
+        )
+    Notification.objects.bulk_create(events)
+
+
+def _reaction_event(recipient_id, reaction_type, content_type, object_id):
+    target = {"post_id": object_id} if content_type == "post" else {"comment_id": object_id}
+    return Notification(
+        recipient_id=recipient_id, kind=Notification.Kind.REACTION, reaction_type=reaction_type, **target
+    )
+
+
+def notify_new_reaction(recipient_id, reaction_type, content_type, object_id):
+    """`content_type` is "post" or "comment"."""
+    if not digest_mode():
+        enqueue(send_new_reaction_email, recipient_id, reaction_type, content_type, object_id)
+        return
+    _reaction_event(recipient_id, reaction_type, content_type, object_id).save()
+
+
+def notify_reactions(recipient_id, reactions):
+    """Several reactions for one recipient: `[[reaction_type, content_type, object_id], ...]`."""
+    notify_reactions_by_recipient({recipient_id: reactions})
+
+
+def notify_reactions_by_recipient(reactions_by_recipient):
+    """
+    `notify_reactions` for many recipients (`{recipient_id: reactions}`), with one INSERT
+    whatever the number of recipients.
+    """
+    if not reactions_by_recipient:
+        return
+    if not digest_mode():
+        enqueue_many(send_reaction_summary_email, reactions_by_recipient.items())
+        return
+    Notification.objects.bulk_create(
+        [
+            _reaction_event(recipient_id, *reaction)
+            for recipient_id, reactions in reactions_by_recipient.items()
+            for reaction in reactions
+        ]
+    )
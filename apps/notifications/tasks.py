@@ -1,49 +1,62 @@
-from celery import shared_task
+import csv
+import gzip
+import tempfile
+from datetime import timedelta
+
+from celery import current_app, shared_task
+from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.core.mail import send_mail
-from django.db import connections
-from django.db.utils import OperationalError
+from django.core.mail import EmailMessage, get_connection, send_mail
+from django.db import transaction
 from django.utils import timezone
 
 from apps.blog.models import Comment, Post
+from apps.core.db import PRIMARY, REPLICA, reads_from
+
+from .models import Notification, OutboxEvent
 
 User = get_user_model()
 
+# Every task states where it reads (outside requests the router defaults to the primary):
+# the primary when it needs rows the triggering request just committed (a replica may not
+# have them yet) or locks rows; a replica when a few seconds of lag do not matter.
+
 
 @shared_task
+@reads_from(PRIMARY)
 def send_new_comment_email(author_id, parent_comment_author_id, comment_id):
-    post_author = User.objects.get(id=author_id)
-    parent_comment_author = User.objects.get(id=parent_comment_author_id) if parent_comment_author_id else None
-    comment = Comment.objects.select_related("post").get(id=comment_id)
+    comment = Comment.objects.select_related("post__author", "author").get(id=comment_id)
     post = comment.post
+    post_author = post.author if post.author_id == author_id else User.objects.get(id=author_id)
 
-    subject = f"New comment on your post: {post.title}"
-    message = f"{comment.author.username} commented:\n\n{comment.content}"
-
-    send_mail(
-        subject,
-        message,
-        "no-reply@yourapp.com",
-        [post_author.email],
-        fail_silently=False,
-    )
-
-    if parent_comment_author:
-        subject = f"New reply to your comment on: {post.title}"
-        message = f"{comment.author.username} replied to your comment:\n\n{comment.content}"
-
-        send_mail(
-            subject,
-            message,
+    messages = [
+        EmailMessage(
+            f"New comment on your post: {post.title}",
+            f"{comment.author.username} commented:\n\n{comment.content}",
             "no-reply@yourapp.com",
-            [parent_comment_author.email],
-            fail_silently=False,
+            [post_author.email],
         )
+    ]
+
+    if parent_comment_author_id:
+        parent_comment_author = User.objects.get(id=parent_comment_author_id)
+        messages.append(
+            EmailMessage(
+                f"New reply to your comment on: {post.title}",
+                f"{comment.author.username} replied to your comment:\n\n{comment.content}",
+                "no-reply@yourapp.com",
+                [parent_comment_author.email],
+            )
+        )
+
+    # One mail connection for both messages
+    get_connection(fail_silently=False).send_messages(messages)
 
     return "Comment emails sent."
 
 
 @shared_task
+@reads_from(PRIMARY)
 def send_new_reaction_email(recipient_user_id, reaction_type, content_type, object_id):
     recipient = User.objects.get(id=recipient_user_id)
 
@@ -69,6 +82,95 @@ def send_new_reaction_email(recipient_user_id, reaction_type, content_type, obje
 
 
 @shared_task
+@reads_from(PRIMARY)
+def send_reaction_summary_email(recipient_user_id, reactions):
+    """
+    One email for several reactions to the same recipient (bulk reaction sync).
+    `reactions` is a list of `[reaction_type, content_type, object_id]`.
+    """
+    recipient = User.objects.get(id=recipient_user_id)
+
+    post_ids = {object_id for _, content_type, object_id in reactions if content_type == "post"}
+    comment_ids = {object_id for _, content_type, object_id in reactions if content_type == "comment"}
+    posts = Post.objects.in_bulk(post_ids)
+    comments = Comment.objects.select_related("post").in_bulk(comment_ids)
+
+    lines = []
+    for reaction_type, content_type, object_id in reactions:
+        if content_type == "post" and object_id in posts:
+            lines.append(f"- {reaction_type} on your post: {posts[object_id].title}")
+        elif content_type == "comment" and object_id in comments:
+            lines.append(f"- {reaction_type} on your comment on: {comments[object_id].post.title}")
+
+    if not lines:
+        return "Nothing to report."
+
+    send_mail(
+        f"New reactions on your content ({len(lines)})",
+        "Your content received new reactions:\n\n" + "\n".join(lines),
+        "no-reply@yourapp.com",
+        [recipient.email],
+        fail_silently=False,
+    )
+
+    return "Reaction summary email sent."
+
+
+def _digest_line(notification):
+    comment = notification.comment
+    post = notification.post or comment.post
+    if notification.kind == "comment":
+        return f'- {comment.author.username} commented on your post "{post.title}": {comment.content}'
+    if notification.kind == "reply":
+        return f'- {comment.author.username} replied to your comment on "{post.title}": {comment.content}'
+    if notification.post_id:
+        return f'- New {notification.reaction_type} reaction on your post "{post.title}"'
+    return f'- New {notification.reaction_type} reaction on your comment on "{post.title}"'
+
+
+@shared_task
+@reads_from(PRIMARY)
+def send_notification_digests():
+    """
+    Digest mode: one email per recipient for everything that happened since the
+    last run (the beat interval is the digest window), all sent over one mail connection.
+    Concurrent runs skip each other's rows; a failed send leaves the events pending.
+    """
+    with transaction.atomic():
+        pending = list(
+            Notification.objects.select_for_update(of=("self",), skip_locked=True)
+            .filter(sent_at__isnull=True)
+            .select_related("recipient", "post", "comment__author", "comment__post")
+            .order_by("recipient_id", "id")[: settings.NOTIFICATIONS_DIGEST_BATCH_SIZE]
+        )
+        if not pending:
+            return "No pending notifications."
+
+        by_recipient = {}
+        for notification in pending:
+            by_recipient.setdefault(notification.recipient, []).append(notification)
+
+        messages = [
+            EmailMessage(
+                f"New activity on your content ({len(notifications)})",
+                "Here is what happened since our last email:\n\n"
+                + "\n".join(_digest_line(notification) for notification in notifications),
+                "no-reply@yourapp.com",
+                [recipient.email],
+            )
+            for recipient, notifications in by_recipient.items()
+            if recipient.email
+        ]
+        with get_connection(fail_silently=False) as connection:
+            connection.send_messages(messages)
+
+        Notification.objects.filter(pk__in=[n.pk for n in pending]).update(sent_at=timezone.now())
+
+    return f"Sent {len(messages)} digests for {len(pending)} notifications."
+
+
+@shared_task
+@reads_from(PRIMARY)
 def send_email_to_signed_up_user(user_id):
     user = User.objects.get(id=user_id)
 
@@ -92,49 +194,97 @@ def send_email_to_signed_up_user(user_id):
 
 
 @shared_task
-def check_db_health():
+@reads_from(REPLICA)
+def send_daily_signup_report():
     """
-    Tries to connect to the DB. If it fails, sends an email.
+    Email Admin a CSV of the users who joined today.
+
+    Reads a half-open `date_joined` range (index-friendly, unlike `__date`) through a
+    server-side cursor and writes the gzipped CSV to a temp file row by row, so building
+    it holds one chunk of rows in memory. Sending it does not stream: the attachment is
+    read into memory, then base64-encoded and serialized with the message, i.e. about
+    three times the compressed size. SIGNUP_REPORT_MAX_ATTACHMENT_BYTES bounds that: a
+    larger report is not attached, the email only gives the count and the size.
     """
-    try:
-        conn = connections["default"]
-        conn.cursor()
-    except OperationalError:
-        send_mail(
-            subject="[CRITICAL] Database Health Check Failed",
-            message="The main database is not reachable. Please check immediately.",
+    start = timezone.localtime().replace(hour=0, minute=0, second=0, microsecond=0)
+    end = start + timedelta(days=1)
+    today = start.date()
+
+    new_users = (
+        User.objects.filter(date_joined__gte=start, date_joined__lt=end)
+        .order_by("date_joined", "id")
+        .values_list("id", "username", "email", "date_joined")
+        .iterator(chunk_size=settings.SIGNUP_REPORT_CHUNK_SIZE)
+    )
+
+    with tempfile.TemporaryFile() as report:
+        count = 0
+        with gzip.open(report, "wt", newline="") as archive:
+            writer = csv.writer(archive)
+            writer.writerow(["id", "username", "email", "date_joined"])
+            for user_id, username, email, date_joined in new_users:
+                writer.writerow([user_id, username, email, date_joined.isoformat()])
+                count += 1
+
+        if not count:
+            return "No new users today."
+
+        size = report.tell()
+        attach = size <= settings.SIGNUP_REPORT_MAX_ATTACHMENT_BYTES
+        if attach:
+            body = f"{count} users signed up on {today}. The list is attached."
+        else:
+            body = (
+                f"{count} users signed up on {today}. The list ({size} bytes gzipped) is over the "
+                f"{settings.SIGNUP_REPORT_MAX_ATTACHMENT_BYTES} bytes attachment limit and was not attached."
+            )
+        message = EmailMessage(
+            subject=f"Daily Signup Report - {today}",
+            body=body,
             from_email="no-reply@yourapp.com",
-            recipient_list=["quypq.dev@gmail.com"],
-            fail_silently=False,
+            to=["quypq.dev@gmail.com"],
         )
-        return "DB Check Failed - Email Sent"
+        if attach:
+            report.seek(0)
+            message.attach(f"signups-{today}.csv.gz", report.read(), "application/gzip")
+        message.send(fail_silently=False)
 
-    return "DB Check Passed"
+    if not attach:
+        return f"Report for {count} users sent without the list ({size} bytes, over the limit)."
+    return f"Report sent for {count} users."
 
 
 @shared_task
-def send_daily_signup_report():
+@reads_from(PRIMARY)
+def relay_outbox():
     """
-    Filters users who joined 'today' and sends a list to Admin.
-    """
-    User = get_user_model()
-    today = timezone.now().date()
-
-    # Get users who joined today (00:00 to 23:59)
-    new_users = User.objects.filter(date_joined__date=today)
+    Publish outbox events (see `outbox.enqueue`) to the broker in batches, oldest first.
 
-    if not new_users.exists():
-        return "No new users today."
+    An event is deleted only after the broker accepted it (at-least-once);
+    a failed publish is retried later with exponential backoff.
+    Concurrent relays skip each other's rows.
+    """
+    now = timezone.now()
+    published, failed = [], []
 
-    user_list_text = "\n".join([f"- {u.username} ({u.email})" for u in new_users])
-    message = f"Here is the list of users who signed up on {today}:\n\n{user_list_text}"
+    with transaction.atomic():
+        events = list(
+            OutboxEvent.objects.select_for_update(skip_locked=True)
+            .filter(available_at__lte=now)
+            .order_by("available_at", "id")[: settings.OUTBOX_RELAY_BATCH_SIZE]
+        )
+        for event in events:
+            try:
+                current_app.tasks[event.task_name].apply_async(args=event.args, kwargs=event.kwargs)
+            except Exception as e:
+                event.attempts += 1
+                event.last_error = repr(e)
+                event.available_at = now + timedelta(seconds=min(2**event.attempts, settings.OUTBOX_MAX_BACKOFF))
+                failed.append(event)
+            else:
+                published.append(event.pk)
 
-    send_mail(
-        subject=f"Daily Signup Report - {today}",
-        message=message,
-        from_email="no-reply@yourapp.com",
-        recipient_list=["quypq.dev@gmail.com"],
-        fail_silently=False,
-    )
+        OutboxEvent.objects.filter(pk__in=published).delete()
+        OutboxEvent.objects.bulk_update(failed, ["attempts", "last_error", "available_at"])
 
-    return f"Report sent for {new_users.count()} users."
+    return f"Published {len(published)} events, {len(failed)} failed."
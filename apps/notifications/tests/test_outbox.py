@@ -0,0 +1,52 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.db import transaction
+from django.test import TestCase
+from django.utils import timezone
+
+from apps.blog.tests.factories import UserFactory
+from apps.notifications.models import OutboxEvent
+from apps.notifications.outbox import enqueue
+from apps.notifications.tasks import relay_outbox, send_email_to_signed_up_user
+
+
+class OutboxTests(TestCase):
+    def test_enqueue_rolls_back_with_the_transaction(self):
+        try:
+            with transaction.atomic():
+                enqueue(send_email_to_signed_up_user, 1)
+                raise RuntimeError
+        except RuntimeError:
+            pass
+
+        self.assertFalse(OutboxEvent.objects.exists())
+
+    @mock.patch.object(send_email_to_signed_up_user, "apply_async")
+    def test_relay_publishes_and_deletes(self, mock_apply):
+        user = UserFactory()
+        enqueue(send_email_to_signed_up_user, user.id)
+        enqueue(send_email_to_signed_up_user, user.id + 1)
+
+        self.assertEqual(relay_outbox(), "Published 2 events, 0 failed.")
+
+        self.assertEqual([c.kwargs["args"] for c in mock_apply.call_args_list], [[user.id], [user.id + 1]])
+        self.assertFalse(OutboxEvent.objects.exists())
+
+    @mock.patch.object(send_email_to_signed_up_user, "apply_async", side_effect=ConnectionError("broker down"))
+    def test_failed_publish_is_kept_and_backed_off(self, mock_apply):
+        event = enqueue(send_email_to_signed_up_user, 1)
+
+        self.assertEqual(relay_outbox(), "Published 0 events, 1 failed.")
+        event.refresh_from_db()
+        self.assertEqual(event.attempts, 1)
+        self.assertIn("broker down", event.last_error)
+        self.assertGreater(event.available_at, timezone.now())
+
+        # not retried before its backoff expires
+        self.assertEqual(relay_outbox(), "Published 0 events, 0 failed.")
+
+        mock_apply.side_effect = None
+        OutboxEvent.objects.update(available_at=timezone.now() - timedelta(seconds=1))
+        self.assertEqual(relay_outbox(), "Published 1 events, 0 failed.")
+        self.assertFalse(OutboxEvent.objects.exists())
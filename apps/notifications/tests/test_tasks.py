@@ -1,10 +1,23 @@
+import csv
+import gzip
+import io
+from datetime import timedelta
+from unittest import mock
+
 from django.core import mail
+from django.core.mail import get_connection
 from django.test import TestCase, override_settings
+from django.utils import timezone
 
 from apps.blog.tests.factories import CommentFactory, PostFactory, UserFactory
+from apps.notifications.models import Notification, OutboxEvent
+from apps.notifications.services import notify_new_comment, notify_new_reaction, notify_reactions
 from apps.notifications.tasks import (
+    send_daily_signup_report,
     send_new_comment_email,
     send_new_reaction_email,
+    send_notification_digests,
+    send_reaction_summary_email,
 )
 
 
@@ -97,3 +110,94 @@ class NotificationTaskTests(TestCase):
             body_contains="love",
             to=author.email,
         )
+
+    def test_send_reaction_summary_email_sends_one_mail(self):
+        author = UserFactory()
+        post = PostFactory(author=author)
+        comment = CommentFactory(post=post, author=author)
+
+        send_reaction_summary_email(author.id, [["like", "post", post.id], ["wow", "comment", comment.id]])
+
+        self._assert_single_email(
+            subject_contains="(2)",
+            body_contains=f"wow on your comment on: {post.title}",
+            to=author.email,
+        )
+
+
+@override_settings(EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend", NOTIFICATIONS_MODE="digest")
+class NotificationDigestTests(TestCase):
+    def setUp(self):
+        self.post_author = UserFactory()
+        self.commenter = UserFactory()
+        self.post = PostFactory(author=self.post_author)
+        self.comment = CommentFactory(post=self.post, author=self.commenter)
+
+    def test_digest_mode_stores_events_instead_of_enqueueing(self):
+        reply = CommentFactory(post=self.post, parent=self.comment, author=self.post_author)
+
+        notify_new_comment(reply, self.post_author.id, self.commenter.id)
+
+        self.assertFalse(OutboxEvent.objects.exists())
+        self.assertEqual(
+            set(Notification.objects.values_list("recipient_id", "kind")),
+            {(self.post_author.id, "comment"), (self.commenter.id, "reply")},
+        )
+
+    def test_one_digest_per_recipient_over_one_connection(self):
+        notify_new_comment(self.comment, self.post_author.id)
+        notify_new_reaction(self.post_author.id, "like", "post", self.post.id)
+        notify_reactions(self.commenter.id, [["wow", "comment", self.comment.id], ["sad", "comment", self.comment.id]])
+
+        with mock.patch("apps.notifications.tasks.get_connection", wraps=get_connection) as mock_connection:
+            result = send_notification_digests()
+
+        mock_connection.assert_called_once()
+        self.assertEqual(result, "Sent 2 digests for 4 notifications.")
+        by_recipient = {email.to[0]: email for email in mail.outbox}
+        self.assertIn("(2)", by_recipient[self.post_author.email].subject)
+        self.assertIn(f'commented on your post "{self.post.title}"', by_recipient[self.post_author.email].body)
+        self.assertIn("New sad reaction on your comment", by_recipient[self.commenter.email].body)
+        self.assertFalse(Notification.objects.filter(sent_at__isnull=True).exists())
+
+        self.assertEqual(send_notification_digests(), "No pending notifications.")
+
+
+@override_settings(EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend", SIGNUP_REPORT_CHUNK_SIZE=1)
+class DailySignupReportTests(TestCase):
+    def test_no_signups(self):
+        self.assertEqual(send_daily_signup_report(), "No new users today.")
+        self.assertEqual(len(mail.outbox), 0)
+
+    def test_attaches_todays_signups_as_csv(self):
+        midnight = timezone.localtime().replace(hour=0, minute=0, second=0, microsecond=0)
+        first = UserFactory(username="first", date_joined=midnight)
+        second = UserFactory(username="second", date_joined=midnight + timedelta(hours=1))
+        UserFactory(username="yesterday", date_joined=midnight - timedelta(microseconds=1))
+        UserFactory(username="tomorrow", date_joined=midnight + timedelta(days=1))
+
+        self.assertEqual(send_daily_signup_report(), "Report sent for 2 users.")
+
+        self.assertEqual(len(mail.outbox), 1)
+        message = mail.outbox[0]
+        self.assertEqual(message.to, ["quypq.dev@gmail.com"])
+        filename, content, mimetype = message.attachments[0]
+        self.assertEqual(filename, f"signups-{midnight.date()}.csv.gz")
+        self.assertEqual(mimetype, "application/gzip")
+
+        rows = list(csv.reader(io.StringIO(gzip.decompress(content).decode())))
+        self.assertEqual(rows[0], ["id", "username", "email", "date_joined"])
+        self.assertEqual(
+            [row[:2] for row in rows[1:]],
+            [[str(first.pk), "first"], [str(second.pk), "second"]],
+        )
+
+    @override_settings(SIGNUP_REPORT_MAX_ATTACHMENT_BYTES=10)
+    def test_report_over_the_attachment_limit_is_not_attached(self):
+        UserFactory(date_joined=timezone.localtime().replace(hour=0, minute=0, second=0, microsecond=0))
+
+        self.assertIn("sent without the list", send_daily_signup_report())
+
+        message = mail.outbox[0]
+        self.assertEqual(message.attachments, [])
+        self.assertIn("over the 10 bytes attachment limit", message.body)
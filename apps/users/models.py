@@ -1,5 +1,10 @@
 from django.contrib.auth.models import AbstractUser
+from django.db import models
 
 
 class User(AbstractUser):
-    pass
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            # signups in a time range (daily report)
+            models.Index(fields=["date_joined"], name="users_user_date_joined_idx"),
+        ]
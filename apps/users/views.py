@@ -1,4 +1,5 @@
 from django.contrib.auth import get_user_model
+from django.db import transaction
 from rest_framework import generics, permissions, status
 from rest_framework.response import Response
 from rest_framework.views import APIView
@@ -9,6 +10,8 @@ from rest_framework_simplejwt.serializers import (
 from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 
+from apps.core.serializers import FieldSelection
+from apps.notifications.outbox import enqueue
 from apps.notifications.tasks import send_email_to_signed_up_user
 
 from .serializers import RegisterSerializer, UserSerializer
@@ -31,11 +34,11 @@ class RegisterView(generics.CreateAPIView):
     permission_classes = [permissions.AllowAny]
 
     def post(self, request, *args, **kwargs):
-        response = super().post(request, *args, **kwargs)
-        data = response.data
+        with transaction.atomic():
+            response = super().post(request, *args, **kwargs)
 
-        # Send email verification
-        send_email_to_signed_up_user.delay(data.get("id"))
+            # Send email verification (outbox: published once the user is committed)
+            enqueue(send_email_to_signed_up_user, response.data.get("id"))
 
         return response
 
@@ -141,9 +144,13 @@ class LogoutView(APIView):
 class MeView(APIView):
     """
     GET /api/users/me/
+    GET /api/users/me/?fields=id,username
     Authorization: Bearer <access_token>
     """
 
     def get(self, request, *args, **kwargs):
-        serializer = UserSerializer(request.user)
+        serializer = UserSerializer(
+            request.user,
+            context={"request": request, "field_selection": FieldSelection.from_request(request)},
+        )
         return Response(serializer.data)
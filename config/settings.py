@@ -15,6 +15,7 @@ from datetime import timedelta
 from pathlib import Path
 
 from celery.schedules import crontab
+from django.core.exceptions import ImproperlyConfigured
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -44,11 +45,14 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "rest_framework",
     "rest_framework_simplejwt",
     "rest_framework_simplejwt.token_blacklist",
     "apps.users",
     "apps.blog",
+    "apps.notifications",
+    "apps.health",
     "drf_spectacular",
 ]
 
@@ -79,10 +83,18 @@ MIDDLEWARE = [
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "apps.core.db.replica_routing_middleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
+# Log requests that run more SQL queries than their view's budget (apps.core.query_budget),
+# with the queries grouped by shape. Meant for staging: it records every query of every request.
+QUERY_BUDGET_LOGGING = os.getenv("QUERY_BUDGET_LOGGING", "false").lower() == "true"
+if QUERY_BUDGET_LOGGING:
+    # First, so that the queries of the other middleware count too
+    MIDDLEWARE.insert(0, "apps.core.query_budget.query_budget_middleware")
+
 ROOT_URLCONF = "config.urls"
 
 TEMPLATES = [
@@ -117,6 +129,92 @@ DATABASES = {
     }
 }
 
+# Connection pool per process (apps/core/postgresql_pool), for web and Celery processes alike:
+# a request or task borrows an open connection instead of opening one. Keep
+# processes x DATABASE_POOL_MAX_SIZE under Postgres' max_connections.
+DATABASE_POOL = os.getenv("DATABASE_POOL", "false").lower() == "true"
+if DATABASE_POOL:
+    DATABASES["default"]["ENGINE"] = "apps.core.postgresql_pool"
+    DATABASES["default"]["POOL"] = {
+        "max_size": int(os.getenv("DATABASE_POOL_MAX_SIZE", 10)),
+        # Seconds a request waits for a free connection before failing
+        "timeout": float(os.getenv("DATABASE_POOL_TIMEOUT", 10)),
+        # Seconds before a connection is replaced by a new one
+        "max_lifetime": float(os.getenv("DATABASE_POOL_MAX_LIFETIME", 1800)),
+        # Seconds idle after which a connection is checked (SELECT 1) before reuse
+        "check_after": float(os.getenv("DATABASE_POOL_CHECK_AFTER", 30)),
+    }
+
+# Streaming replicas of the primary ("host" or "host:port", comma-separated), same credentials.
+# Safe-method requests read from them through apps.core.db.ReplicaRouter (in tests they mirror the primary).
+POSTGRES_REPLICA_HOSTS = [host.strip() for host in os.getenv("POSTGRES_REPLICA_HOSTS", "").split(",") if host.strip()]
+
+
+def _replica(address):
+    host, _, port = address.partition(":")
+    return {
+        **DATABASES["default"],
+        "HOST": host,
+        "PORT": port or DATABASES["default"]["PORT"],
+        "TEST": {"MIRROR": "default"},
+    }
+
+
+DATABASES.update({f"replica_{number}": _replica(address) for number, address in enumerate(POSTGRES_REPLICA_HOSTS, 1)})
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != "default"]
+DATABASE_ROUTERS = ["apps.core.db.ReplicaRouter"]
+# Seconds a replica may lag behind the primary and still serve reads
+DATABASE_REPLICA_MAX_LAG = float(os.getenv("DATABASE_REPLICA_MAX_LAG", 5))
+# Seconds between two lag checks of a replica (per process)
+DATABASE_REPLICA_LAG_CHECK_INTERVAL = float(os.getenv("DATABASE_REPLICA_LAG_CHECK_INTERVAL", 10))
+# Seconds a user reads from the primary after a write (read-your-writes); needs a shared cache
+DATABASE_REPLICA_STICKY_SECONDS = int(os.getenv("DATABASE_REPLICA_STICKY_SECONDS", 10))
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# Redis in production (CACHE_URL=redis://host:6379/1), in-process memory otherwise (tests, local dev).
+
+CACHE_URL = os.getenv("CACHE_URL")
+
+CACHES = {
+    "default": (
+        {"BACKEND": "django.core.cache.backends.redis.RedisCache", "LOCATION": CACHE_URL}
+        if CACHE_URL
+        else {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+    )
+}
+
+# Seconds a cached post detail / comment thread may live; writes invalidate it earlier
+BLOG_CACHE_TIMEOUT = int(os.getenv("BLOG_CACHE_TIMEOUT", 300))
+
+# Write-behind reactions: POSTs land in a buffer (Redis hash at BLOG_REACTION_BUFFER_URL,
+# required; "local://" for an in-process one in tests) and a Celery beat task writes them
+# to Postgres in batches.
+BLOG_REACTION_WRITE_BEHIND = os.getenv("BLOG_REACTION_WRITE_BEHIND", "false").lower() == "true"
+BLOG_REACTION_BUFFER_URL = os.getenv("BLOG_REACTION_BUFFER_URL")
+BLOG_REACTION_FLUSH_INTERVAL = float(os.getenv("BLOG_REACTION_FLUSH_INTERVAL", 2))
+BLOG_REACTION_FLUSH_BATCH_SIZE = int(os.getenv("BLOG_REACTION_FLUSH_BATCH_SIZE", 1000))
+
+# "Hot" feed (?ordering=hot): weight each piece of activity adds to a post's score,
+# the half-life (seconds) of that weight, and how often the decay task refreshes scores.
+BLOG_HOT_POST_WEIGHT = float(os.getenv("BLOG_HOT_POST_WEIGHT", 1))
+BLOG_HOT_COMMENT_WEIGHT = float(os.getenv("BLOG_HOT_COMMENT_WEIGHT", 3))
+BLOG_HOT_REACTION_WEIGHT = float(os.getenv("BLOG_HOT_REACTION_WEIGHT", 1))
+BLOG_HOT_HALF_LIFE = float(os.getenv("BLOG_HOT_HALF_LIFE", 12 * 3600))
+BLOG_HOT_DECAY_INTERVAL = float(os.getenv("BLOG_HOT_DECAY_INTERVAL", 600))
+
+# Live post events (Server-Sent Events at /api/async/blog/{id}/events/): a Redis URL shared by
+# every web and Celery process ("local://" for an in-process bus in tests); unset turns them off.
+# Each post keeps its last BLOG_LIVE_HISTORY events (for Last-Event-ID) for BLOG_LIVE_HISTORY_TTL
+# seconds after the last one; streams send a keep-alive every BLOG_LIVE_KEEPALIVE seconds and
+# end after BLOG_LIVE_MAX_DURATION seconds (clients reconnect and resume).
+BLOG_LIVE_EVENTS_URL = os.getenv("BLOG_LIVE_EVENTS_URL")
+BLOG_LIVE_HISTORY = int(os.getenv("BLOG_LIVE_HISTORY", 1000))
+BLOG_LIVE_HISTORY_TTL = int(os.getenv("BLOG_LIVE_HISTORY_TTL", 24 * 3600))
+BLOG_LIVE_KEEPALIVE = float(os.getenv("BLOG_LIVE_KEEPALIVE", 15))
+BLOG_LIVE_MAX_DURATION = float(os.getenv("BLOG_LIVE_MAX_DURATION", 300))
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -159,21 +257,67 @@ STATIC_URL = "static/"
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
+# Notifications: "immediate" sends one email task per event, "digest" stores events
+# and emails each recipient once per NOTIFICATIONS_DIGEST_WINDOW seconds.
+NOTIFICATIONS_MODE = os.getenv("NOTIFICATIONS_MODE", "immediate")
+NOTIFICATIONS_DIGEST_WINDOW = int(os.getenv("NOTIFICATIONS_DIGEST_WINDOW", 300))
+NOTIFICATIONS_DIGEST_BATCH_SIZE = int(os.getenv("NOTIFICATIONS_DIGEST_BATCH_SIZE", 5000))
+
+# Transactional outbox: task calls from API views are stored with the request's
+# transaction and published by the relay_outbox beat task.
+OUTBOX_RELAY_INTERVAL = float(os.getenv("OUTBOX_RELAY_INTERVAL", 1))
+OUTBOX_RELAY_BATCH_SIZE = int(os.getenv("OUTBOX_RELAY_BATCH_SIZE", 500))
+OUTBOX_MAX_BACKOFF = int(os.getenv("OUTBOX_MAX_BACKOFF", 300))
+
+# Rows fetched per server-side cursor round trip by the daily signup report
+SIGNUP_REPORT_CHUNK_SIZE = int(os.getenv("SIGNUP_REPORT_CHUNK_SIZE", 2000))
+# Largest gzipped report attached to the email (it is held in memory ~3 times while sending)
+SIGNUP_REPORT_MAX_ATTACHMENT_BYTES = int(os.getenv("SIGNUP_REPORT_MAX_ATTACHMENT_BYTES", 10 * 1024 * 1024))
+
+# Health checks (apps.health), probed by `python manage.py health_monitor`
+HEALTH_CHECK_INTERVAL = int(os.getenv("HEALTH_CHECK_INTERVAL", 60))  # seconds
+HEALTH_PROBE_TIMEOUT = float(os.getenv("HEALTH_PROBE_TIMEOUT", 2))  # seconds, broker/worker probes
+HEALTH_LATENCY_WINDOW = int(os.getenv("HEALTH_LATENCY_WINDOW", 120))  # samples kept per check
+HEALTH_REPORT_STALE_AFTER = HEALTH_CHECK_INTERVAL * 3  # /healthz flags an older report as stale
+HEALTH_REPORT_TTL = HEALTH_CHECK_INTERVAL * 60
+HEALTH_READYZ_CACHE_TTL = float(os.getenv("HEALTH_READYZ_CACHE_TTL", 5))  # seconds
+HEALTH_ALERT_BACKOFF = int(os.getenv("HEALTH_ALERT_BACKOFF", 300))  # first reminder, then doubled
+HEALTH_ALERT_MAX_BACKOFF = int(os.getenv("HEALTH_ALERT_MAX_BACKOFF", 6 * 3600))
+
 # Celery Configuration Options
 CELERY_BROKER_URL = os.getenv("CELERY_BROKER_URL", "redis://localhost:6379/0")
 CELERY_RESULT_BACKEND = os.getenv("CELERY_RESULT_BACKEND", "redis://localhost:6379/0")
 
 CELERY_BEAT_SCHEDULE = {
-    "check-db-health-every-minute": {
-        "task": "apps.notifications.tasks.check_db_health",
-        "schedule": crontab(minute="*"),  # Every minute
-    },
     "daily-signup-report": {
         "task": "apps.notifications.tasks.send_daily_signup_report",
         "schedule": crontab(hour=23, minute=55),
     },
+    "relay-outbox": {
+        "task": "apps.notifications.tasks.relay_outbox",
+        "schedule": OUTBOX_RELAY_INTERVAL,  # seconds
+    },
+    "decay-hot-scores": {
+        "task": "apps.blog.tasks.decay_hot_scores",
+        "schedule": BLOG_HOT_DECAY_INTERVAL,  # seconds
+    },
 }
 
+if BLOG_REACTION_WRITE_BEHIND and not BLOG_REACTION_BUFFER_URL:
+    raise ImproperlyConfigured("BLOG_REACTION_WRITE_BEHIND=true requires BLOG_REACTION_BUFFER_URL.")
+
+if BLOG_REACTION_WRITE_BEHIND:
+    CELERY_BEAT_SCHEDULE["flush-reaction-buffer"] = {
+        "task": "apps.blog.tasks.flush_reaction_buffer",
+        "schedule": BLOG_REACTION_FLUSH_INTERVAL,  # seconds
+    }
+
+if NOTIFICATIONS_MODE == "digest":
+    CELERY_BEAT_SCHEDULE["send-notification-digests"] = {
+        "task": "apps.notifications.tasks.send_notification_digests",
+        "schedule": NOTIFICATIONS_DIGEST_WINDOW,  # seconds
+    }
+
 # Email Configuration
 EMAIL_BACKEND = "django.core.mail.backends.console.EmailBackend"
 